@@ -0,0 +1,33 @@
+"""Add content_encoding and stored_size_bytes to artifacts and artifact_blobs
+
+Revision ID: a2b3c4d5e6f7
+Revises: f1a2b3c4d5e6
+Create Date: 2026-03-10 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2b3c4d5e6f7'
+down_revision: Union[str, None] = 'f1a2b3c4d5e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing objects were stored as uploaded, which NULL encodes
+    for table in ('artifacts', 'artifact_blobs'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('content_encoding', sa.String(), nullable=True))
+            batch_op.add_column(sa.Column('stored_size_bytes', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    for table in ('artifact_blobs', 'artifacts'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('stored_size_bytes')
+            batch_op.drop_column('content_encoding')
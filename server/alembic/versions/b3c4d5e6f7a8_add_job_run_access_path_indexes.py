@@ -0,0 +1,62 @@
+"""Composite indexes for run listing and worker slots, and a queued-only dispatch index
+
+Revision ID: b3c4d5e6f7a8
+Revises: a2b3c4d5e6f7
+Create Date: 2026-03-11 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3c4d5e6f7a8'
+down_revision: Union[str, None] = 'a2b3c4d5e6f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Dispatch only ever reads queued runs, which are a small fraction of the table
+    op.drop_index('ix_job_runs_dispatch', table_name='job_runs')
+    op.create_index(
+        'ix_job_runs_queued', 'job_runs',
+        ['workspace_id', sa.text('priority DESC'), 'dispatch_key', 'created_at'],
+        postgresql_where=sa.text("status = 'queued'"),
+        sqlite_where=sa.text("status = 'queued'"),
+    )
+
+    # Run listings: newest first, optionally by status or job. The leading
+    # workspace_id column makes the plain workspace_id index redundant.
+    op.drop_index('ix_job_runs_workspace_id', table_name='job_runs')
+    op.create_index('ix_job_runs_workspace_created', 'job_runs', ['workspace_id', 'created_at', 'id'])
+    op.create_index(
+        'ix_job_runs_workspace_status_created', 'job_runs',
+        ['workspace_id', 'status', 'created_at', 'id'],
+    )
+    op.create_index(
+        'ix_job_runs_workspace_job_created', 'job_runs',
+        ['workspace_id', 'job_definition_id', 'created_at', 'id'],
+    )
+
+    # A worker's active runs, counted on every claim
+    op.drop_index('ix_job_runs_worker_id', table_name='job_runs')
+    op.create_index('ix_job_runs_worker_status', 'job_runs', ['worker_id', 'status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_runs_worker_status', table_name='job_runs')
+    op.create_index('ix_job_runs_worker_id', 'job_runs', ['worker_id'])
+
+    op.drop_index('ix_job_runs_workspace_job_created', table_name='job_runs')
+    op.drop_index('ix_job_runs_workspace_status_created', table_name='job_runs')
+    op.drop_index('ix_job_runs_workspace_created', table_name='job_runs')
+    op.create_index('ix_job_runs_workspace_id', 'job_runs', ['workspace_id'])
+
+    op.drop_index('ix_job_runs_queued', table_name='job_runs')
+    op.create_index(
+        'ix_job_runs_dispatch', 'job_runs',
+        ['workspace_id', 'status', sa.text('priority DESC'), 'dispatch_key'],
+    )
@@ -0,0 +1,56 @@
+"""Add job_run_labels index table
+
+Revision ID: b7c8d9e0f1a2
+Revises: a1b2c3d4e5f6
+Create Date: 2026-03-02 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c8d9e0f1a2'
+down_revision: Union[str, None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'job_run_labels',
+        sa.Column('run_id', sa.String(), nullable=False),
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('value', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('run_id', 'key'),
+    )
+    op.create_index('ix_job_run_labels_key_value', 'job_run_labels', ['key', 'value'])
+
+    # Backfill from the JSON column so already-queued runs stay routable
+    job_runs = sa.table(
+        'job_runs',
+        sa.column('id', sa.String()),
+        sa.column('required_labels', sa.JSON()),
+    )
+    job_run_labels = sa.table(
+        'job_run_labels',
+        sa.column('run_id', sa.String()),
+        sa.column('key', sa.String()),
+        sa.column('value', sa.String()),
+    )
+    bind = op.get_bind()
+    rows = [
+        {"run_id": run_id, "key": key, "value": str(value)}
+        for run_id, labels in bind.execute(sa.select(job_runs.c.id, job_runs.c.required_labels))
+        if labels
+        for key, value in labels.items()
+    ]
+    if rows:
+        op.bulk_insert(job_run_labels, rows)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_run_labels_key_value', table_name='job_run_labels')
+    op.drop_table('job_run_labels')
@@ -0,0 +1,41 @@
+"""Add retry_count to job_runs and indexes for the stale worker and run reaper
+
+Revision ID: c4d5e6f7a8b9
+Revises: b3c4d5e6f7a8
+Create Date: 2026-03-12 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d5e6f7a8b9'
+down_revision: Union[str, None] = 'b3c4d5e6f7a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('job_runs') as batch_op:
+        batch_op.add_column(sa.Column('retry_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Live workers whose heartbeat is older than the cutoff, across all workspaces
+    op.create_index('ix_workers_status_heartbeat', 'workers', ['status', 'last_heartbeat'])
+
+    # In-flight runs, checked against their timeout
+    op.create_index(
+        'ix_job_runs_active', 'job_runs', ['started_at'],
+        postgresql_where=sa.text("status IN ('assigned', 'running')"),
+        sqlite_where=sa.text("status IN ('assigned', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_runs_active', table_name='job_runs')
+    op.drop_index('ix_workers_status_heartbeat', table_name='workers')
+
+    with op.batch_alter_table('job_runs') as batch_op:
+        batch_op.drop_column('retry_count')
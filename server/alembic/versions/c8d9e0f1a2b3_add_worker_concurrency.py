@@ -0,0 +1,32 @@
+"""Add max_concurrency to workers and index job_runs.worker_id
+
+Revision ID: c8d9e0f1a2b3
+Revises: b7c8d9e0f1a2
+Create Date: 2026-03-03 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d9e0f1a2b3'
+down_revision: Union[str, None] = 'b7c8d9e0f1a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('workers') as batch_op:
+        batch_op.add_column(sa.Column('max_concurrency', sa.Integer(), nullable=False, server_default='1'))
+
+    op.create_index('ix_job_runs_worker_id', 'job_runs', ['worker_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_runs_worker_id', table_name='job_runs')
+
+    with op.batch_alter_table('workers') as batch_op:
+        batch_op.drop_column('max_concurrency')
@@ -0,0 +1,54 @@
+"""Store job_run_labels values as JSON so label types are preserved
+
+Revision ID: d5e6f7a8b9c0
+Revises: c4d5e6f7a8b9
+Create Date: 2026-03-13 10:00:00.000000
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e6f7a8b9c0'
+down_revision: Union[str, None] = 'c4d5e6f7a8b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+job_runs = sa.table(
+    'job_runs',
+    sa.column('id', sa.String()),
+    sa.column('required_labels', sa.JSON()),
+)
+job_run_labels = sa.table(
+    'job_run_labels',
+    sa.column('run_id', sa.String()),
+    sa.column('key', sa.String()),
+    sa.column('value', sa.String()),
+)
+
+
+def _rebuild(encode) -> None:
+    """Re-derive every job_run_labels row from the runs' required_labels."""
+    bind = op.get_bind()
+    rows = [
+        {"run_id": run_id, "key": key, "value": encode(value)}
+        for run_id, labels in bind.execute(sa.select(job_runs.c.id, job_runs.c.required_labels))
+        if labels
+        for key, value in labels.items()
+    ]
+    op.execute(job_run_labels.delete())
+    if rows:
+        op.bulk_insert(job_run_labels, rows)
+
+
+def upgrade() -> None:
+    _rebuild(lambda value: json.dumps(value, sort_keys=True))
+
+
+def downgrade() -> None:
+    _rebuild(str)
@@ -0,0 +1,54 @@
+"""Add priority, fair-share and per-job concurrency columns
+
+Revision ID: d9e0f1a2b3c4
+Revises: c8d9e0f1a2b3
+Create Date: 2026-03-05 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9e0f1a2b3c4'
+down_revision: Union[str, None] = 'c8d9e0f1a2b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('job_definitions') as batch_op:
+        batch_op.add_column(sa.Column('priority', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('fair_share_weight', sa.Integer(), nullable=False, server_default='1'))
+        batch_op.add_column(sa.Column('max_concurrent_runs', sa.Integer(), nullable=True))
+
+    # Existing runs get dispatch_key 0, so anything already queued keeps its
+    # place ahead of new work and is ordered among itself by created_at
+    with op.batch_alter_table('job_runs') as batch_op:
+        batch_op.add_column(sa.Column('priority', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('dispatch_key', sa.Float(), nullable=False, server_default='0'))
+
+    op.create_index(
+        'ix_job_runs_dispatch', 'job_runs',
+        ['workspace_id', 'status', sa.text('priority DESC'), 'dispatch_key'],
+    )
+    op.create_index(
+        'ix_job_runs_job_backlog', 'job_runs',
+        ['workspace_id', 'job_definition_id', 'status', 'dispatch_key'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_runs_job_backlog', table_name='job_runs')
+    op.drop_index('ix_job_runs_dispatch', table_name='job_runs')
+
+    with op.batch_alter_table('job_runs') as batch_op:
+        batch_op.drop_column('dispatch_key')
+        batch_op.drop_column('priority')
+
+    with op.batch_alter_table('job_definitions') as batch_op:
+        batch_op.drop_column('max_concurrent_runs')
+        batch_op.drop_column('fair_share_weight')
+        batch_op.drop_column('priority')
@@ -0,0 +1,29 @@
+"""Replace the job_logs run_id index with a unique (run_id, sequence) index
+
+Revision ID: f1a2b3c4d5e6
+Revises: e0f1a2b3c4d5
+Create Date: 2026-03-09 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a2b3c4d5e6'
+down_revision: Union[str, None] = 'e0f1a2b3c4d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Nothing wrote to job_logs before this revision, so there are no duplicates
+    op.drop_index('ix_job_logs_run_id', table_name='job_logs')
+    op.create_index('ix_job_logs_run_id_sequence', 'job_logs', ['run_id', 'sequence'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_logs_run_id_sequence', table_name='job_logs')
+    op.create_index('ix_job_logs_run_id', 'job_logs', ['run_id'], unique=False)
@@ -0,0 +1,97 @@
+"""Per-request cost of authentication, with and without the auth cache.
+
+Drives the app in-process against a file-backed SQLite database. GET /users/me
+does nothing beyond authenticating, so its latency minus that of the
+unauthenticated /health is the auth overhead; SQL statements per request are
+counted alongside.
+
+    python benchmarks/auth_overhead.py [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from orchestrator import auth
+from orchestrator.config import settings
+from orchestrator.database import get_db
+from orchestrator.main import app
+from orchestrator.models.api_key import ApiKey
+from orchestrator.models.base import Base
+from orchestrator.services import workspace_service
+
+RAW_KEY = "bench-worker-key"
+
+
+async def _setup(path: Path) -> tuple[async_sessionmaker, list[int]]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    statements = [0]
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count(*args) -> None:
+        statements[0] += 1
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session() as db:
+        await workspace_service.ensure_defaults(db)
+        db.add(ApiKey(name="bench", key_hash=auth.hash_key(RAW_KEY), role="worker", user_id="admin"))
+        await db.commit()
+
+    async def _db():
+        async with session() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = _db
+    return session, statements
+
+
+async def _measure(client: httpx.AsyncClient, path: str, requests: int, statements: list[int]) -> dict:
+    headers = {"Authorization": f"Bearer {RAW_KEY}"}
+    await client.get(path, headers=headers)  # warm up (and fill the cache)
+    samples = []
+    before = statements[0]
+    for _ in range(requests):
+        started = time.perf_counter()
+        resp = await client.get(path, headers=headers)
+        samples.append((time.perf_counter() - started) * 1e6)
+        resp.raise_for_status()
+    return {
+        "p50": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "queries": (statements[0] - before) / requests,
+    }
+
+
+async def main(requests: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        _, statements = await _setup(Path(tmp) / "bench.db")
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench/api/v1") as client:
+            baseline = await _measure(client, "/health", requests, statements)
+            print(f"{requests} requests per row; auth overhead is relative to /health "
+                  f"(p50 {baseline['p50']:.0f} us)\n")
+            print(f"{'mode':<16}{'p50 us':>10}{'mean us':>10}{'auth us':>10}{'queries':>10}")
+            for label, ttl in [("uncached", 0.0), ("cached", 30.0)]:
+                settings.auth_cache_ttl = ttl
+                auth.invalidate_auth_cache()
+                result = await _measure(client, "/users/me", requests, statements)
+                print(
+                    f"{label:<16}{result['p50']:>10.0f}{result['mean']:>10.0f}"
+                    f"{result['p50'] - baseline['p50']:>10.0f}{result['queries']:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,122 @@
+"""Live log SSE throughput: one event per line vs batched events, with and without gzip.
+
+Drives the real stream_logs endpoint in-process: a producer publishes log lines
+straight to the run's subscribers as fast as the stream drains them, and the
+stream's events are encoded to wire bytes exactly as sse-starlette sends them.
+The per-line rows (batch size 1) reproduce the old one-event-per-line behaviour.
+
+    python benchmarks/sse_throughput.py [--lines 200000] [--line-length 120]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import zlib
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sse_starlette.event import ensure_bytes
+from starlette.requests import Request
+
+from orchestrator.api import runs as runs_api
+from orchestrator.auth import AuthContext
+from orchestrator.config import settings
+from orchestrator.models.base import Base
+from orchestrator.models.job_run import JobRun
+from orchestrator.schemas.workers import LogLine
+from orchestrator.services import log_service
+
+
+async def _setup() -> async_sessionmaker:
+    engine = create_async_engine("sqlite+aiosqlite://", connect_args={"check_same_thread": False})
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session() as db:
+        db.add(JobRun(
+            id="bench", workspace_id="default", job_definition_id="job", name="bench",
+            status="running", task_prompt="",
+        ))
+        await db.commit()
+    return session
+
+
+async def _run(session, lines: int, line_length: int, batch_size: int, gzip: bool) -> dict:
+    settings.sse_log_batch_size = batch_size
+    settings.sse_log_batch_latency = 0.005
+    # Large enough that the stream never has to resync from storage
+    settings.log_subscriber_buffer = lines
+
+    # Varied text, so gzip isn't flattered by identical lines
+    rng = random.Random(0)
+    words = ["tool", "call", "read_file", "src/main.py", "ok", "error", "retrying", "tokens", "step"]
+    payloads = [
+        " ".join(rng.choice(words) + str(rng.randrange(10_000)) for _ in range(40))[:line_length]
+        for _ in range(1000)
+    ]
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+    auth = AuthContext(user=None, api_key=None, workspace_id="default")
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    async with session() as db:
+        response = await runs_api.stream_logs("bench", request, after=0, auth=auth, db=db)
+        events = response.body_iterator
+
+        async def produce() -> None:
+            # Publish in worker-sized posts, yielding so the stream can drain
+            for start in range(1, lines + 1, 100):
+                end = min(start + 100, lines + 1)
+                log_service._deliver(
+                    "bench",
+                    [LogLine(line=payloads[i % 1000], sequence=i) for i in range(start, end)],
+                )
+                await asyncio.sleep(0)
+
+        started = time.perf_counter()
+        producer = asyncio.create_task(produce())
+        received = event_count = wire_bytes = 0
+        while received < lines:
+            event = await events.__anext__()
+            if event["event"] != "logs":
+                continue
+            event_count += 1
+            received = int(event["id"])
+            chunk = ensure_bytes(event, None)
+            if gzip:
+                chunk = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            wire_bytes += len(chunk)
+        elapsed = time.perf_counter() - started
+        await producer
+        await events.aclose()
+
+    return {
+        "lines_per_s": lines / elapsed,
+        "events": event_count,
+        "bytes_per_line": wire_bytes / lines,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--line-length", type=int, default=120)
+    args = parser.parse_args()
+
+    session = await _setup()
+    print(f"{args.lines} lines of {args.line_length} chars\n")
+    print(f"{'mode':<24}{'lines/s':>12}{'events':>10}{'bytes/line':>12}")
+    for label, batch_size, gzip in [
+        ("per-line events", 1, False),
+        ("per-line events + gzip", 1, True),
+        ("batched (500)", 500, False),
+        ("batched (500) + gzip", 500, True),
+    ]:
+        result = await _run(session, args.lines, args.line_length, batch_size, gzip)
+        print(
+            f"{label:<24}{result['lines_per_s']:>12,.0f}{result['events']:>10,}"
+            f"{result['bytes_per_line']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+"""API latency while artifacts are being written: blocking vs thread-pooled local storage.
+
+Drives the app in-process and probes GET /api/v1/health every few milliseconds
+while a batch of large artifact writes goes through the storage backend. With
+the old backend those writes ran on the event loop thread, so every probe queued
+behind them. The pooled backend keeps the loop free.
+
+    python benchmarks/storage_latency.py [--seconds 5] [--size-mb 16] [--writers 4]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from orchestrator.main import app
+from orchestrator.storage import LocalStorageBackend, StorageBackend
+
+
+class BlockingLocalStorage(LocalStorageBackend):
+    """The previous LocalStorageBackend: synchronous disk I/O on the event loop."""
+
+    async def save(self, path: str, data: bytes) -> None:
+        full_path = self.base_path / path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_bytes(data)
+
+
+async def _probe(client: httpx.AsyncClient, stop: asyncio.Event, samples: list[float]) -> None:
+    # Latency is measured from when each probe was due, not when the loop got round to
+    # sending it, so time spent stalled behind blocking I/O is counted.
+    interval = 0.005
+    due = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+        resp = await client.get("/api/v1/health")
+        resp.raise_for_status()
+        samples.append((time.perf_counter() - due) * 1000)
+        due = max(due + interval, time.perf_counter())
+
+
+async def _measure(storage: StorageBackend | None, seconds: float, size: int, writers: int) -> list[float]:
+    payload = b"\0" * size
+    deadline = time.perf_counter() + seconds
+
+    async def writer(n: int) -> None:
+        i = 0
+        while storage is not None and time.perf_counter() < deadline:
+            await storage.save(f"bench/{n}-{i % 4}.bin", payload)
+            i += 1
+            await asyncio.sleep(0.01)
+
+    samples: list[float] = []
+    stop = asyncio.Event()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        probe = asyncio.create_task(_probe(client, stop, samples))
+        await asyncio.gather(*(writer(n) for n in range(writers)))
+        if storage is None:
+            await asyncio.sleep(seconds)
+        stop.set()
+        await probe
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    print(f"  {label:<20} n={len(samples):<5} p50={cuts[49]:7.2f} ms  p99={cuts[98]:7.2f} ms  max={max(samples):7.2f} ms")
+
+
+async def main(seconds: float, size_mb: int, writers: int) -> None:
+    size = size_mb * 1024 * 1024
+    print(f"{writers} writers saving {size_mb} MiB artifacts for {seconds:g}s; probing /api/v1/health")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, backend in [
+            ("idle", None),
+            ("blocking (before)", BlockingLocalStorage(str(Path(tmp) / "blocking"))),
+            ("thread pool (after)", LocalStorageBackend(str(Path(tmp) / "pooled"))),
+        ]:
+            _report(label, await _measure(backend, seconds, size, writers))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--size-mb", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.seconds, args.size_mb, args.writers))
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from orchestrator.auth import AuthContext, require_auth
 from orchestrator.database import get_db
+from orchestrator.pagination import PageParams
 from orchestrator.schemas.jobs import (
     JobDefinitionCreate,
     JobDefinitionResponse,
+    JobDefinitionSummaryResponse,
     JobDefinitionUpdate,
 )
 from orchestrator.schemas.runs import RunResponse
@@ -14,12 +18,22 @@ from orchestrator.services import job_service
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
 
-@router.get("", response_model=list[JobDefinitionResponse])
+@router.get("", response_model=list[JobDefinitionResponse] | list[JobDefinitionSummaryResponse])
 async def list_jobs(
+    response: Response,
+    view: Literal["full", "summary"] = Query("full", description="summary leaves out prompt and agent config"),
+    page: PageParams = Depends(),
     auth: AuthContext = Depends(require_auth),
     db: AsyncSession = Depends(get_db),
 ):
-    return await job_service.list_jobs(db, auth.workspace_id)
+    """Job definitions newest first. Pass limit to page through them with X-Next-Cursor."""
+    keys = job_service.JOB_PAGE_KEYS
+    jobs = await job_service.list_jobs(
+        db, auth.workspace_id, after=page.after(keys), limit=page.limit, summary=view == "summary"
+    )
+    page.set_next_cursor(response, jobs, keys)
+    schema = JobDefinitionSummaryResponse if view == "summary" else JobDefinitionResponse
+    return [schema.model_validate(job) for job in jobs]
 
 
 @router.post("", response_model=JobDefinitionResponse, status_code=201)
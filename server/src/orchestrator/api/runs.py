@@ -1,28 +1,55 @@
 import asyncio
 import json
+from collections.abc import Iterator
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import (
+    FileResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sse_starlette.sse import EventSourceResponse
 
 from orchestrator.auth import AuthContext, require_auth, require_auth_sse
+from orchestrator.config import settings
 from orchestrator.database import get_db
+from orchestrator.http_utils import (
+    RangeNotSatisfiableError,
+    accepts_encoding,
+    etag_matches,
+    parse_range,
+)
+from orchestrator.pagination import PageParams
 from orchestrator.schemas.artifacts import ArtifactResponse
-from orchestrator.schemas.runs import RunCreate, RunResponse
+from orchestrator.schemas.runs import RunCreate, RunResponse, RunSummaryResponse
 from orchestrator.services import artifact_service, log_service, run_service
+from orchestrator.sse import GzipEventSourceResponse
 
 router = APIRouter(prefix="/runs", tags=["runs"])
 
 
-@router.get("", response_model=list[RunResponse])
+@router.get("", response_model=list[RunResponse] | list[RunSummaryResponse])
 async def list_runs(
+    response: Response,
     job_id: str | None = Query(None),
     status: str | None = Query(None),
+    view: Literal["full", "summary"] = Query("full", description="summary leaves out prompt, configs and result"),
+    page: PageParams = Depends(),
     auth: AuthContext = Depends(require_auth),
     db: AsyncSession = Depends(get_db),
 ):
-    return await run_service.list_runs(db, auth.workspace_id, job_id=job_id, status=status)
+    """Runs newest first. Pass limit to page through them with X-Next-Cursor."""
+    keys = run_service.RUN_PAGE_KEYS
+    runs = await run_service.list_runs(
+        db, auth.workspace_id, job_id=job_id, status=status,
+        after=page.after(keys), limit=page.limit, summary=view == "summary",
+    )
+    page.set_next_cursor(response, runs, keys)
+    schema = RunSummaryResponse if view == "summary" else RunResponse
+    return [schema.model_validate(run) for run in runs]
 
 
 @router.post("", response_model=RunResponse, status_code=201)
@@ -58,6 +85,20 @@ async def cancel_run(
     return run
 
 
+@router.delete("/{run_id}", status_code=204)
+async def delete_run(
+    run_id: str,
+    auth: AuthContext = Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+):
+    try:
+        deleted = await run_service.delete_run(db, run_id, auth.workspace_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Run not found")
+
+
 @router.get("/{run_id}/artifacts", response_model=list[ArtifactResponse])
 async def list_run_artifacts(
     run_id: str,
@@ -71,17 +112,78 @@ async def list_run_artifacts(
 async def download_artifact(
     run_id: str,
     artifact_id: str,
+    request: Request,
     auth: AuthContext = Depends(require_auth),
     db: AsyncSession = Depends(get_db),
 ):
+    """Stream an artifact. Supports single byte ranges and If-None-Match on its checksum.
+
+    Artifacts stored compressed are sent as stored, with Content-Encoding, to clients
+    that accept it, and decompressed on the fly for the rest.
+    """
     artifact = await artifact_service.get_artifact(db, artifact_id)
     if not artifact or artifact.run_id != run_id:
         raise HTTPException(status_code=404, detail="Artifact not found")
-    data = await artifact_service.read_artifact_data(artifact)
-    return Response(
-        content=data,
+
+    encoding = artifact.content_encoding
+    passthrough = encoding is not None and accepts_encoding(
+        request.headers.get("accept-encoding"), encoding
+    )
+    etag = artifact_service.artifact_etag(artifact, encoded=passthrough)
+    vary = {"Vary": "Accept-Encoding"} if encoding else {}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, **vary})
+
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{artifact.filename}"',
+        **vary,
+    }
+    if passthrough:
+        headers["Content-Encoding"] = encoding
+
+    if encoding is None or passthrough:
+        url = await artifact_service.artifact_download_url(artifact)
+        if url is not None:
+            # Object storage serves the bytes (and any Range) directly
+            return RedirectResponse(url, status_code=307, headers={"ETag": etag, **vary})
+
+        local_path = artifact_service.artifact_local_path(artifact)
+        if local_path is not None:
+            # FileResponse handles Range/If-Range itself and can use zero-copy pathsend
+            if not local_path.is_file():
+                raise HTTPException(status_code=404, detail="Artifact data not found")
+            return FileResponse(local_path, media_type=artifact.content_type, headers=headers)
+
+    # Ranges apply to the representation being sent: the stored bytes when passing
+    # the encoding through, the decoded content otherwise
+    size = artifact_service.artifact_stored_size(artifact) if passthrough else artifact.size_bytes
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    # If-Range needs a strong match, which a weak ETag never gives: send it all
+    if if_range is None or (if_range == etag and not etag.startswith("W/")):
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except RangeNotSatisfiableError:
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+
+    if byte_range is None:
+        return StreamingResponse(
+            artifact_service.stream_artifact_data(artifact, decode=not passthrough),
+            media_type=artifact.content_type,
+            headers={**headers, "Content-Length": str(size)},
+        )
+    start, end = byte_range
+    return StreamingResponse(
+        artifact_service.stream_artifact_data(artifact, start, end, decode=not passthrough),
+        status_code=206,
         media_type=artifact.content_type,
-        headers={"Content-Disposition": f'attachment; filename="{artifact.filename}"'},
+        headers={
+            **headers,
+            "Content-Range": f"bytes {start}-{end}/{size}",
+            "Content-Length": str(end - start + 1),
+        },
     )
 
 
@@ -102,6 +204,8 @@ async def get_logs(
 @router.get("/{run_id}/logs/stream")
 async def stream_logs(
     run_id: str,
+    request: Request,
+    after: int = Query(0),
     auth: AuthContext = Depends(require_auth_sse),
     db: AsyncSession = Depends(get_db),
 ):
@@ -109,24 +213,70 @@ async def stream_logs(
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
 
-    queue = log_service.subscribe(run_id)
+    # A reconnecting EventSource resumes from the last event it saw
+    last_event_id = request.headers.get("last-event-id", "")
+    if last_event_id.isdigit():
+        after = max(after, int(last_event_id))
+
+    # Subscribe before reading history so nothing lands between the two
+    subscription = log_service.subscribe(run_id)
+
+    batch_size = max(settings.sse_log_batch_size, 1)
+
+    def logs_events(lines: list) -> Iterator[dict]:
+        # One event per batch: framing and JSON encoding are paid per event, not per line
+        for i in range(0, len(lines), batch_size):
+            batch = lines[i:i + batch_size]
+            yield {
+                "event": "logs",
+                "id": str(batch[-1].sequence),
+                "data": json.dumps(
+                    [{"stream": e.stream, "line": e.line, "sequence": e.sequence} for e in batch]
+                ),
+            }
 
     async def event_generator():
+        last_sent = after
+        replay = True
         try:
             while True:
+                if replay:
+                    entries = await log_service.get_logs(db, run_id, after_sequence=last_sent)
+                    for event in logs_events(entries):
+                        yield event
+                    if entries:
+                        last_sent = entries[-1].sequence
+                    replay = False
                 try:
-                    line = await asyncio.wait_for(queue.get(), timeout=30)
-                    yield {
-                        "event": "log",
-                        "data": json.dumps(
-                            {"stream": line.stream, "line": line.line, "sequence": line.sequence}
-                        ),
-                    }
+                    lines = await subscription.get_batch(
+                        timeout=30, max_lines=batch_size, max_latency=settings.sse_log_batch_latency
+                    )
                 except TimeoutError:
                     yield {"event": "ping", "data": ""}
+                    continue
+                except log_service.LogGap:
+                    # Too slow to keep up with the live feed; catch up from storage
+                    yield {"event": "gap", "data": json.dumps({"after": last_sent})}
+                    replay = True
+                    continue
+                fresh = []
+                for line in lines:
+                    if line.sequence <= last_sent + len(fresh):
+                        continue
+                    if line.sequence > last_sent + len(fresh) + 1:
+                        # A broadcast went missing; fill the hole from storage
+                        replay = True
+                        break
+                    fresh.append(line)
+                for event in logs_events(fresh):
+                    yield event
+                if fresh:
+                    last_sent = fresh[-1].sequence
         except asyncio.CancelledError:
             pass
         finally:
-            log_service.unsubscribe(run_id, queue)
+            log_service.unsubscribe(run_id, subscription)
 
+    if settings.sse_gzip and accepts_encoding(request.headers.get("accept-encoding"), "gzip"):
+        return GzipEventSourceResponse(event_generator())
     return EventSourceResponse(event_generator())
@@ -1,12 +1,13 @@
 import io
 import zipfile
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile
 from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from orchestrator.auth import AuthContext, require_auth
 from orchestrator.database import get_db
+from orchestrator.pagination import PageParams
 from orchestrator.schemas.skills import (
     SkillDetailResponse,
     SkillFileResponse,
@@ -24,10 +25,16 @@ MAX_ZIP_FILE_COUNT = 500
 
 @router.get("", response_model=list[SkillSummaryResponse])
 async def list_skills(
+    response: Response,
+    page: PageParams = Depends(),
     auth: AuthContext = Depends(require_auth),
     db: AsyncSession = Depends(get_db),
 ):
-    return await skill_service.list_skills(db, auth.workspace_id)
+    """Skills by name. Pass limit to page through them with X-Next-Cursor."""
+    keys = skill_service.SKILL_PAGE_KEYS
+    skills = await skill_service.list_skills(db, auth.workspace_id, after=page.after(keys), limit=page.limit)
+    page.set_next_cursor(response, skills, keys)
+    return skills
 
 
 @router.get("/{skill_id}", response_model=SkillDetailResponse)
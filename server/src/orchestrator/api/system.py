@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -6,6 +6,7 @@ from orchestrator.auth import AuthContext, require_auth
 from orchestrator.database import get_db
 from orchestrator.models.job_run import JobRun
 from orchestrator.models.worker import Worker
+from orchestrator.pagination import PageParams
 from orchestrator.schemas.workers import WorkerResponse
 from orchestrator.services import worker_service
 
@@ -19,10 +20,20 @@ async def health_check():
 
 @router.get("/system/workers", response_model=list[WorkerResponse])
 async def list_workers(
+    response: Response,
+    page: PageParams = Depends(),
     auth: AuthContext = Depends(require_auth),
     db: AsyncSession = Depends(get_db),
 ):
-    return await worker_service.list_workers(db, auth.workspace_id)
+    """Workers newest first. Pass limit to page through them with X-Next-Cursor."""
+    keys = worker_service.WORKER_PAGE_KEYS
+    workers = await worker_service.list_workers(db, auth.workspace_id, after=page.after(keys), limit=page.limit)
+    page.set_next_cursor(response, workers, keys)
+    active = await worker_service.get_active_run_ids(db, auth.workspace_id)
+    return [
+        WorkerResponse.model_validate(w).model_copy(update={"active_run_ids": active.get(w.id, [])})
+        for w in workers
+    ]
 
 
 @router.get("/system/metrics")
@@ -38,10 +49,7 @@ async def metrics(
     )
     run_counts = {row[0]: row[1] for row in result.all()}
 
-    # Ensure stale workers are marked offline before counting
-    await worker_service.list_workers(db, auth.workspace_id)
-
-    # Count workers by status (scoped to workspace)
+    # Count workers by status (scoped to workspace); the reaper marks stale ones offline
     result = await db.execute(
         select(Worker.status, func.count(Worker.id))
         .where(Worker.workspace_id == auth.workspace_id)
@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile
-from fastapi.responses import FileResponse
+from collections.abc import AsyncGenerator
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
 
 from orchestrator.auth import AuthContext, require_auth
+from orchestrator.config import settings
 from orchestrator.database import get_db
+from orchestrator.http_utils import etag_matches
 from orchestrator.schemas.artifacts import ArtifactResponse
 from orchestrator.schemas.runs import RunCompleteRequest
 from orchestrator.schemas.workers import (
@@ -16,6 +22,7 @@ from orchestrator.schemas.workers import (
 from orchestrator.services import (
     artifact_service,
     log_service,
+    run_service,
     skill_service,
     worker_service,
 )
@@ -48,10 +55,40 @@ async def worker_heartbeat(
 @router.post("/poll", response_model=PollResponse | None)
 async def poll_for_job(
     worker_id: str,
+    request: Request,
+    wait: int = Query(0, ge=0, description="Seconds to hold the request open waiting for a run"),
+    auth: AuthContext = Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+):
+    if not wait:
+        return await worker_service.poll_for_job(db, worker_id)
+    return await worker_service.wait_for_job(
+        db,
+        worker_id,
+        timeout=min(wait, settings.poll_max_wait),
+        is_disconnected=request.is_disconnected,
+    )
+
+
+@router.post("/claim", response_model=list[PollResponse])
+async def claim_runs(
+    worker_id: str,
+    request: Request,
+    max_runs: int = Query(1, ge=1, le=100, description="Upper bound on runs to claim; also capped by free slots"),
+    wait: int = Query(0, ge=0, description="Seconds to hold the request open waiting for a run"),
     auth: AuthContext = Depends(require_auth),
     db: AsyncSession = Depends(get_db),
 ):
-    return await worker_service.poll_for_job(db, worker_id)
+    """Claim a batch of queued runs in one round trip."""
+    if not wait:
+        return await worker_service.claim_runs(db, worker_id, max_runs)
+    return await worker_service.wait_for_runs(
+        db,
+        worker_id,
+        max_runs,
+        timeout=min(wait, settings.poll_max_wait),
+        is_disconnected=request.is_disconnected,
+    )
 
 
 @router.post("/runs/{run_id}/logs")
@@ -65,22 +102,97 @@ async def post_logs(
     return {"appended": count}
 
 
-@router.post("/runs/{run_id}/artifacts", response_model=ArtifactResponse, status_code=201)
+# Room for the multipart boundaries and part headers around the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+_UPLOAD_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            }
+        },
+    }
+}
+
+
+async def _read_upload(request: Request, max_bytes: int) -> UploadFile:
+    """The ``file`` part of a multipart upload, refusing oversized bodies early.
+
+    A declared UploadFile parameter would have Starlette spool the whole body to
+    disk before the endpoint could look at its size. Here a Content-Length past
+    the limit is rejected before reading anything, and a chunked body is cut off
+    as soon as it passes the limit.
+    """
+    too_large = HTTPException(status_code=413, detail=f"Artifact exceeds {max_bytes} bytes")
+    limit = max_bytes + MULTIPART_OVERHEAD if max_bytes else 0
+    declared = request.headers.get("content-length", "")
+    if limit and declared.isdigit() and int(declared) > limit:
+        raise too_large
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        raise HTTPException(status_code=422, detail="Expected a multipart/form-data upload")
+
+    async def capped() -> AsyncGenerator[bytes]:
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if limit and received > limit:
+                raise too_large
+            yield chunk
+
+    try:
+        form = await MultiPartParser(request.headers, capped()).parse()
+    except MultiPartException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+    file = form.get("file")
+    if not isinstance(file, UploadFile):
+        await form.close()
+        raise HTTPException(status_code=422, detail="Missing file")
+    return file
+
+
+@router.post(
+    "/runs/{run_id}/artifacts",
+    response_model=ArtifactResponse,
+    status_code=201,
+    openapi_extra=_UPLOAD_BODY,
+)
 async def upload_artifact(
     run_id: str,
-    file: UploadFile,
+    request: Request,
     auth: AuthContext = Depends(require_auth),
     db: AsyncSession = Depends(get_db),
 ):
-    data = await file.read()
-    artifact = await artifact_service.save_artifact(
-        db,
-        run_id=run_id,
-        filename=file.filename or "unnamed",
-        data=data,
-        content_type=file.content_type or "application/octet-stream",
-        workspace_id=auth.workspace_id,
-    )
+    max_bytes = settings.artifact_max_bytes
+    file = await _read_upload(request, max_bytes)
+    try:
+        if max_bytes and file.size is not None and file.size > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Artifact exceeds {max_bytes} bytes")
+
+        async def chunks():
+            while chunk := await file.read(artifact_service.UPLOAD_CHUNK_SIZE):
+                yield chunk
+
+        try:
+            artifact = await artifact_service.save_artifact_stream(
+                db,
+                run_id=run_id,
+                filename=file.filename or "unnamed",
+                chunks=chunks(),
+                content_type=file.content_type or "application/octet-stream",
+                workspace_id=auth.workspace_id,
+            )
+        except artifact_service.ArtifactTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+    finally:
+        await file.close()
+    if artifact.filename == artifact_service.RUN_LOG_FILENAME:
+        await log_service.discard_live_logs(db, run_id)
     return artifact
 
 
@@ -103,6 +215,31 @@ async def download_skill_file(
     return FileResponse(path=str(abs_path), filename=abs_path.name)
 
 
+@router.get("/runs/{run_id}/skills/bundle")
+async def download_skill_bundle(
+    run_id: str,
+    request: Request,
+    auth: AuthContext = Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+):
+    """Download every skill file for a run as one tar.gz, laid out as <skill>/<path>."""
+    run = await run_service.get_run(db, run_id, auth.workspace_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+
+    manifest = await skill_service.get_skill_manifest(db, auth.workspace_id)
+    skills = skill_service.resolve_run_skills(manifest, run.skill_ids)
+    etag = skill_service.skill_bundle_etag(skills)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    return StreamingResponse(
+        skill_service.iter_skill_bundle(auth.workspace_id, skills),
+        media_type="application/gzip",
+        headers={"ETag": etag},
+    )
+
+
 @router.post("/runs/{run_id}/complete")
 async def complete_run(
     run_id: str,
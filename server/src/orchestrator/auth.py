@@ -1,9 +1,11 @@
 import hashlib
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 
 from fastapi import Depends, HTTPException, Query, Request, Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy import select
+from sqlalchemy import event, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from orchestrator.config import settings
@@ -25,12 +27,73 @@ class AuthContext:
     workspace_id: str
 
 
+# Successful lookups by (key hash, workspace id): expiry time, user and key.
+# Workers authenticate on every poll, heartbeat and log batch, so without this
+# most of the database's work would be re-resolving the same few keys. Any ORM
+# change to a key, user or membership clears it (see _invalidate_on_change);
+# changes made outside this process are picked up when entries expire.
+_cache: OrderedDict[tuple[str, str], tuple[float, User, ApiKey]] = OrderedDict()
+
+
 def hash_key(raw_key: str) -> str:
     return hashlib.sha256(raw_key.encode()).hexdigest()
 
 
+def invalidate_auth_cache() -> None:
+    _cache.clear()
+
+
+@event.listens_for(ApiKey, "after_update")
+@event.listens_for(ApiKey, "after_delete")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+@event.listens_for(WorkspaceMember, "after_update")
+@event.listens_for(WorkspaceMember, "after_delete")
+def _invalidate_on_change(mapper, connection, target) -> None:
+    invalidate_auth_cache()
+
+
+def _cache_get(key: tuple[str, str]) -> AuthContext | None:
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    expires, user, api_key = entry
+    if time.monotonic() >= expires:
+        del _cache[key]
+        return None
+    _cache.move_to_end(key)
+    return AuthContext(user=user, api_key=api_key, workspace_id=key[1])
+
+
+def _detached_copy[T](obj: T) -> T:
+    mapper = inspect(obj).mapper
+    return type(obj)(**{attr.key: getattr(obj, attr.key) for attr in mapper.column_attrs})
+
+
+def _cache_put(key: tuple[str, str], auth: AuthContext) -> None:
+    # Cache copies: the originals belong to this request's session, and would
+    # expire or be refreshed along with it
+    user, api_key = _detached_copy(auth.user), _detached_copy(auth.api_key)
+    _cache[key] = (time.monotonic() + settings.auth_cache_ttl, user, api_key)
+    _cache.move_to_end(key)
+    while len(_cache) > settings.auth_cache_size:
+        _cache.popitem(last=False)
+
+
 async def _authenticate(token: str, workspace_id: str, db: AsyncSession) -> AuthContext:
     """Core auth logic shared by header-based and query-param-based auth."""
+    if settings.auth_cache_ttl <= 0:
+        return await _resolve(token, workspace_id, db)
+
+    key = (hash_key(token), workspace_id)
+    auth = _cache_get(key)
+    if auth is None:
+        auth = await _resolve(token, workspace_id, db)
+        _cache_put(key, auth)
+    return auth
+
+
+async def _resolve(token: str, workspace_id: str, db: AsyncSession) -> AuthContext:
     # Resolve API key and user
     if token == settings.default_admin_key:
         api_key = ApiKey(id="default", name="default-admin", role="admin", key_hash="", user_id=DEFAULT_ADMIN_USER_ID)
@@ -0,0 +1,271 @@
+"""Fan-out of live log lines to every server process.
+
+append_logs publishes a run's new lines here, and each process hands what it
+receives to its own SSE subscribers. The in-process backend is enough for a single
+server process; Postgres LISTEN/NOTIFY or Redis pub/sub let several uvicorn
+workers or replicas behind a load balancer share one feed.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+
+from orchestrator.schemas.workers import LogLine
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[str, list[LogLine]], None]
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+_NOTIFY_MAX_BYTES = 7900
+
+
+class Broadcaster(ABC):
+    def __init__(self, deliver: Deliver):
+        # Called with (run_id, lines) for every batch this process receives
+        self._deliver = deliver
+
+    @abstractmethod
+    async def start(self) -> None:
+        """Begin receiving broadcasts."""
+
+    @abstractmethod
+    def publish(self, run_id: str, lines: list[LogLine]) -> None:
+        """Send lines to every process, this one included. Never waits on I/O."""
+
+    @abstractmethod
+    async def close(self) -> None: ...
+
+
+class MemoryBroadcaster(Broadcaster):
+    """Delivers straight to this process's subscribers."""
+
+    async def start(self) -> None:
+        pass
+
+    def publish(self, run_id: str, lines: list[LogLine]) -> None:
+        self._deliver(run_id, lines)
+
+    async def close(self) -> None:
+        pass
+
+
+class _BatchingBroadcaster(Broadcaster):
+    """Coalesces publishes for ``batch_interval`` seconds into one message per flush."""
+
+    def __init__(self, deliver: Deliver, batch_interval: float):
+        super().__init__(deliver)
+        self.batch_interval = batch_interval
+        self._pending: dict[str, list[LogLine]] = {}
+        self._flush_task: asyncio.Task | None = None
+
+    def publish(self, run_id: str, lines: list[LogLine]) -> None:
+        self._pending.setdefault(run_id, []).extend(lines)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush())
+
+    async def _flush(self) -> None:
+        # Loop so lines published while a send is in flight go out in the next one
+        while self._pending:
+            await asyncio.sleep(self.batch_interval)
+            batch, self._pending = self._pending, {}
+            try:
+                await self._send(batch)
+            except Exception:
+                # Subscribers notice the sequence gap and catch up from job_logs
+                logger.exception(f"Failed to broadcast log lines for {len(batch)} runs")
+
+    @abstractmethod
+    async def _send(self, batch: dict[str, list[LogLine]]) -> None: ...
+
+    async def _drain(self) -> None:
+        if self._flush_task is not None:
+            await self._flush_task
+
+
+class PostgresBroadcaster(_BatchingBroadcaster):
+    """LISTEN/NOTIFY on the application database, via asyncpg.
+
+    NOTIFY payloads are small, so messages carry only each run's sequence range.
+    Receivers load the lines from job_logs, and only for runs with subscribers in
+    that process.
+    """
+
+    def __init__(
+        self,
+        deliver: Deliver,
+        dsn: str,
+        has_subscribers: Callable[[str], bool],
+        load: Callable[[str, int, int], Awaitable[list[LogLine]]],
+        channel: str = "orch_logs",
+        batch_interval: float = 0.02,
+    ):
+        try:
+            import asyncpg
+        except ImportError as e:
+            raise RuntimeError(
+                "The postgres broadcast backend needs asyncpg: "
+                "pip install 'flight-control-server[postgres]'"
+            ) from e
+
+        super().__init__(deliver, batch_interval)
+        self._asyncpg = asyncpg
+        self.dsn = dsn
+        self.channel = channel
+        self._has_subscribers = has_subscribers
+        self._load = load
+        self._conn = None
+        self._conn_lock = asyncio.Lock()
+        # Loads run in notification order, so lines reach subscribers in sequence
+        self._load_lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task] = set()
+        self._closed = False
+
+    async def start(self) -> None:
+        await self._get_conn()
+
+    async def _get_conn(self):
+        if self._conn is None:
+            async with self._conn_lock:
+                if self._conn is None:
+                    conn = await self._asyncpg.connect(self.dsn)
+                    await conn.add_listener(self.channel, self._on_notify)
+                    conn.add_termination_listener(self._on_terminated)
+                    self._conn = conn
+        return self._conn
+
+    def _on_terminated(self, conn) -> None:
+        if conn is self._conn:
+            self._conn = None
+        if not self._closed:
+            logger.warning("Lost the log broadcast connection; reconnecting")
+            self._spawn(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = 1.0
+        while not self._closed and self._conn is None:
+            try:
+                await self._get_conn()
+            except Exception:
+                logger.warning(f"Log broadcast reconnect failed; retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: dict[str, list[LogLine]]) -> None:
+        conn = await self._get_conn()
+        message: dict[str, list[int]] = {}
+        size = 0
+        for run_id, lines in batch.items():
+            seq_range = [min(line.sequence for line in lines), max(line.sequence for line in lines)]
+            entry_size = len(json.dumps({run_id: seq_range}))
+            if message and size + entry_size > _NOTIFY_MAX_BYTES:
+                await conn.execute("SELECT pg_notify($1, $2)", self.channel, json.dumps(message))
+                message, size = {}, 0
+            message[run_id] = seq_range
+            size += entry_size
+        if message:
+            await conn.execute("SELECT pg_notify($1, $2)", self.channel, json.dumps(message))
+
+    def _on_notify(self, conn, pid: int, channel: str, payload: str) -> None:
+        for run_id, (first, last) in json.loads(payload).items():
+            if self._has_subscribers(run_id):
+                self._spawn(self._load_and_deliver(run_id, first, last))
+
+    async def _load_and_deliver(self, run_id: str, first: int, last: int) -> None:
+        async with self._load_lock:
+            try:
+                lines = await self._load(run_id, first, last)
+            except Exception:
+                logger.exception(f"Failed to load broadcast log lines for run {run_id}")
+                return
+            if lines:
+                self._deliver(run_id, lines)
+
+    async def close(self) -> None:
+        await self._drain()
+        self._closed = True
+        for task in list(self._tasks):
+            task.cancel()
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await conn.close()
+
+
+class RedisBroadcaster(_BatchingBroadcaster):
+    """Redis pub/sub (or anything speaking its protocol), via redis-py.
+
+    Each message carries a batch of lines for one or more runs.
+    """
+
+    def __init__(
+        self,
+        deliver: Deliver,
+        url: str = "redis://localhost:6379/0",
+        channel: str = "orch_logs",
+        batch_interval: float = 0.02,
+        client=None,
+    ):
+        if client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError as e:
+                raise RuntimeError(
+                    "The redis broadcast backend needs redis: "
+                    "pip install 'flight-control-server[redis]'"
+                ) from e
+            client = redis.from_url(url)
+
+        super().__init__(deliver, batch_interval)
+        self.channel = channel
+        self._redis = client
+        self._pubsub = None
+        self._listen_task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._pubsub is None:
+            self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            await self._pubsub.subscribe(self.channel)
+            self._listen_task = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message["type"] == "message":
+                        self._receive(message["data"])
+            except Exception:
+                logger.exception("Log broadcast subscription failed; retrying")
+                await asyncio.sleep(1)
+
+    def _receive(self, data: bytes) -> None:
+        try:
+            for run_id, lines in json.loads(data).items():
+                self._deliver(run_id, [LogLine(**line) for line in lines])
+        except Exception:
+            logger.exception("Dropped malformed log broadcast")
+
+    async def _send(self, batch: dict[str, list[LogLine]]) -> None:
+        payload = {
+            run_id: [line.model_dump() for line in lines] for run_id, lines in batch.items()
+        }
+        await self._redis.publish(self.channel, json.dumps(payload))
+
+    async def close(self) -> None:
+        await self._drain()
+        if self._listen_task is not None:
+            self._listen_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listen_task
+            self._listen_task = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        await self._redis.aclose()
@@ -0,0 +1,137 @@
+"""Gzip at rest for text-like artifacts.
+
+Objects are written as a series of independent gzip members, each cut at a line
+boundary once it holds ``GZIP_MEMBER_SIZE`` bytes of input. Any gzip reader
+decodes the whole object, and a reader that knows where a member starts can
+begin decoding there, which is what lets the log index seek inside compressed logs.
+"""
+
+import asyncio
+import zlib
+from collections.abc import AsyncIterable, AsyncIterator
+
+GZIP_MEMBER_SIZE = 256 * 1024
+
+_COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/jsonl",
+    "application/xml",
+    "application/yaml",
+    "application/x-yaml",
+    "application/javascript",
+    "application/x-sh",
+    "image/svg+xml",
+}
+_COMPRESSIBLE_SUFFIXES = (
+    ".log", ".txt", ".md", ".csv", ".json", ".jsonl", ".ndjson", ".yaml", ".yml", ".xml", ".html",
+)
+
+# Compressing or decompressing a chunk on the event loop would stall every other
+# request for its duration; zlib releases the GIL, so a worker thread does the work
+# in parallel. Smaller chunks aren't worth the hop.
+_THREAD_MIN_BYTES = 64 * 1024
+
+
+def is_compressible(content_type: str, filename: str) -> bool:
+    """Whether an artifact is text-like enough to be worth compressing."""
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type.startswith("text/") or media_type in _COMPRESSIBLE_TYPES:
+        return True
+    if media_type.endswith(("+json", "+xml")):
+        return True
+    return filename.lower().endswith(_COMPRESSIBLE_SUFFIXES)
+
+
+def _new_member(level: int):
+    return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+async def _compress(compressor, data: bytes) -> bytes:
+    if len(data) >= _THREAD_MIN_BYTES:
+        return await asyncio.to_thread(compressor.compress, data)
+    return compressor.compress(data)
+
+
+async def _decompress(decoder, data: bytes) -> bytes:
+    if len(data) >= _THREAD_MIN_BYTES:
+        return await asyncio.to_thread(decoder.decompress, data)
+    return decoder.decompress(data)
+
+
+async def gzip_stream(
+    chunks: AsyncIterable[bytes], level: int = 6, member_size: int = GZIP_MEMBER_SIZE
+) -> AsyncIterator[bytes]:
+    """Gzip a byte stream as line-aligned members of roughly member_size input bytes."""
+    compressor = _new_member(level)
+    member_bytes = 0
+    async for chunk in chunks:
+        while chunk:
+            cut = -1
+            if member_bytes + len(chunk) >= member_size:
+                # End the member after the last full line this chunk lets us include
+                cut = chunk.rfind(b"\n", 0, max(member_size - member_bytes, 0) or None)
+                if cut < 0:
+                    cut = chunk.find(b"\n")
+            if cut < 0:
+                out = await _compress(compressor, chunk)
+                member_bytes += len(chunk)
+                chunk = b""
+            else:
+                head, chunk = chunk[:cut + 1], chunk[cut + 1:]
+                out = await _compress(compressor, head) + compressor.flush()
+                compressor = _new_member(level)
+                member_bytes = 0
+            if out:
+                yield out
+    if member_bytes:
+        yield compressor.flush()
+
+
+async def gunzip_members(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, bytes]]:
+    """Decode a (multi-member) gzip stream, yielding (member offset, decoded bytes).
+
+    The offset is where, in the compressed stream, the member that produced the
+    bytes begins.
+    """
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    member_start = 0
+    consumed = 0  # compressed bytes fed to decoders so far
+    async for chunk in chunks:
+        data = chunk
+        while data:
+            out = await _decompress(decoder, data)
+            if out:
+                yield member_start, out
+            if not decoder.eof:
+                consumed += len(data)
+                break
+            # Member finished; whatever is left over starts the next one
+            consumed += len(data) - len(decoder.unused_data)
+            data = decoder.unused_data
+            member_start = consumed
+            decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if not decoder.eof and consumed > member_start:
+        raise zlib.error("Truncated gzip stream")
+
+
+async def gunzip_stream(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    async for _, data in gunzip_members(chunks):
+        yield data
+
+
+async def slice_stream(
+    chunks: AsyncIterable[bytes], start: int = 0, end: int | None = None
+) -> AsyncIterator[bytes]:
+    """Yield bytes start..end (inclusive; None = to the end) of a stream."""
+    pos = 0
+    async for chunk in chunks:
+        chunk_end = pos + len(chunk)
+        if chunk_end > start:
+            lo = max(start - pos, 0)
+            hi = len(chunk) if end is None else min(end + 1 - pos, len(chunk))
+            if hi > lo:
+                yield chunk[lo:hi]
+        pos = chunk_end
+        if end is not None and pos > end:
+            break
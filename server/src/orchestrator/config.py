@@ -3,13 +3,56 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     database_url: str = "sqlite+aiosqlite:///./data/orchestrator.db"
+    db_pool_size: int = 10  # connections kept open per server process (not used for SQLite)
+    db_max_overflow: int = 20  # extra connections allowed during bursts such as poll storms
+    db_pool_timeout: float = 30.0  # seconds to wait for a free connection before failing the request
+    db_pool_recycle: int = 1800  # seconds before a connection is replaced; keep below proxy idle timeouts
+    db_pool_pre_ping: bool = True  # check connections on checkout, replacing ones the server dropped
+    db_statement_cache_size: int = 500  # prepared statements cached per Postgres connection; 0 for pgbouncer
+    sqlite_busy_timeout: float = 30.0  # seconds a SQLite writer waits for the database lock
+    sqlite_synchronous: str = "NORMAL"  # NORMAL survives app crashes under WAL; FULL also survives power loss
     master_key: str = ""  # Fernet key for encrypting credentials
     default_admin_key: str = "admin"  # Default API key for bootstrapping
+    auth_cache_ttl: float = 30.0  # seconds a resolved API key + membership is reused; 0 = off
+    auth_cache_size: int = 10000  # most (key, workspace) pairs kept in the auth cache
     server_host: str = "0.0.0.0"
     server_port: int = 8080
     worker_heartbeat_timeout: int = 90  # seconds before worker considered dead
+    reaper_interval: float = 15.0  # seconds between sweeps for dead workers and overdue runs
+    run_max_retries: int = 2  # times a run lost with its worker is re-queued before it fails
+    run_timeout_grace: int = 60  # seconds past timeout_seconds before the server times a run out
+    poll_max_wait: int = 60  # upper bound on a worker long-poll, in seconds
+    poll_recheck_interval: float = 5.0  # seconds between queue checks in a long-poll; finds runs queued on other replicas
+    fair_share_quantum: float = 1.0  # virtual seconds between a backlogged job's runs (divided by its weight)
     log_level: str = "INFO"
+    storage_backend: str = "local"  # local | s3
     artifact_storage_path: str = "./data/artifacts"
+    s3_bucket: str = ""
+    s3_prefix: str = ""  # key prefix inside the bucket
+    s3_endpoint_url: str = ""  # set for MinIO or other S3-compatible stores
+    s3_region: str = ""
+    s3_access_key_id: str = ""  # empty = default AWS credential chain
+    s3_secret_access_key: str = ""
+    s3_part_size: int = 8 * 1024 * 1024  # multipart part size (S3 minimum is 5 MiB)
+    s3_max_concurrency: int = 8  # parts in flight per upload
+    s3_max_pool_connections: int = 32
+    s3_presign_downloads: bool = True  # redirect downloads to a presigned URL
+    s3_presign_expiry: int = 300  # seconds
+    storage_io_threads: int = 8  # thread pool for local artifact storage disk I/O
+    artifact_max_bytes: int = 5 * 1024 * 1024 * 1024  # per-upload limit; 0 = unlimited
+    artifact_compression: str = "gzip"  # gzip | none; applied at rest to text-like artifacts
+    artifact_compression_level: int = 6
+    log_index_stride: int = 1000  # lines between checkpoints in a stored log's offset index
+    log_commit_interval: float = 0.01  # seconds a log write waits for others to share its commit
+    log_commit_max_lines: int = 1000  # commit a log batch early once it reaches this many lines
+    log_subscriber_buffer: int = 1000  # live lines buffered per SSE client before it must resync
+    sse_log_batch_size: int = 500  # most log lines sent in one SSE event
+    sse_log_batch_latency: float = 0.05  # seconds a live line may wait for others to share its event
+    sse_gzip: bool = False  # gzip log streams for clients that accept it
+    broadcast_backend: str = "memory"  # memory | postgres | redis; memory only reaches one process
+    broadcast_redis_url: str = "redis://localhost:6379/0"
+    broadcast_channel: str = "orch_logs"
+    broadcast_batch_interval: float = 0.02  # seconds of live log lines coalesced per broadcast
     skill_storage_path: str = "./data/skills"
 
     model_config = {"env_prefix": "ORCH_"}
@@ -1,23 +1,175 @@
+import asyncio
 import os
+import sqlite3
 from collections.abc import AsyncGenerator
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from orchestrator.config import settings
 
+_SQLITE_SYNCHRONOUS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+class SQLiteSession(AsyncSession):
+    """Queues this process's SQLite writers on one lock.
+
+    SQLite allows a single writer; left to itself, every other writer polls for the
+    lock with backoff and gives up with "database is locked" after the busy timeout.
+    pysqlite only opens a transaction at the first INSERT/UPDATE/DELETE, so a session
+    takes the lock just before its first write (a flush that will write, or a SELECT
+    ... FOR UPDATE, which SQLite can't render but which announces one) and keeps it
+    until it commits, rolls back or closes. Waiting writers are then served in
+    order, without polling. Other processes are still covered by the busy timeout.
+    """
+
+    write_lock: asyncio.Lock  # set per engine by create_sessionmaker
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._holds_write_lock = False
+
+    def _will_write(self, statement: Any = None) -> bool:
+        if getattr(statement, "is_dml", False):
+            return True
+        if getattr(statement, "_for_update_arg", None) is not None:
+            return True
+        # Autoflush writes pending changes before running the statement
+        return bool(self.new or self.deleted or self.dirty)
+
+    async def _acquire_write(self, statement: Any = None) -> None:
+        if self._holds_write_lock or not self._will_write(statement):
+            return
+        try:
+            await asyncio.wait_for(self.write_lock.acquire(), settings.sqlite_busy_timeout)
+        except TimeoutError:
+            raise OperationalError(
+                "waiting for the SQLite write lock", None, sqlite3.OperationalError("database is locked")
+            ) from None
+        self._holds_write_lock = True
+
+    def _release_write(self) -> None:
+        if self._holds_write_lock:
+            self._holds_write_lock = False
+            self.write_lock.release()
+
+    async def execute(self, statement, *args, **kwargs):
+        await self._acquire_write(statement)
+        return await super().execute(statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        await self._acquire_write(statement)
+        return await super().scalar(statement, *args, **kwargs)
+
+    async def scalars(self, statement, *args, **kwargs):
+        await self._acquire_write(statement)
+        return await super().scalars(statement, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        await self._acquire_write()
+        return await super().get(*args, **kwargs)
+
+    async def refresh(self, *args, **kwargs):
+        await self._acquire_write()
+        return await super().refresh(*args, **kwargs)
+
+    async def flush(self, *args, **kwargs):
+        await self._acquire_write()
+        return await super().flush(*args, **kwargs)
+
+    async def commit(self) -> None:
+        await self._acquire_write()
+        try:
+            await super().commit()
+        finally:
+            self._release_write()
+
+    async def rollback(self) -> None:
+        try:
+            await super().rollback()
+        finally:
+            self._release_write()
+
+    async def close(self) -> None:
+        try:
+            await super().close()
+        finally:
+            self._release_write()
+
+
+def _is_memory(url) -> bool:
+    return url.database in (None, "", ":memory:") or "mode=memory" in str(url)
+
+
+def create_engine(database_url: str) -> AsyncEngine:
+    """Engine for database_url, tuned for its backend from the db_*/sqlite_* settings."""
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        engine = create_async_engine(
+            url,
+            echo=False,
+            connect_args={"check_same_thread": False, "timeout": settings.sqlite_busy_timeout},
+        )
+        synchronous = settings.sqlite_synchronous.upper()
+        if synchronous not in _SQLITE_SYNCHRONOUS:
+            raise ValueError(f"sqlite_synchronous must be one of {sorted(_SQLITE_SYNCHRONOUS)}")
+        wal = not _is_memory(url)
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _set_pragmas(dbapi_connection, connection_record) -> None:
+            cursor = dbapi_connection.cursor()
+            if wal:
+                # Readers no longer block the writer, or the writer readers
+                cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute(f"PRAGMA synchronous={synchronous}")
+            cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout * 1000)}")
+            cursor.close()
+
+        return engine
+
+    connect_args = {}
+    if url.get_backend_name() == "postgresql" and url.get_driver_name() == "asyncpg":
+        # SQLAlchemy's prepared statement cache and asyncpg's own; pgbouncer in
+        # transaction mode needs both off
+        url = url.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.db_statement_cache_size)}
+        )
+        connect_args["statement_cache_size"] = settings.db_statement_cache_size
+    return create_async_engine(
+        url,
+        echo=False,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args=connect_args,
+    )
+
+
+def create_sessionmaker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    session_class = AsyncSession
+    if engine.dialect.name == "sqlite":
+        session_class = type("SQLiteSession", (SQLiteSession,), {"write_lock": asyncio.Lock()})
+    return async_sessionmaker(engine, class_=session_class, expire_on_commit=False)
+
+
 # Ensure data directory exists for SQLite
 if settings.database_url.startswith("sqlite"):
     db_path = settings.database_url.split("///")[-1]
     os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=False,
-    # SQLite needs check_same_thread=False
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {},
-)
+engine = create_engine(settings.database_url)
 
-async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+async_session = create_sessionmaker(engine)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession]:
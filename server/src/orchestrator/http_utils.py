@@ -0,0 +1,63 @@
+"""Conditional-request, byte-range and content-coding helpers shared by the download endpoints."""
+
+
+class RangeNotSatisfiableError(Exception):
+    """The Range header asked for bytes past the end of the object."""
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header matches the given (quoted, possibly weak) ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def accepts_encoding(accept_encoding: str | None, coding: str) -> bool:
+    """Whether an Accept-Encoding header allows the given content coding."""
+    weights: dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.partition(";")
+        q = params.strip().removeprefix("q=").strip() if "q=" in params else "1"
+        try:
+            weights[name.strip().lower()] = float(q)
+        except ValueError:
+            weights[name.strip().lower()] = 0.0
+    # An explicit entry for the coding beats the wildcard
+    return weights.get(coding, weights.get("*", 0.0)) > 0
+
+
+def parse_range(range_header: str | None, size: int) -> tuple[int, int] | None:
+    """Resolve a single ``bytes=`` range to inclusive (start, end) offsets.
+
+    Returns None when the whole object should be served: no header, a malformed one,
+    or a multi-range request (which servers may answer with a plain 200).
+    """
+    if not range_header:
+        return None
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            # An empty object has no last bytes to serve
+            if length <= 0 or size == 0:
+                raise RangeNotSatisfiableError
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableError
+    if start > end:
+        return None
+    return start, min(end, size - 1)
@@ -9,6 +9,7 @@ from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
 from orchestrator.migrate import run_migrations
+from orchestrator.pagination import NEXT_CURSOR_HEADER
 
 logger = logging.getLogger(__name__)
 
@@ -36,17 +37,34 @@ async def lifespan(app: FastAPI):
     async with async_session() as db:
         await workspace_service.ensure_defaults(db)
 
+    # Receive live log lines published by other server processes
+    from orchestrator.services import log_service
+
+    await log_service.start_broadcast()
+
     # Start scheduler background task
     from orchestrator.services.scheduler import run_scheduler
 
     scheduler_task = asyncio.create_task(run_scheduler())
 
+    # Start reaper background task (dead workers, orphaned and overdue runs)
+    from orchestrator.services.reaper import run_reaper
+
+    reaper_task = asyncio.create_task(run_reaper())
+
     yield
 
-    # Shutdown scheduler
-    scheduler_task.cancel()
-    with suppress(asyncio.CancelledError):
-        await scheduler_task
+    # Shutdown scheduler and reaper
+    for task in (scheduler_task, reaper_task):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    await log_service.close_broadcast()
+
+    from orchestrator.storage import close_storage
+
+    await close_storage()
 
 
 app = FastAPI(
@@ -61,6 +79,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Register API routers
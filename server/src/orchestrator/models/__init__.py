@@ -1,10 +1,12 @@
 from orchestrator.models.api_key import ApiKey
 from orchestrator.models.artifact import Artifact
+from orchestrator.models.artifact_blob import ArtifactBlob
 from orchestrator.models.base import Base
 from orchestrator.models.credential import Credential
 from orchestrator.models.job_definition import JobDefinition
 from orchestrator.models.job_log import JobLog
 from orchestrator.models.job_run import JobRun
+from orchestrator.models.job_run_label import JobRunLabel
 from orchestrator.models.schedule import Schedule
 from orchestrator.models.skill import Skill
 from orchestrator.models.skill_file import SkillFile
@@ -16,11 +18,13 @@ from orchestrator.models.workspace_member import WorkspaceMember
 __all__ = [
     "ApiKey",
     "Artifact",
+    "ArtifactBlob",
     "Base",
     "Credential",
     "JobDefinition",
     "JobLog",
     "JobRun",
+    "JobRunLabel",
     "Schedule",
     "Skill",
     "SkillFile",
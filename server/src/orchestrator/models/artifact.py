@@ -15,3 +15,6 @@ class Artifact(Base, TimestampMixin):
     size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
     checksum_sha256: Mapped[str] = mapped_column(String, nullable=False)
     storage_path: Mapped[str] = mapped_column(String, nullable=False)
+    # How the stored object is encoded (None = as uploaded), and its size on disk
+    content_encoding: Mapped[str | None] = mapped_column(String, nullable=True)
+    stored_size_bytes: Mapped[int | None] = mapped_column(Integer, nullable=True)
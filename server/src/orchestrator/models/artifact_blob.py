@@ -0,0 +1,17 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from orchestrator.models.base import Base, TimestampMixin
+
+
+class ArtifactBlob(Base, TimestampMixin):
+    """Artifact content stored once per sha256, shared by every Artifact row with that checksum."""
+
+    __tablename__ = "artifact_blobs"
+
+    checksum_sha256: Mapped[str] = mapped_column(String, primary_key=True)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    storage_path: Mapped[str] = mapped_column(String, nullable=False)
+    content_encoding: Mapped[str | None] = mapped_column(String, nullable=True)  # e.g. gzip
+    stored_size_bytes: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # Artifact rows using it
@@ -20,3 +20,6 @@ class JobDefinition(Base, TimestampMixin):
     labels: Mapped[dict | None] = mapped_column(JSON, default=dict)
     skill_ids: Mapped[list | None] = mapped_column(JSON, nullable=True)  # null=all, []=none, ["name"]=specific
     timeout_seconds: Mapped[int] = mapped_column(Integer, default=1800)
+    priority: Mapped[int] = mapped_column(Integer, default=0)  # higher dispatches first
+    fair_share_weight: Mapped[int] = mapped_column(Integer, default=1)  # relative share among backlogged jobs
+    max_concurrent_runs: Mapped[int | None] = mapped_column(Integer, nullable=True)  # null = no cap
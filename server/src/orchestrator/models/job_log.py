@@ -1,14 +1,24 @@
-from sqlalchemy import Integer, String, Text
+from sqlalchemy import Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from orchestrator.models.base import Base, TimestampMixin, new_id
 
 
 class JobLog(Base, TimestampMixin):
+    """Live log tail of a run, written as the worker streams lines in.
+
+    Compacted away once the run's run-output.log artifact is stored.
+    """
+
     __tablename__ = "job_logs"
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=new_id)
-    run_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    run_id: Mapped[str] = mapped_column(String, nullable=False)
     stream: Mapped[str] = mapped_column(String, default="stdout")  # stdout, stderr
     line: Mapped[str] = mapped_column(Text, nullable=False)
     sequence: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (
+        # Makes worker retries idempotent and serves ?after= replays as a range scan
+        Index("ix_job_logs_run_id_sequence", "run_id", "sequence", unique=True),
+    )
@@ -1,16 +1,18 @@
+import time
 from datetime import datetime
 
-from sqlalchemy import JSON, DateTime, Integer, String, Text
+from sqlalchemy import JSON, DateTime, Float, Index, Integer, String, Text, event, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from orchestrator.models.base import Base, TimestampMixin, new_id
+from orchestrator.models.job_run_label import JobRunLabel, encode_label_value
 
 
 class JobRun(Base, TimestampMixin):
     __tablename__ = "job_runs"
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=new_id)
-    workspace_id: Mapped[str] = mapped_column(String, nullable=False, index=True, default="default")
+    workspace_id: Mapped[str] = mapped_column(String, nullable=False, default="default")
     job_definition_id: Mapped[str | None] = mapped_column(String, nullable=True)  # null for ad-hoc runs
     status: Mapped[str] = mapped_column(String, default="queued")  # queued, assigned, running, completed, failed, timeout, cancelled
     worker_id: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -27,7 +29,56 @@ class JobRun(Base, TimestampMixin):
     skill_ids: Mapped[list | None] = mapped_column(JSON, nullable=True)  # null=all, []=none, ["name"]=specific
     timeout_seconds: Mapped[int] = mapped_column(Integer, default=1800)
 
+    # Dispatch order: highest priority first, then lowest dispatch_key. The key is a
+    # virtual start time (see run_service.next_dispatch_key): a job with a backlog
+    # queues behind its own last run, others join at the head of the queue.
+    priority: Mapped[int] = mapped_column(Integer, default=0)
+    dispatch_key: Mapped[float] = mapped_column(Float, default=time.time)
+
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     result: Mapped[str | None] = mapped_column(Text, nullable=True)
     exit_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    retry_count: Mapped[int] = mapped_column(Integer, default=0)  # times re-queued after losing its worker
+
+    __table_args__ = (
+        # Dispatch reads only queued runs. Queries compare status to an inlined
+        # 'queued' so Postgres can use it from prepared statements too
+        Index(
+            "ix_job_runs_queued",
+            "workspace_id", text("priority DESC"), "dispatch_key", "created_at",
+            postgresql_where=text("status = 'queued'"),
+            sqlite_where=text("status = 'queued'"),
+        ),
+        Index("ix_job_runs_job_backlog", "workspace_id", "job_definition_id", "status", "dispatch_key"),
+        # Run listings, newest first, in (created_at, id) order for keyset paging
+        Index("ix_job_runs_workspace_created", "workspace_id", "created_at", "id"),
+        Index("ix_job_runs_workspace_status_created", "workspace_id", "status", "created_at", "id"),
+        Index("ix_job_runs_workspace_job_created", "workspace_id", "job_definition_id", "created_at", "id"),
+        Index("ix_job_runs_worker_status", "worker_id", "status"),
+        # In-flight runs, which the reaper checks against their timeout
+        Index(
+            "ix_job_runs_active",
+            "started_at",
+            postgresql_where=text("status IN ('assigned', 'running')"),
+            sqlite_where=text("status IN ('assigned', 'running')"),
+        ),
+    )
+
+
+@event.listens_for(JobRun, "after_insert")
+def _index_required_labels(mapper, connection, target: JobRun) -> None:
+    """Mirror required_labels into job_run_labels on insert.
+
+    Runs are snapshots, so labels never change after creation and the index
+    only needs to be written once, whichever code path created the run.
+    """
+    if not target.required_labels:
+        return
+    connection.execute(
+        JobRunLabel.__table__.insert(),
+        [
+            {"run_id": target.id, "key": key, "value": encode_label_value(value)}
+            for key, value in target.required_labels.items()
+        ],
+    )
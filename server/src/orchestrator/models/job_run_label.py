@@ -0,0 +1,33 @@
+import json
+from typing import Any
+
+from sqlalchemy import Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from orchestrator.models.base import Base
+
+
+def encode_label_value(value: Any) -> str:
+    """Canonical JSON text of a label value.
+
+    Label values are JSON, so the index keeps their type: "1", 1 and true are
+    three different values, as they are to labels_match.
+    """
+    return json.dumps(value, sort_keys=True)
+
+
+class JobRunLabel(Base):
+    """One row per required label on a run, so dispatch can match labels in SQL.
+
+    ``value`` holds the label value encoded with encode_label_value.
+    """
+
+    __tablename__ = "job_run_labels"
+
+    run_id: Mapped[str] = mapped_column(String, primary_key=True)
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    value: Mapped[str] = mapped_column(String, nullable=False)
+
+    __table_args__ = (
+        Index("ix_job_run_labels_key_value", "key", "value"),
+    )
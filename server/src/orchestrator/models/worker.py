@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import JSON, DateTime, String
+from sqlalchemy import JSON, DateTime, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from orchestrator.models.base import Base, TimestampMixin, new_id, utcnow
@@ -14,7 +14,13 @@ class Worker(Base, TimestampMixin):
     name: Mapped[str] = mapped_column(String, nullable=False)
     status: Mapped[str] = mapped_column(String, default="online")  # online, offline, busy
     labels: Mapped[dict | None] = mapped_column(JSON, default=dict)
+    max_concurrency: Mapped[int] = mapped_column(Integer, default=1)  # run slots on this worker
     last_heartbeat: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=utcnow, nullable=False
     )
-    current_run_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    current_run_id: Mapped[str | None] = mapped_column(String, nullable=True)  # most recently assigned run
+
+    __table_args__ = (
+        # The reaper's scan for live workers that stopped heartbeating
+        Index("ix_workers_status_heartbeat", "status", "last_heartbeat"),
+    )
@@ -0,0 +1,88 @@
+"""Keyset pagination for list endpoints.
+
+Pages are ordered by a unique key, usually (created_at, id), and a cursor holds the
+key of the last row sent. The next page starts strictly after it, so every page
+is an index range scan no matter how deep the client has paged, and rows added
+meanwhile never shift or repeat results the way OFFSET does.
+
+Lists stay plain JSON arrays; the cursor for the next page, if there may be one,
+is sent in the ``X-Next-Cursor`` response header.
+"""
+
+import base64
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+class PageParams:
+    """Query parameters shared by paginated list endpoints."""
+
+    def __init__(
+        self,
+        cursor: str | None = Query(None, description=f"Value of a previous page's {NEXT_CURSOR_HEADER} header"),
+        limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit for every row"),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+
+    def after(self, keys: Sequence[InstrumentedAttribute]) -> tuple | None:
+        if self.cursor is None:
+            return None
+        try:
+            return decode_cursor(self.cursor, keys)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+
+    def set_next_cursor(self, response: Response, rows: Sequence[Any], keys: Sequence[InstrumentedAttribute]) -> None:
+        # A full page may be followed by more rows; the next request finds out
+        if self.limit is not None and len(rows) == self.limit:
+            last = rows[-1]
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, key.key) for key in keys])
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[InstrumentedAttribute]) -> tuple:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError
+        return tuple(
+            datetime.fromisoformat(value) if key.type.python_type is datetime else value
+            for key, value in zip(keys, values, strict=True)
+        )
+    except (ValueError, TypeError, NotImplementedError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+def paginate(
+    query: Select,
+    keys: Sequence[InstrumentedAttribute],
+    after: tuple | None = None,
+    limit: int | None = None,
+    descending: bool = True,
+) -> Select:
+    """Order query by keys and restrict it to the page that follows after."""
+    if after is not None:
+        row, bound = tuple_(*keys), tuple_(*after)
+        query = query.where(row < bound if descending else row > bound)
+    query = query.order_by(*(key.desc() if descending else key.asc() for key in keys))
+    if limit is not None:
+        query = query.limit(limit)
+    return query
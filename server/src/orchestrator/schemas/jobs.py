@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class McpServerConfig(BaseModel):
@@ -29,6 +29,9 @@ class JobDefinitionCreate(BaseModel):
     skill_ids: list[str] | None = None  # null=all, []=none, ["name"]=specific
     labels: dict[str, str] = {}
     timeout_seconds: int = 1800
+    priority: int = 0
+    fair_share_weight: int = Field(1, ge=1)
+    max_concurrent_runs: int | None = Field(None, ge=1)
 
 
 class JobDefinitionUpdate(BaseModel):
@@ -43,23 +46,33 @@ class JobDefinitionUpdate(BaseModel):
     skill_ids: list[str] | None = None
     labels: dict[str, str] | None = None
     timeout_seconds: int | None = None
+    priority: int | None = None
+    fair_share_weight: int | None = Field(None, ge=1)
+    max_concurrent_runs: int | None = Field(None, ge=1)
 
 
-class JobDefinitionResponse(BaseModel):
+class JobDefinitionSummaryResponse(BaseModel):
+    """A job definition without its prompt or agent configuration, for listings."""
     id: str
     workspace_id: str
     name: str
     description: str | None = None
-    task_prompt: str
     agent_type: str
-    agent_config: dict = {}
-    mcp_servers: list = []
-    env_vars: dict = {}
-    credential_ids: list = []
-    skill_ids: list | None = None
     labels: dict = {}
     timeout_seconds: int
+    priority: int = 0
+    fair_share_weight: int = 1
+    max_concurrent_runs: int | None = None
     created_at: datetime
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class JobDefinitionResponse(JobDefinitionSummaryResponse):
+    task_prompt: str
+    agent_config: dict = {}
+    mcp_servers: list = []
+    env_vars: dict = {}
+    credential_ids: list = []
+    skill_ids: list | None = None
@@ -15,33 +15,40 @@ class RunCreate(BaseModel):
     skill_ids: list[str] | None = None  # null=all, []=none, ["name"]=specific
     required_labels: dict[str, str] = {}  # Labels required on worker to run this job
     timeout_seconds: int = 1800
+    priority: int = 0  # higher dispatches first
 
 
-class RunResponse(BaseModel):
+class RunSummaryResponse(BaseModel):
+    """A run without its prompt, configuration or result text, for listings."""
     id: str
     workspace_id: str
     job_definition_id: str | None = None
     status: str
     worker_id: str | None = None
     name: str
-    task_prompt: str
     agent_type: str
-    agent_config: dict = {}
-    mcp_servers: list = []
-    credential_ids: list = []
-    skill_ids: list | None = None
-    required_labels: dict = {}
     timeout_seconds: int
+    priority: int = 0
     started_at: datetime | None = None
     completed_at: datetime | None = None
-    result: str | None = None
     exit_code: int | None = None
+    retry_count: int = 0
     created_at: datetime
     updated_at: datetime
 
     model_config = {"from_attributes": True}
 
 
+class RunResponse(RunSummaryResponse):
+    task_prompt: str
+    agent_config: dict = {}
+    mcp_servers: list = []
+    credential_ids: list = []
+    skill_ids: list | None = None
+    required_labels: dict = {}
+    result: str | None = None
+
+
 class RunCompleteRequest(BaseModel):
     status: str  # completed, failed
     result: str | None = None
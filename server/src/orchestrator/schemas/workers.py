@@ -1,11 +1,12 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class WorkerRegisterRequest(BaseModel):
     name: str
     labels: dict[str, str] = {}
+    max_concurrency: int = Field(1, ge=1)  # runs this worker executes at once
 
 
 class WorkerRegisterResponse(BaseModel):
@@ -63,7 +64,9 @@ class WorkerResponse(BaseModel):
     status: str
     labels: dict = {}
     last_heartbeat: datetime
+    max_concurrency: int = 1
     current_run_id: str | None = None
+    active_run_ids: list[str] = []
     created_at: datetime
 
     model_config = {"from_attributes": True}
@@ -1,11 +1,32 @@
+import asyncio
+import gzip
 import hashlib
+import logging
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator
+from pathlib import Path
 
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from orchestrator import compression
+from orchestrator.config import settings
 from orchestrator.models.artifact import Artifact
+from orchestrator.models.artifact_blob import ArtifactBlob
+from orchestrator.services import log_index
 from orchestrator.storage import get_storage
 
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# The combined run log the worker uploads; it also gets a line-offset index
+RUN_LOG_FILENAME = "run-output.log"
+
+
+class ArtifactTooLargeError(Exception):
+    """An artifact upload went past settings.artifact_max_bytes."""
+
 
 async def save_artifact(
     db: AsyncSession,
@@ -15,27 +36,203 @@ async def save_artifact(
     content_type: str,
     workspace_id: str = "default",
 ) -> Artifact:
-    checksum = hashlib.sha256(data).hexdigest()
-    storage_path = f"{run_id}/{filename}"
+    async def single_chunk() -> AsyncIterator[bytes]:
+        yield data
 
-    storage = get_storage()
-    await storage.save(storage_path, data)
-
-    artifact = Artifact(
-        workspace_id=workspace_id,
-        run_id=run_id,
-        filename=filename,
-        content_type=content_type,
-        size_bytes=len(data),
-        checksum_sha256=checksum,
-        storage_path=storage_path,
+    return await save_artifact_stream(
+        db, run_id, filename, single_chunk(), content_type, workspace_id
     )
-    db.add(artifact)
-    await db.commit()
+
+
+async def save_artifact_stream(
+    db: AsyncSession,
+    run_id: str,
+    filename: str,
+    chunks: AsyncIterable[bytes],
+    content_type: str,
+    workspace_id: str = "default",
+) -> Artifact:
+    """Store an artifact from a chunk stream, hashing and sizing it on the way through.
+
+    Memory use is bounded by the chunk size, not the artifact size. Raises
+    ArtifactTooLargeError once the stream passes settings.artifact_max_bytes; storage
+    writes are atomic, so nothing (not even a partial object) is left behind.
+
+    Content is stored once per checksum: the upload lands in a staging object, then
+    either becomes the blob for its hash, if this upload creates the blob row, or is
+    dropped and the existing blob gains a reference. The staging object never
+    outlives the call.
+
+    Text-like artifacts are gzipped on the way to storage (settings.artifact_compression);
+    the checksum and size_bytes always describe the uncompressed content.
+    """
+    staging_path = f"uploads/{uuid.uuid4().hex}"
+    max_bytes = settings.artifact_max_bytes
+    digest = hashlib.sha256()
+    size = 0
+    stored_size = 0
+
+    async def hashed() -> AsyncIterator[bytes]:
+        nonlocal size
+        async for chunk in chunks:
+            size += len(chunk)
+            if max_bytes and size > max_bytes:
+                raise ArtifactTooLargeError(f"Artifact exceeds {max_bytes} bytes")
+            digest.update(chunk)
+            yield chunk
+
+    encoding = None
+    body = hashed()
+    if settings.artifact_compression == "gzip" and compression.is_compressible(content_type, filename):
+        encoding = "gzip"
+        body = compression.gzip_stream(body, level=settings.artifact_compression_level)
+
+    async def counted() -> AsyncIterator[bytes]:
+        nonlocal stored_size
+        async for chunk in body:
+            stored_size += len(chunk)
+            yield chunk
+
+    storage = get_storage()
+    await storage.save_stream(staging_path, counted())
+    checksum = digest.hexdigest()
+    blob_path = _blob_path(checksum)
+
+    promoted = False
+    try:
+        created = await _add_blob_reference(db, checksum, size, blob_path, encoding, stored_size)
+        if created:
+            # Only the upload that created the row writes the blob path, so the stored
+            # bytes always match the row's content_encoding. The row stays uncommitted
+            # (and locked) until the content is in place.
+            await storage.move(staging_path, blob_path)
+            promoted = True
+        else:
+            # The content is already stored, possibly encoded differently than ours
+            encoding, stored_size = (await db.execute(
+                select(ArtifactBlob.content_encoding, ArtifactBlob.stored_size_bytes)
+                .where(ArtifactBlob.checksum_sha256 == checksum)
+            )).one()
+        artifact = Artifact(
+            workspace_id=workspace_id,
+            run_id=run_id,
+            filename=filename,
+            content_type=content_type,
+            size_bytes=size,
+            checksum_sha256=checksum,
+            storage_path=blob_path,
+            content_encoding=encoding,
+            stored_size_bytes=stored_size,
+        )
+        db.add(artifact)
+        await db.commit()
+    finally:
+        # A promoted object whose row then fails to commit is left alone: the next
+        # upload of the same content creates the row and replaces it, and deleting
+        # it here could remove that upload's object instead
+        if not promoted:
+            await storage.delete(staging_path)
     await db.refresh(artifact)
     return artifact
 
 
+def _blob_path(checksum: str) -> str:
+    return f"blobs/{checksum[:2]}/{checksum}"
+
+
+async def _add_blob_reference(
+    db: AsyncSession,
+    checksum: str,
+    size: int,
+    storage_path: str,
+    content_encoding: str | None = None,
+    stored_size: int | None = None,
+) -> bool:
+    """Count one more Artifact row against a blob, creating the blob row if needed.
+
+    Returns True when this call created the row.
+    """
+    for _ in range(2):
+        result = await db.execute(
+            update(ArtifactBlob)
+            .where(ArtifactBlob.checksum_sha256 == checksum)
+            .values(ref_count=ArtifactBlob.ref_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            return False
+        db.add(ArtifactBlob(
+            checksum_sha256=checksum,
+            size_bytes=size,
+            storage_path=storage_path,
+            content_encoding=content_encoding,
+            stored_size_bytes=stored_size,
+            ref_count=1,
+        ))
+        try:
+            await db.flush()
+            return True
+        except IntegrityError:
+            # Another upload of the same content created it first; count against theirs
+            await db.rollback()
+    raise RuntimeError(f"Could not register artifact blob {checksum}")
+
+
+async def delete_run_artifacts(db: AsyncSession, run_id: str) -> int:
+    """Delete a run's artifacts, garbage-collecting blobs no other artifact references.
+
+    Objects are removed before the blob rows are committed, while the rows are still
+    locked, so a concurrent upload of the same content can't take a reference to a
+    blob that is about to disappear. Returns the number of artifacts deleted.
+    """
+    artifacts = await list_artifacts(db, run_id)
+    if not artifacts:
+        return 0
+
+    refs: dict[str, int] = {}
+    log_paths = set()
+    for artifact in artifacts:
+        if artifact.filename == RUN_LOG_FILENAME:
+            log_paths.add(artifact.storage_path)
+        refs[artifact.storage_path] = refs.get(artifact.storage_path, 0) + 1
+        await db.delete(artifact)
+
+    for path, count in refs.items():
+        await db.execute(
+            update(ArtifactBlob)
+            .where(ArtifactBlob.storage_path == path)
+            .values(ref_count=ArtifactBlob.ref_count - count)
+            .execution_options(synchronize_session=False)
+        )
+    result = await db.execute(
+        delete(ArtifactBlob)
+        .where(ArtifactBlob.storage_path.in_(refs), ArtifactBlob.ref_count <= 0)
+        .returning(ArtifactBlob.storage_path)
+        .execution_options(synchronize_session=False)
+    )
+    unreferenced = set(result.scalars().all())
+    # Artifacts stored before deduplication have no blob row and own their object
+    blob_backed = set(
+        (await db.execute(
+            select(ArtifactBlob.storage_path).where(ArtifactBlob.storage_path.in_(refs))
+        )).scalars().all()
+    )
+    legacy = {path for path in refs if path not in blob_backed and path not in unreferenced}
+
+    storage = get_storage()
+    for path in unreferenced | legacy:
+        try:
+            await storage.delete(path)
+            if path in log_paths:
+                log_index.forget(path)
+                await storage.delete(log_index.index_path(path))
+        except Exception:
+            # An orphaned object only wastes space; a dangling blob row would lose data
+            logger.exception(f"Failed to delete artifact object {path}")
+    await db.commit()
+    return len(artifacts)
+
+
 async def list_artifacts(db: AsyncSession, run_id: str) -> list[Artifact]:
     result = await db.execute(
         select(Artifact)
@@ -53,5 +250,60 @@ async def get_artifact(db: AsyncSession, artifact_id: str) -> Artifact | None:
 
 
 async def read_artifact_data(artifact: Artifact) -> bytes:
+    """The artifact's content, decompressed."""
     storage = get_storage()
-    return await storage.read(artifact.storage_path)
+    data = await storage.read(artifact.storage_path)
+    if artifact.content_encoding == "gzip":
+        return await asyncio.to_thread(gzip.decompress, data)
+    return data
+
+
+def stream_artifact_data(
+    artifact: Artifact, start: int = 0, end: int | None = None, decode: bool = True
+) -> AsyncIterator[bytes]:
+    """Yield the artifact's bytes (optionally one inclusive byte range) in chunks.
+
+    With decode=False the stored bytes are returned as is, and the range applies to
+    them; otherwise compressed artifacts are decompressed on the fly, which means
+    decoding (and discarding) everything before start.
+    """
+    storage = get_storage()
+    if not decode or artifact.content_encoding is None:
+        return storage.read_stream(artifact.storage_path, start, end)
+    decoded = compression.gunzip_stream(storage.read_stream(artifact.storage_path))
+    if start == 0 and end is None:
+        return decoded
+    return compression.slice_stream(decoded, start, end)
+
+
+def artifact_stored_size(artifact: Artifact) -> int:
+    if artifact.stored_size_bytes is None:
+        return artifact.size_bytes
+    return artifact.stored_size_bytes
+
+
+def artifact_local_path(artifact: Artifact) -> Path | None:
+    """Where the artifact lives on local disk, if the storage backend is local."""
+    return get_storage().local_path(artifact.storage_path)
+
+
+async def artifact_download_url(artifact: Artifact) -> str | None:
+    """Presigned URL to fetch the artifact straight from object storage, if supported.
+
+    The object is served as stored, so for compressed artifacts the URL is only
+    usable by clients that accept its Content-Encoding.
+    """
+    return await get_storage().download_url(
+        artifact.storage_path, artifact.filename, artifact.content_type, artifact.content_encoding
+    )
+
+
+def artifact_etag(artifact: Artifact, encoded: bool = False) -> str:
+    """ETag of the decoded content, or (encoded=True) of the stored, compressed bytes.
+
+    The encoded tag is weak: the checksum covers the decoded content, and the same
+    content gzipped at another level or by another zlib is different bytes.
+    """
+    if encoded and artifact.content_encoding:
+        return f'W/"{artifact.checksum_sha256}-{artifact.content_encoding}"'
+    return f'"{artifact.checksum_sha256}"'
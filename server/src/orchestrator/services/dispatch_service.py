@@ -0,0 +1,31 @@
+"""In-process wakeups for long-polling workers.
+
+Pollers waiting on ``POST /workers/poll?wait=N`` subscribe to their
+workspace and are woken as soon as a run is queued there by this process.
+Runs queued by other server processes are found by the pollers' periodic
+re-check (settings.poll_recheck_interval) instead.
+"""
+
+import asyncio
+from collections import defaultdict
+
+_waiters: dict[str, set[asyncio.Event]] = defaultdict(set)
+
+
+def subscribe(workspace_id: str) -> asyncio.Event:
+    event = asyncio.Event()
+    _waiters[workspace_id].add(event)
+    return event
+
+
+def unsubscribe(workspace_id: str, event: asyncio.Event) -> None:
+    if workspace_id in _waiters:
+        _waiters[workspace_id].discard(event)
+        if not _waiters[workspace_id]:
+            del _waiters[workspace_id]
+
+
+def notify_run_queued(workspace_id: str) -> None:
+    """Wake every poller waiting on this workspace."""
+    for event in _waiters.get(workspace_id, ()):
+        event.set()
@@ -1,17 +1,34 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from orchestrator.models.job_definition import JobDefinition
 from orchestrator.models.job_run import JobRun
-from orchestrator.schemas.jobs import JobDefinitionCreate, JobDefinitionUpdate
+from orchestrator.pagination import paginate
+from orchestrator.schemas.jobs import (
+    JobDefinitionCreate,
+    JobDefinitionSummaryResponse,
+    JobDefinitionUpdate,
+)
+from orchestrator.services import dispatch_service, run_service
 
+# Listing order, and the key cursors resume from
+JOB_PAGE_KEYS = (JobDefinition.created_at, JobDefinition.id)
+# Columns behind JobDefinitionSummaryResponse
+_SUMMARY_COLUMNS = [getattr(JobDefinition, name) for name in JobDefinitionSummaryResponse.model_fields]
 
-async def list_jobs(db: AsyncSession, workspace_id: str) -> list[JobDefinition]:
-    result = await db.execute(
-        select(JobDefinition)
-        .where(JobDefinition.workspace_id == workspace_id)
-        .order_by(JobDefinition.created_at.desc())
-    )
+
+async def list_jobs(
+    db: AsyncSession,
+    workspace_id: str,
+    after: tuple | None = None,
+    limit: int | None = None,
+    summary: bool = False,
+) -> list[JobDefinition]:
+    query = select(JobDefinition).where(JobDefinition.workspace_id == workspace_id)
+    if summary:
+        query = query.options(load_only(*_SUMMARY_COLUMNS))
+    result = await db.execute(paginate(query, JOB_PAGE_KEYS, after, limit))
     return list(result.scalars().all())
 
 
@@ -37,6 +54,9 @@ async def create_job(db: AsyncSession, data: JobDefinitionCreate, workspace_id:
         skill_ids=data.skill_ids,
         labels=data.labels,
         timeout_seconds=data.timeout_seconds,
+        priority=data.priority,
+        fair_share_weight=data.fair_share_weight,
+        max_concurrent_runs=data.max_concurrent_runs,
     )
     db.add(job)
     await db.commit()
@@ -90,8 +110,13 @@ async def trigger_run(db: AsyncSession, job_id: str, workspace_id: str | None =
         skill_ids=job.skill_ids,
         required_labels=job.labels,  # Copy job labels as required worker labels
         timeout_seconds=job.timeout_seconds,
+        priority=job.priority,
+        dispatch_key=await run_service.next_dispatch_key(
+            db, job.workspace_id, job.id, job.fair_share_weight, job.priority
+        ),
     )
     db.add(run)
     await db.commit()
     await db.refresh(run)
+    dispatch_service.notify_run_queued(run.workspace_id)
     return run
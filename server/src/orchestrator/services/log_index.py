@@ -0,0 +1,177 @@
+"""Line-offset index for stored log files, so reads can seek to a sequence number.
+
+A log file's index lives next to it in storage as ``<path>.idx``: a small header
+(stride and stored size) followed by checkpoints, each a byte offset in the stored
+object and the number of lines before it. Reading the lines after sequence N costs
+one index lookup plus a ranged read from the nearest checkpoint, instead of a scan
+of the whole file.
+
+Plain logs get a checkpoint every ``stride`` lines. Gzipped logs can only be
+entered at the start of a gzip member, so they get one at each member that starts
+on a line boundary and is at least ``stride`` lines past the previous checkpoint.
+"""
+
+import bisect
+import logging
+import struct
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from orchestrator import compression
+from orchestrator.config import settings
+from orchestrator.storage import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"LIDX2"
+_HEADER = struct.Struct("<5sIQ")  # magic, stride, stored size
+_CHECKPOINT = struct.Struct("<QQ")  # byte offset, lines before it
+
+# Parsed indexes by storage path. Log files never change once
+# stored, so entries only leave through LRU eviction.
+_cache: OrderedDict[str, "LogIndex"] = OrderedDict()
+_CACHE_SIZE = 256
+
+
+def index_path(path: str) -> str:
+    return f"{path}.idx"
+
+
+@dataclass
+class LogIndex:
+    stride: int
+    size: int
+    # Reading from offsets[k] yields line lines[k] + 1 first; both lists ascend
+    offsets: list[int]
+    lines: list[int]
+
+    def encode(self) -> bytes:
+        header = _HEADER.pack(_MAGIC, self.stride, self.size)
+        return header + b"".join(_CHECKPOINT.pack(o, n) for o, n in zip(self.offsets, self.lines, strict=True))
+
+    @classmethod
+    def decode(cls, data: bytes) -> "LogIndex | None":
+        if len(data) < _HEADER.size:
+            return None
+        magic, stride, size = _HEADER.unpack_from(data)
+        body = data[_HEADER.size:]
+        if magic != _MAGIC or not stride or not body or len(body) % _CHECKPOINT.size:
+            return None
+        pairs = list(_CHECKPOINT.iter_unpack(body))
+        return cls(stride, size, [o for o, _ in pairs], [n for _, n in pairs])
+
+    def checkpoint(self, after_sequence: int) -> tuple[int, int]:
+        """(offset, lines before it) of the last checkpoint at or before after_sequence."""
+        k = max(bisect.bisect_right(self.lines, max(after_sequence, 0)) - 1, 0)
+        return self.offsets[k], self.lines[k]
+
+
+async def build_index(
+    storage: StorageBackend, path: str, stride: int, encoding: str | None = None
+) -> LogIndex:
+    """Scan a log file once and record where to resume reading every stride or so lines."""
+    if encoding == "gzip":
+        return await _build_gzip_index(storage, path, stride)
+
+    offsets, line_counts = [0], [0]
+    lines = 0  # completed lines so far
+    pos = 0
+    async for chunk in storage.read_stream(path):
+        start = 0
+        while True:
+            needed = stride - lines % stride
+            if chunk.count(b"\n", start) < needed:
+                lines += chunk.count(b"\n", start)
+                break
+            idx = start - 1
+            for _ in range(needed):
+                idx = chunk.index(b"\n", idx + 1)
+            lines += needed
+            offsets.append(pos + idx + 1)
+            line_counts.append(lines)
+            start = idx + 1
+        pos += len(chunk)
+    return LogIndex(stride, pos, offsets, line_counts)
+
+
+async def _build_gzip_index(storage: StorageBackend, path: str, stride: int) -> LogIndex:
+    offsets, line_counts = [0], [0]
+    lines = 0
+    member = 0
+    at_line_start = True
+    size = 0
+
+    async def counted() -> AsyncIterator[bytes]:
+        nonlocal size
+        async for chunk in storage.read_stream(path):
+            size += len(chunk)
+            yield chunk
+
+    async for member_start, data in compression.gunzip_members(counted()):
+        if member_start != member and at_line_start and lines - line_counts[-1] >= stride:
+            offsets.append(member_start)
+            line_counts.append(lines)
+        member = member_start
+        lines += data.count(b"\n")
+        at_line_start = data.endswith(b"\n")
+    return LogIndex(stride, size, offsets, line_counts)
+
+
+async def _load_index(storage: StorageBackend, path: str, encoding: str | None) -> LogIndex:
+    cached = _cache.get(path)
+    if cached is not None:
+        _cache.move_to_end(path)
+        return cached
+
+    try:
+        index = LogIndex.decode(await storage.read(index_path(path)))
+    except FileNotFoundError:
+        index = None
+    stride = settings.log_index_stride
+    if index is None or index.stride != stride:
+        index = await build_index(storage, path, stride, encoding)
+        try:
+            await storage.save(index_path(path), index.encode())
+        except Exception:
+            # Still usable from memory; it will be rebuilt after a restart
+            logger.warning(f"Could not persist log index for {path}", exc_info=True)
+
+    _cache[path] = index
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return index
+
+
+async def iter_lines_after(
+    storage: StorageBackend, path: str, after_sequence: int = 0, encoding: str | None = None
+) -> AsyncIterator[tuple[int, bytes]]:
+    """Yield (sequence, raw line) for every line after after_sequence.
+
+    Lines are split on ``\\n`` and numbered from 1; a trailing ``\\r`` is stripped.
+    encoding is the stored object's content encoding (None or "gzip").
+    """
+    index = await _load_index(storage, path, encoding)
+    start, seq = index.checkpoint(after_sequence)
+    if start >= index.size:
+        return
+    chunks = storage.read_stream(path, start)
+    if encoding == "gzip":
+        chunks = compression.gunzip_stream(chunks)
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *complete, buffer = buffer.split(b"\n")
+        for raw in complete:
+            seq += 1
+            if seq > after_sequence:
+                yield seq, raw.removesuffix(b"\r")
+    if buffer:
+        seq += 1
+        if seq > after_sequence:
+            yield seq, buffer.removesuffix(b"\r")
+
+
+def forget(path: str) -> None:
+    """Drop a cached index, e.g. when its log file is deleted."""
+    _cache.pop(path, None)
@@ -1,19 +1,31 @@
 import asyncio
+import contextlib
 import logging
 import re
-from collections import defaultdict
-from dataclasses import dataclass
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
 
+from sqlalchemy import delete, make_url, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from orchestrator.broadcast import (
+    Broadcaster,
+    MemoryBroadcaster,
+    PostgresBroadcaster,
+    RedisBroadcaster,
+)
+from orchestrator.config import settings
 from orchestrator.models.artifact import Artifact
+from orchestrator.models.job_log import JobLog
 from orchestrator.schemas.workers import LogLine
-from orchestrator.services import artifact_service
+from orchestrator.services import artifact_service, log_index
+from orchestrator.storage import get_storage
 
 logger = logging.getLogger(__name__)
 
 # In-memory subscribers for SSE log streaming
-_subscribers: dict[str, list[asyncio.Queue]] = defaultdict(list)
+_subscribers: dict[str, list["Subscription"]] = defaultdict(list)
 
 _LOG_LINE_RE = re.compile(r"^\[(stdout|stderr|event)\] (.*)$")
 
@@ -25,36 +37,122 @@ class LogEntry:
     sequence: int
 
 
+class LogWriteError(Exception):
+    """A group commit this append was part of failed."""
+
+
+@dataclass
+class _Batch:
+    rows: list[dict]
+    full: asyncio.Event = field(default_factory=asyncio.Event)
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+    error: BaseException | None = None
+
+
+class LogWriter:
+    """Group commit for incoming log lines.
+
+    The first append to arrive leads a batch: it waits up to ``log_commit_interval``
+    for concurrent appends (other runs, other workers) to join, then writes every
+    row with one INSERT and one commit on its own session. The others wait for that
+    commit, so each request still returns only once its lines are durable.
+    """
+
+    def __init__(self):
+        self._open: _Batch | None = None
+
+    async def write(self, db: AsyncSession, rows: list[dict]) -> None:
+        batch = self._open
+        if batch is not None:
+            batch.rows.extend(rows)
+            if len(batch.rows) >= settings.log_commit_max_lines:
+                self._open = None
+                batch.full.set()
+            await batch.done.wait()
+            if batch.error is not None:
+                raise LogWriteError("Failed to store log lines") from batch.error
+            return
+
+        batch = self._open = _Batch(list(rows))
+        try:
+            if len(batch.rows) < settings.log_commit_max_lines:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(batch.full.wait(), settings.log_commit_interval)
+            if self._open is batch:
+                self._open = None
+            await _insert_lines(db, batch.rows)
+            await db.commit()
+        except BaseException as e:
+            batch.error = e
+            raise
+        finally:
+            if self._open is batch:
+                self._open = None
+            batch.done.set()
+
+
+_writer = LogWriter()
+
+
+async def _insert_lines(db: AsyncSession, rows: list[dict]) -> None:
+    # Workers resend a batch when a post fails, so a line may arrive twice
+    unique = list({(r["run_id"], r["sequence"]): r for r in rows}.values())
+    dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(JobLog).on_conflict_do_nothing(index_elements=["run_id", "sequence"])
+    await db.execute(stmt, unique)
+
+
 async def append_logs(db: AsyncSession, run_id: str, lines: list[LogLine]) -> int:
-    # SSE pub/sub only — no DB writes
-    for queue in _subscribers.get(run_id, []):
-        for line in lines:
-            await queue.put(line)
+    """Persist a batch of live log lines, then fan them out to SSE subscribers."""
+    if not lines:
+        return 0
+    await _writer.write(db, [
+        {"run_id": run_id, "stream": line.stream, "line": line.line, "sequence": line.sequence}
+        for line in lines
+    ])
 
+    _get_broadcaster().publish(run_id, lines)
     return len(lines)
 
 
+async def discard_live_logs(db: AsyncSession, run_id: str) -> None:
+    """Drop a run's live tail once its run-output.log artifact holds the full log."""
+    await db.execute(delete(JobLog).where(JobLog.run_id == run_id))
+    await db.commit()
+
+
 async def get_logs(
     db: AsyncSession, run_id: str, after_sequence: int = 0
 ) -> list[LogEntry]:
-    """Read logs from the run-output.log artifact."""
+    """Read logs after a sequence number.
+
+    Finished runs are served from the run-output.log artifact; runs still in
+    progress from the live tail in job_logs.
+    """
     artifacts = await artifact_service.list_artifacts(db, run_id)
     log_artifact: Artifact | None = None
     for a in artifacts:
-        if a.filename == "run-output.log":
+        if a.filename == artifact_service.RUN_LOG_FILENAME:
             log_artifact = a
             break
 
     if not log_artifact:
-        return []
-
-    data = await artifact_service.read_artifact_data(log_artifact)
-    text = data.decode("utf-8", errors="replace")
+        result = await db.execute(
+            select(JobLog)
+            .where(JobLog.run_id == run_id, JobLog.sequence > after_sequence)
+            .order_by(JobLog.sequence)
+        )
+        return [
+            LogEntry(stream=row.stream, line=row.line, sequence=row.sequence)
+            for row in result.scalars().all()
+        ]
 
+    # Seek via the log's offset index rather than reading the whole file
     entries: list[LogEntry] = []
-    for seq, raw_line in enumerate(text.splitlines(), start=1):
-        if seq <= after_sequence:
-            continue
+    async for seq, raw in log_index.iter_lines_after(
+        get_storage(), log_artifact.storage_path, after_sequence, log_artifact.content_encoding
+    ):
+        raw_line = raw.decode("utf-8", errors="replace")
         match = _LOG_LINE_RE.match(raw_line)
         if match:
             entries.append(LogEntry(stream=match.group(1), line=match.group(2), sequence=seq))
@@ -64,14 +162,132 @@ async def get_logs(
     return entries
 
 
-def subscribe(run_id: str) -> asyncio.Queue:
-    queue: asyncio.Queue = asyncio.Queue()
-    _subscribers[run_id].append(queue)
-    return queue
+def _deliver(run_id: str, lines: list[LogLine]) -> None:
+    for subscription in _subscribers.get(run_id, []):
+        subscription.publish(lines)
+
+
+def _has_subscribers(run_id: str) -> bool:
+    return run_id in _subscribers
+
+
+async def _load_lines(run_id: str, first: int, last: int) -> list[LogLine]:
+    from orchestrator.database import async_session
+
+    async with async_session() as db:
+        result = await db.execute(
+            select(JobLog)
+            .where(JobLog.run_id == run_id, JobLog.sequence.between(first, last))
+            .order_by(JobLog.sequence)
+        )
+        return [
+            LogLine(stream=row.stream, line=row.line, sequence=row.sequence)
+            for row in result.scalars().all()
+        ]
+
+
+_broadcaster: Broadcaster | None = None
+
+
+def _get_broadcaster() -> Broadcaster:
+    global _broadcaster
+    if _broadcaster is None:
+        if settings.broadcast_backend == "postgres":
+            dsn = make_url(settings.database_url).set(drivername="postgresql")
+            _broadcaster = PostgresBroadcaster(
+                _deliver,
+                dsn=dsn.render_as_string(hide_password=False),
+                has_subscribers=_has_subscribers,
+                load=_load_lines,
+                channel=settings.broadcast_channel,
+                batch_interval=settings.broadcast_batch_interval,
+            )
+        elif settings.broadcast_backend == "redis":
+            _broadcaster = RedisBroadcaster(
+                _deliver,
+                url=settings.broadcast_redis_url,
+                channel=settings.broadcast_channel,
+                batch_interval=settings.broadcast_batch_interval,
+            )
+        else:
+            _broadcaster = MemoryBroadcaster(_deliver)
+    return _broadcaster
+
+
+async def start_broadcast() -> None:
+    """Start receiving live log lines published by other server processes."""
+    await _get_broadcaster().start()
+
+
+async def close_broadcast() -> None:
+    global _broadcaster
+    if _broadcaster is not None:
+        await _broadcaster.close()
+        _broadcaster = None
+
+
+class LogGap(Exception):
+    """A subscriber fell behind and lines were dropped from its buffer."""
+
+
+class Subscription:
+    """One SSE client's live lines for a run, in a bounded ring buffer.
+
+    Publishing never waits on the client: once the buffer is full the oldest lines
+    are dropped, and the next ``get`` raises LogGap so the client can resync from
+    stored logs by sequence.
+    """
+
+    def __init__(self, maxlen: int):
+        self._buffer: deque[LogLine] = deque(maxlen=maxlen)
+        self._overflowed = False
+        self._ready = asyncio.Event()
+
+    def publish(self, lines: list[LogLine]) -> None:
+        if len(self._buffer) + len(lines) > self._buffer.maxlen:
+            self._overflowed = True
+        self._buffer.extend(lines)
+        self._ready.set()
+
+    async def get(self, timeout: float) -> list[LogLine]:
+        """Take every buffered line, waiting up to timeout (then TimeoutError) for one."""
+        if not self._buffer and not self._overflowed:
+            self._ready.clear()
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        if self._overflowed:
+            # The resync reads everything from storage, so the buffer is moot
+            self._overflowed = False
+            self._buffer.clear()
+            raise LogGap
+        lines = list(self._buffer)
+        self._buffer.clear()
+        return lines
+
+    async def get_batch(self, timeout: float, max_lines: int, max_latency: float) -> list[LogLine]:
+        """Like get, but once a line arrives keep collecting others for up to
+        max_latency seconds or until at least max_lines are in hand."""
+        lines = await self.get(timeout)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_latency
+        while len(lines) < max_lines:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                lines += await self.get(remaining)
+            except TimeoutError:
+                break
+        return lines
+
+
+def subscribe(run_id: str) -> Subscription:
+    subscription = Subscription(settings.log_subscriber_buffer)
+    _subscribers[run_id].append(subscription)
+    return subscription
 
 
-def unsubscribe(run_id: str, queue: asyncio.Queue) -> None:
+def unsubscribe(run_id: str, subscription: Subscription) -> None:
     if run_id in _subscribers:
-        _subscribers[run_id] = [q for q in _subscribers[run_id] if q is not queue]
+        _subscribers[run_id] = [s for s in _subscribers[run_id] if s is not subscription]
         if not _subscribers[run_id]:
             del _subscribers[run_id]
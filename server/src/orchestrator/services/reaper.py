@@ -0,0 +1,173 @@
+"""Background sweep for dead workers and overdue runs.
+
+A live worker whose last heartbeat is older than ``worker_heartbeat_timeout`` is
+marked offline, and the runs it held are taken back: each is re-queued for
+another worker up to ``run_max_retries`` times, then failed. Runs still in
+flight ``run_timeout_grace`` seconds past their ``timeout_seconds`` are timed
+out, in case the worker holding them never reports back.
+
+Every step is a guarded UPDATE, so each server process can run its own reaper.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import bindparam, exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from orchestrator.config import settings
+from orchestrator.database import async_session
+from orchestrator.models.base import utcnow
+from orchestrator.models.job_run import JobRun
+from orchestrator.models.worker import Worker
+from orchestrator.services import dispatch_service, worker_service
+
+logger = logging.getLogger(__name__)
+
+# Worker statuses that promise a heartbeat
+LIVE_WORKER_STATUSES = ("online", "busy")
+
+
+@dataclass
+class ReapResult:
+    workers_expired: int = 0
+    runs_requeued: int = 0
+    runs_failed: int = 0
+    runs_timed_out: int = 0
+
+
+def _in_flight():
+    # Inlined rather than bound, like the queued filter in claim_runs, so Postgres
+    # can match the partial ix_job_runs_active index from prepared statements
+    return JobRun.status.in_(
+        bindparam(
+            "in_flight", list(worker_service.ACTIVE_RUN_STATUSES), expanding=True, literal_execute=True
+        )
+    )
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes; they are stored in UTC
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+async def expire_workers(db: AsyncSession, now: datetime) -> int:
+    """Mark live workers that stopped heartbeating offline."""
+    cutoff = now - timedelta(seconds=settings.worker_heartbeat_timeout)
+    result = await db.execute(
+        update(Worker)
+        .where(Worker.status.in_(LIVE_WORKER_STATUSES), Worker.last_heartbeat < cutoff)
+        .values(status="offline", current_run_id=None)
+        .returning(Worker.id)
+        .execution_options(synchronize_session=False)
+    )
+    expired = list(result.scalars().all())
+    await db.commit()
+    if expired:
+        logger.warning("Marked %d worker(s) offline after missed heartbeats: %s", len(expired), expired)
+    return len(expired)
+
+
+async def recover_orphaned_runs(db: AsyncSession, now: datetime) -> tuple[int, int]:
+    """Re-queue runs held by offline workers, failing those out of retries.
+
+    Returns (re-queued, failed).
+    """
+    # Driven from the few in-flight runs, probing each one's worker by primary key
+    orphaned = (
+        _in_flight(),
+        exists(select(Worker.id).where(Worker.id == JobRun.worker_id, Worker.status == "offline")),
+    )
+    requeued = await db.execute(
+        update(JobRun)
+        .where(*orphaned, JobRun.retry_count < settings.run_max_retries)
+        .values(status="queued", worker_id=None, started_at=None, retry_count=JobRun.retry_count + 1)
+        .returning(JobRun.id, JobRun.workspace_id)
+        .execution_options(synchronize_session=False)
+    )
+    requeued_rows = requeued.all()
+    failed = await db.execute(
+        update(JobRun)
+        .where(*orphaned)
+        .values(
+            status="failed",
+            completed_at=now,
+            result=f"Worker stopped heartbeating and the run was already retried {settings.run_max_retries} time(s)",
+        )
+        .returning(JobRun.id)
+        .execution_options(synchronize_session=False)
+    )
+    failed_ids = list(failed.scalars().all())
+    await db.commit()
+
+    if requeued_rows:
+        logger.warning("Re-queued %d run(s) from offline workers: %s", len(requeued_rows), [r[0] for r in requeued_rows])
+    if failed_ids:
+        logger.warning("Failed %d run(s) from offline workers, out of retries: %s", len(failed_ids), failed_ids)
+    for workspace_id in {workspace_id for _, workspace_id in requeued_rows}:
+        dispatch_service.notify_run_queued(workspace_id)
+    return len(requeued_rows), len(failed_ids)
+
+
+async def expire_timed_out_runs(db: AsyncSession, now: datetime) -> int:
+    """Time out in-flight runs that overran timeout_seconds plus the grace period."""
+    grace = settings.run_timeout_grace
+    # Nothing started since the horizon can be overdue yet
+    horizon = now - timedelta(seconds=grace)
+    result = await db.execute(
+        select(JobRun.id, JobRun.started_at, JobRun.timeout_seconds).where(
+            _in_flight(), JobRun.started_at < horizon
+        )
+    )
+    overdue = [
+        run_id
+        for run_id, started_at, timeout_seconds in result.all()
+        if _as_utc(started_at) + timedelta(seconds=timeout_seconds + grace) < now
+    ]
+    if not overdue:
+        await db.commit()  # end the read transaction; a rollback would expire the session
+        return 0
+
+    timed_out = await db.execute(
+        update(JobRun)
+        .where(JobRun.id.in_(overdue), _in_flight())
+        .values(
+            status="timeout",
+            completed_at=now,
+            result="No result was reported within the run's timeout; timed out by the server",
+        )
+        .returning(JobRun.id, JobRun.worker_id)
+        .execution_options(synchronize_session=False)
+    )
+    rows = timed_out.all()
+    for worker_id in {worker_id for _, worker_id in rows if worker_id}:
+        await worker_service.release_slots(db, worker_id)
+    await db.commit()
+
+    if rows:
+        logger.warning("Timed out %d overdue run(s): %s", len(rows), [r[0] for r in rows])
+    return len(rows)
+
+
+async def reap(db: AsyncSession, now: datetime | None = None) -> ReapResult:
+    """One sweep: expire workers, recover their runs, then time out overdue runs."""
+    now = now or utcnow()
+    result = ReapResult()
+    result.workers_expired = await expire_workers(db, now)
+    result.runs_requeued, result.runs_failed = await recover_orphaned_runs(db, now)
+    result.runs_timed_out = await expire_timed_out_runs(db, now)
+    return result
+
+
+async def run_reaper():
+    """Background loop that sweeps every reaper_interval seconds."""
+    logger.info("Reaper starting (sweep every %ss)", settings.reaper_interval)
+    while True:
+        try:
+            async with async_session() as db:
+                await reap(db)
+        except Exception:
+            logger.exception("Reaper sweep error")
+        await asyncio.sleep(settings.reaper_interval)
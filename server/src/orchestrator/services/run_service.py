@@ -1,19 +1,44 @@
-from sqlalchemy import select
+import time
+
+from sqlalchemy import delete, func, literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
+from orchestrator.config import settings
+from orchestrator.models.job_log import JobLog
 from orchestrator.models.job_run import JobRun
-from orchestrator.schemas.runs import RunCreate
+from orchestrator.models.job_run_label import JobRunLabel
+from orchestrator.pagination import paginate
+from orchestrator.schemas.runs import RunCreate, RunSummaryResponse
+from orchestrator.services import artifact_service, dispatch_service
+
+# Listing order, and the key cursors resume from
+RUN_PAGE_KEYS = (JobRun.created_at, JobRun.id)
+# Columns behind RunSummaryResponse; the prompt, configs and result can be large
+_SUMMARY_COLUMNS = [getattr(JobRun, name) for name in RunSummaryResponse.model_fields]
 
 
 async def list_runs(
-    db: AsyncSession, workspace_id: str, job_id: str | None = None, status: str | None = None
+    db: AsyncSession,
+    workspace_id: str,
+    job_id: str | None = None,
+    status: str | None = None,
+    after: tuple | None = None,
+    limit: int | None = None,
+    summary: bool = False,
 ) -> list[JobRun]:
-    query = select(JobRun).where(JobRun.workspace_id == workspace_id).order_by(JobRun.created_at.desc())
+    """Runs newest first, optionally one page of them (see orchestrator.pagination).
+
+    With summary=True only the columns in RunSummaryResponse are loaded.
+    """
+    query = select(JobRun).where(JobRun.workspace_id == workspace_id)
     if job_id:
         query = query.where(JobRun.job_definition_id == job_id)
     if status:
         query = query.where(JobRun.status == status)
-    result = await db.execute(query)
+    if summary:
+        query = query.options(load_only(*_SUMMARY_COLUMNS))
+    result = await db.execute(paginate(query, RUN_PAGE_KEYS, after, limit))
     return list(result.scalars().all())
 
 
@@ -25,6 +50,55 @@ async def get_run(db: AsyncSession, run_id: str, workspace_id: str | None = None
     return result.scalar_one_or_none()
 
 
+async def next_dispatch_key(
+    db: AsyncSession,
+    workspace_id: str,
+    job_definition_id: str | None,
+    weight: int = 1,
+    priority: int = 0,
+) -> float:
+    """Virtual start time for a new run (weighted fair queuing).
+
+    The workspace's virtual clock is the key at the head of its queue for this
+    priority. A job with nothing queued starts there, right behind the runs
+    already due; a job with a backlog is spaced ``fair_share_quantum / weight``
+    after its last queued run. Order therefore depends only on what each job
+    has queued, not on how long the queue has been waiting. Ad-hoc runs share
+    one group. Both lookups are single seeks on the queue indexes.
+    """
+    head = await db.execute(
+        select(JobRun.dispatch_key)
+        .where(
+            JobRun.status == literal("queued", literal_execute=True),
+            JobRun.workspace_id == workspace_id,
+            JobRun.priority == priority,
+        )
+        .order_by(JobRun.dispatch_key.asc())
+        .limit(1)
+    )
+    # An empty queue has no virtual time to keep; start it from the wall clock
+    virtual_now = head.scalar_one_or_none()
+    if virtual_now is None:
+        virtual_now = time.time()
+
+    job_filter = (
+        JobRun.job_definition_id == job_definition_id
+        if job_definition_id
+        else JobRun.job_definition_id.is_(None)
+    )
+    result = await db.execute(
+        select(func.max(JobRun.dispatch_key)).where(
+            JobRun.workspace_id == workspace_id,
+            job_filter,
+            JobRun.status == "queued",
+        )
+    )
+    last_key = result.scalar_one_or_none()
+    if last_key is None:
+        return virtual_now
+    return max(virtual_now, last_key + settings.fair_share_quantum / max(weight, 1))
+
+
 async def create_adhoc_run(db: AsyncSession, data: RunCreate, workspace_id: str) -> JobRun:
     run = JobRun(
         workspace_id=workspace_id,
@@ -38,10 +112,13 @@ async def create_adhoc_run(db: AsyncSession, data: RunCreate, workspace_id: str)
         skill_ids=data.skill_ids,
         required_labels=data.required_labels,
         timeout_seconds=data.timeout_seconds,
+        priority=data.priority,
+        dispatch_key=await next_dispatch_key(db, workspace_id, None, priority=data.priority),
     )
     db.add(run)
     await db.commit()
     await db.refresh(run)
+    dispatch_service.notify_run_queued(workspace_id)
     return run
 
 
@@ -53,3 +130,22 @@ async def cancel_run(db: AsyncSession, run_id: str, workspace_id: str) -> JobRun
     await db.commit()
     await db.refresh(run)
     return run
+
+
+async def delete_run(db: AsyncSession, run_id: str, workspace_id: str) -> bool:
+    """Delete a finished run with its logs and artifacts (releasing their blobs).
+
+    Raises ValueError if the run is still queued or in flight.
+    """
+    run = await get_run(db, run_id, workspace_id)
+    if not run:
+        return False
+    if run.status in ("queued", "assigned", "running"):
+        raise ValueError(f"Run {run_id} is still {run.status}")
+
+    await artifact_service.delete_run_artifacts(db, run_id)
+    await db.execute(delete(JobLog).where(JobLog.run_id == run_id))
+    await db.execute(delete(JobRunLabel).where(JobRunLabel.run_id == run_id))
+    await db.delete(run)
+    await db.commit()
+    return True
@@ -1,20 +1,29 @@
 import hashlib
 import logging
 import mimetypes
+import os
 import shutil
+import tarfile
+from collections.abc import Iterator
 from pathlib import Path
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from orchestrator.config import settings
 from orchestrator.models.skill import Skill
 from orchestrator.models.skill_file import SkillFile
-from orchestrator.schemas.skills import SkillUpdate
+from orchestrator.pagination import paginate
+from orchestrator.schemas.skills import SkillSummaryResponse, SkillUpdate
+from orchestrator.schemas.workers import SkillFilePollInfo, SkillPollInfo
 from orchestrator.services.skill_parser import ParsedSkill
 
 logger = logging.getLogger(__name__)
 
+# Resolved skill manifests per workspace: workspace_id -> (version, {name: SkillPollInfo})
+_manifest_cache: dict[str, tuple[tuple, dict[str, SkillPollInfo]]] = {}
+
 
 def _skill_dir(workspace_id: str, skill_name: str) -> Path:
     return Path(settings.skill_storage_path) / workspace_id / skill_name
@@ -26,12 +35,21 @@ def _ensure_skill_dir(workspace_id: str, skill_name: str) -> Path:
     return d
 
 
-async def list_skills(db: AsyncSession, workspace_id: str) -> list[Skill]:
-    result = await db.execute(
+# Skills list alphabetically; names are unique within a workspace
+SKILL_PAGE_KEYS = (Skill.name, Skill.id)
+# Listings leave out the instructions body and metadata
+_SUMMARY_COLUMNS = [getattr(Skill, name) for name in SkillSummaryResponse.model_fields]
+
+
+async def list_skills(
+    db: AsyncSession, workspace_id: str, after: tuple | None = None, limit: int | None = None
+) -> list[Skill]:
+    query = (
         select(Skill)
         .where(Skill.workspace_id == workspace_id)
-        .order_by(Skill.name)
+        .options(load_only(*_SUMMARY_COLUMNS))
     )
+    result = await db.execute(paginate(query, SKILL_PAGE_KEYS, after, limit, descending=False))
     return list(result.scalars().all())
 
 
@@ -121,6 +139,7 @@ async def create_skill(
 
     await db.commit()
     await db.refresh(skill)
+    invalidate_manifest(workspace_id)
     return skill
 
 
@@ -135,6 +154,7 @@ async def update_skill(
         setattr(skill, field, value)
     await db.commit()
     await db.refresh(skill)
+    invalidate_manifest(workspace_id)
     return skill
 
 
@@ -155,9 +175,129 @@ async def delete_skill(db: AsyncSession, skill_id: str, workspace_id: str) -> bo
 
     await db.delete(skill)
     await db.commit()
+    invalidate_manifest(workspace_id)
     return True
 
 
+async def get_skill_manifest(db: AsyncSession, workspace_id: str) -> dict[str, SkillPollInfo]:
+    """Every skill in the workspace with its file manifest, keyed by name.
+
+    Loaded with a single joined query and cached per workspace. Each call checks
+    the workspace's skill version (count and latest ``updated_at``) first, so a
+    change committed by another server process is picked up on the next read.
+    The version is read before the manifest: a manifest loaded while a change
+    commits is stored under the older version and replaced on the next call.
+    """
+    version = tuple((await db.execute(
+        select(func.count(Skill.id), func.max(Skill.updated_at))
+        .where(Skill.workspace_id == workspace_id)
+    )).one())
+    cached = _manifest_cache.get(workspace_id)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    result = await db.execute(
+        select(Skill, SkillFile)
+        .outerjoin(SkillFile, SkillFile.skill_id == Skill.id)
+        .where(Skill.workspace_id == workspace_id)
+        .order_by(Skill.name, SkillFile.file_path)
+    )
+    manifest: dict[str, SkillPollInfo] = {}
+    for skill, skill_file in result.all():
+        info = manifest.get(skill.name)
+        if info is None:
+            info = manifest[skill.name] = SkillPollInfo(
+                id=skill.id,
+                name=skill.name,
+                instructions=skill.instructions,
+                allowed_tools=skill.allowed_tools,
+                files=[],
+            )
+        if skill_file is not None:
+            info.files.append(SkillFilePollInfo(
+                file_path=skill_file.file_path,
+                size_bytes=skill_file.size_bytes,
+                checksum_sha256=skill_file.checksum_sha256,
+                content_type=skill_file.content_type,
+            ))
+
+    _manifest_cache[workspace_id] = (version, manifest)
+    return manifest
+
+
+def invalidate_manifest(workspace_id: str | None = None) -> None:
+    """Drop the cached manifest for one workspace, or for all of them."""
+    if workspace_id is None:
+        _manifest_cache.clear()
+    else:
+        _manifest_cache.pop(workspace_id, None)
+
+
+def resolve_run_skills(
+    manifest: dict[str, SkillPollInfo], skill_ids: list | None
+) -> list[SkillPollInfo]:
+    """Pick a run's skills out of the workspace manifest."""
+    if skill_ids is None:
+        return list(manifest.values())  # null = all workspace skills
+    # Explicit list of skill names ([] = no skills)
+    return [manifest[name] for name in skill_ids if name in manifest]
+
+
+def skill_bundle_etag(skills: list[SkillPollInfo]) -> str:
+    """Weak ETag for a skill bundle, derived from its file paths and checksums.
+
+    The tar.gz is built on every request, and its bytes depend on the compression
+    level and zlib version, so only the content it unpacks to is promised.
+    """
+    digest = hashlib.sha256()
+    for skill in skills:
+        for f in skill.files:
+            digest.update(f"{skill.name}/{f.file_path}\0{f.checksum_sha256}\n".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+class _BundleBuffer:
+    """Write-only sink that tarfile streams into and the bundle generator drains."""
+
+    def __init__(self):
+        self._data = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self._data += data
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = bytes(self._data)
+        self._data.clear()
+        return data
+
+
+def iter_skill_bundle(workspace_id: str, skills: list[SkillPollInfo]) -> Iterator[bytes]:
+    """Stream the skills' files as a tar.gz laid out as ``<skill name>/<file path>``.
+
+    Blocking file IO; StreamingResponse runs sync iterators in a threadpool.
+    """
+    buf = _BundleBuffer()
+    with tarfile.open(fileobj=buf, mode="w|gz") as tar:
+        for skill in skills:
+            for f in skill.files:
+                path = get_skill_file_path(workspace_id, skill.name, f.file_path)
+                try:
+                    fh = path.open("rb")
+                except FileNotFoundError:
+                    logger.warning(f"Skill file missing from storage: {skill.name}/{f.file_path}")
+                    continue
+                with fh:
+                    info = tarfile.TarInfo(f"{skill.name}/{f.file_path}")
+                    info.size = os.fstat(fh.fileno()).st_size
+                    info.mode = 0o644
+                    tar.addfile(info, fh)
+                if chunk := buf.drain():
+                    yield chunk
+    if chunk := buf.drain():
+        yield chunk
+
+
 def get_skill_file_path(workspace_id: str, skill_name: str, file_path: str) -> Path:
     """Return the absolute path to a skill file on disk."""
     return _skill_dir(workspace_id, skill_name) / file_path
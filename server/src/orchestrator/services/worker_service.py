@@ -1,27 +1,37 @@
+import asyncio
 import contextlib
-from datetime import timedelta
+from collections.abc import Awaitable, Callable
 
-from sqlalchemy import select, update
+from sqlalchemy import and_, exists, func, literal, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from orchestrator.config import settings
 from orchestrator.encryption import decrypt_value
 from orchestrator.models.base import utcnow
 from orchestrator.models.credential import Credential
+from orchestrator.models.job_definition import JobDefinition
 from orchestrator.models.job_run import JobRun
-from orchestrator.models.skill import Skill
-from orchestrator.models.skill_file import SkillFile
+from orchestrator.models.job_run_label import JobRunLabel, encode_label_value
 from orchestrator.models.worker import Worker
+from orchestrator.pagination import paginate
 from orchestrator.schemas.workers import (
     PollResponse,
-    SkillFilePollInfo,
     SkillPollInfo,
     WorkerRegisterRequest,
 )
+from orchestrator.services import dispatch_service, skill_service
+
+# Run statuses that occupy one of a worker's slots
+ACTIVE_RUN_STATUSES = ("assigned", "running")
 
 
 async def register_worker(db: AsyncSession, data: WorkerRegisterRequest, workspace_id: str) -> Worker:
-    worker = Worker(workspace_id=workspace_id, name=data.name, labels=data.labels)
+    worker = Worker(
+        workspace_id=workspace_id,
+        name=data.name,
+        labels=data.labels,
+        max_concurrency=data.max_concurrency,
+    )
     db.add(worker)
     await db.commit()
     await db.refresh(worker)
@@ -53,126 +63,302 @@ def labels_match(required_labels: dict | None, worker_labels: dict | None) -> bo
     )
 
 
-async def poll_for_job(db: AsyncSession, worker_id: str) -> PollResponse | None:
-    """Atomically assign a queued job to this worker, respecting label and workspace constraints."""
+def labels_satisfied_by(worker_labels: dict | None):
+    """SQL equivalent of labels_match for a JobRun query.
+
+    A run is eligible when it has no job_run_labels row that the worker's
+    labels fail to satisfy.
+    """
+    unsatisfied = select(JobRunLabel.run_id).where(JobRunLabel.run_id == JobRun.id)
+    if worker_labels:
+        unsatisfied = unsatisfied.where(
+            ~or_(*(
+                and_(JobRunLabel.key == key, JobRunLabel.value == encode_label_value(value))
+                for key, value in worker_labels.items()
+            ))
+        )
+    return ~exists(unsatisfied)
+
+
+async def count_active_runs(db: AsyncSession, worker_id: str) -> int:
+    result = await db.execute(
+        select(func.count(JobRun.id)).where(
+            JobRun.worker_id == worker_id,
+            JobRun.status.in_(ACTIVE_RUN_STATUSES),
+        )
+    )
+    return result.scalar_one()
+
+
+async def get_active_run_ids(db: AsyncSession, workspace_id: str) -> dict[str, list[str]]:
+    """Map worker id -> runs currently occupying its slots, for one workspace."""
+    result = await db.execute(
+        select(JobRun.worker_id, JobRun.id)
+        .where(
+            JobRun.workspace_id == workspace_id,
+            JobRun.status.in_(ACTIVE_RUN_STATUSES),
+            JobRun.worker_id.is_not(None),
+        )
+        .order_by(JobRun.started_at.asc())
+    )
+    active: dict[str, list[str]] = {}
+    for worker_id, run_id in result.all():
+        active.setdefault(worker_id, []).append(run_id)
+    return active
+
+
+async def _job_headroom(db: AsyncSession, workspace_id: str) -> dict[str, int]:
+    """Free run slots per job definition that has a max_concurrent_runs cap.
+
+    The capped definitions are locked (in id order, so claimers can't deadlock)
+    before their active runs are counted, and stay locked until the caller's
+    transaction ends. Concurrent claimers therefore take turns and each sees the
+    runs the previous one assigned, instead of both spending the same headroom.
+    """
+    caps_result = await db.execute(
+        select(JobDefinition.id, JobDefinition.max_concurrent_runs)
+        .where(
+            JobDefinition.workspace_id == workspace_id,
+            JobDefinition.max_concurrent_runs.is_not(None),
+        )
+        .order_by(JobDefinition.id)
+        .with_for_update()
+    )
+    caps: dict[str, int] = dict(caps_result.all())
+    if not caps:
+        return {}
+    active_result = await db.execute(
+        select(JobRun.job_definition_id, func.count(JobRun.id))
+        .where(
+            JobRun.workspace_id == workspace_id,
+            JobRun.status.in_(ACTIVE_RUN_STATUSES),
+            JobRun.job_definition_id.in_(caps),
+        )
+        .group_by(JobRun.job_definition_id)
+    )
+    active: dict[str, int] = dict(active_result.all())
+    return {job_id: cap - active.get(job_id, 0) for job_id, cap in caps.items()}
+
+
+async def claim_runs(db: AsyncSession, worker_id: str, max_runs: int = 1) -> list[PollResponse]:
+    """Atomically assign up to ``max_runs`` queued jobs to this worker in one transaction.
+
+    Respects label and workspace constraints and never exceeds the worker's free slots.
+
+    The claim reads ix_job_runs_queued in dispatch order from the head of the
+    workspace's queue. Runs this worker can't take (labels it lacks, or jobs at
+    their max_concurrent_runs cap) are filtered out as the index is walked, so
+    the cost is O(log n + k), k being how many such runs sit ahead of the ones
+    claimed. That is the whole queue only when none of it is eligible. Runs
+    turned away because a batch filled their job's cap are replaced from further
+    down the queue, at one more index scan per job that fills up.
+    """
     # Get worker first (needed for labels and workspace scoping)
     worker_result = await db.execute(select(Worker).where(Worker.id == worker_id))
     worker = worker_result.scalar_one_or_none()
     if not worker:
-        return None
-    worker_labels = worker.labels or {}
+        return []
 
-    # Find oldest queued runs in the worker's workspace and match labels in Python
-    result = await db.execute(
-        select(JobRun)
-        .where(JobRun.status == "queued", JobRun.workspace_id == worker.workspace_id)
-        .order_by(JobRun.created_at.asc())
-    )
-    run = None
-    for candidate in result.scalars().all():
-        if labels_match(candidate.required_labels, worker_labels):
-            run = candidate
-            break
+    # Only hand out work while the worker has free slots
+    active_runs = await count_active_runs(db, worker_id)
+    limit = min(max_runs, worker.max_concurrency - active_runs)
+    if limit <= 0:
+        return []
 
-    if not run:
-        return None
+    # Jobs already at their concurrency cap can't take more runs right now
+    headroom = await _job_headroom(db, worker.workspace_id)
+
+    # Next runs in dispatch order (priority, then fair-share key) in the worker's
+    # workspace whose labels this worker satisfies. On Postgres, SKIP LOCKED lets
+    # concurrent claimers take disjoint rows without blocking; SQLite drops the
+    # clause, its single write lock already serializes claimers and the status
+    # guard below catches any run lost in between.
+    query = (
+        select(JobRun.id, JobRun.job_definition_id)
+        .where(
+            # Inlined rather than bound: Postgres can't match a parameter against the
+            # partial ix_job_runs_queued index in the generic plans of prepared statements
+            JobRun.status == literal("queued", literal_execute=True),
+            JobRun.workspace_id == worker.workspace_id,
+            labels_satisfied_by(worker.labels),
+        )
+        .order_by(JobRun.priority.desc(), JobRun.dispatch_key.asc(), JobRun.created_at.asc())
+        .with_for_update(skip_locked=True)
+    )
+    candidate_ids: list[str] = []
+    while len(candidate_ids) < limit:
+        wanted = limit - len(candidate_ids)
+        page = query.limit(wanted)
+        saturated = [job_id for job_id, free in headroom.items() if free <= 0]
+        if saturated:
+            page = page.where(
+                or_(JobRun.job_definition_id.is_(None), JobRun.job_definition_id.not_in(saturated))
+            )
+        if candidate_ids:
+            page = page.where(JobRun.id.not_in(candidate_ids))
+        rows = (await db.execute(page)).all()
+        for run_id, job_id in rows:
+            # A batch must not push a capped job past its remaining headroom
+            if job_id in headroom:
+                if headroom[job_id] <= 0:
+                    continue
+                headroom[job_id] -= 1
+            candidate_ids.append(run_id)
+        if len(rows) < wanted:
+            break  # the rest of the queue is ineligible
+    if not candidate_ids:
+        # Nothing to assign: end the transaction so the job locks aren't held
+        await db.commit()
+        return []
 
-    # Atomic assign: only update if still queued (prevents race condition)
+    # Atomic assign: only update rows that are still queued (prevents race condition)
     assign_result = await db.execute(
         update(JobRun)
-        .where(JobRun.id == run.id, JobRun.status == "queued")
+        .where(JobRun.id.in_(candidate_ids), JobRun.status == "queued")
         .values(status="assigned", worker_id=worker_id, started_at=utcnow())
+        .returning(JobRun.id)
+        .execution_options(synchronize_session=False)
     )
+    claimed = set(assign_result.scalars().all())
+    run_ids = [run_id for run_id in candidate_ids if run_id in claimed]
+    if not run_ids:
+        await db.rollback()
+        return []
 
-    # If another worker already grabbed it, rowcount will be 0
-    if assign_result.rowcount == 0:  # type: ignore[union-attr]
-        return None
-
-    # Update worker status
+    # Update worker status: busy once every slot is taken
     await db.execute(
         update(Worker)
         .where(Worker.id == worker_id)
-        .values(status="busy", current_run_id=run.id)
+        .values(
+            status="busy" if active_runs + len(run_ids) >= worker.max_concurrency else "online",
+            current_run_id=run_ids[-1],
+        )
     )
 
     await db.commit()
 
-    # Re-fetch the run to get the updated state
-    result = await db.execute(select(JobRun).where(JobRun.id == run.id))
-    run = result.scalar_one_or_none()
-    if not run:
-        return None
+    # Re-fetch the runs to get the updated state
+    result = await db.execute(select(JobRun).where(JobRun.id.in_(run_ids)))
+    runs_by_id = {run.id: run for run in result.scalars().all()}
+    runs = [runs_by_id[run_id] for run_id in run_ids if run_id in runs_by_id]
 
-    # Decrypt credentials (scoped to workspace)
-    credentials: dict[str, str] = {}
-    if run.credential_ids:
+    # Decrypt credentials once for the whole batch (scoped to workspace)
+    credential_names = {name for run in runs for name in (run.credential_ids or [])}
+    decrypted: dict[str, tuple[str, str]] = {}  # name -> (env_var, value)
+    if credential_names:
         cred_result = await db.execute(
             select(Credential).where(
-                Credential.name.in_(run.credential_ids),
+                Credential.name.in_(credential_names),
                 Credential.workspace_id == worker.workspace_id,
             )
         )
         for cred in cred_result.scalars().all():
             with contextlib.suppress(Exception):
-                credentials[cred.env_var] = decrypt_value(cred.encrypted_value)
+                decrypted[cred.name] = (cred.env_var, decrypt_value(cred.encrypted_value))
 
-    # Resolve skills (scoped to workspace)
-    skill_poll_infos: list[SkillPollInfo] = []
-    skill_ids = run.skill_ids  # null=all, []=none, ["name"]=specific
+    # Resolve skills from the workspace's cached manifest (scoped to workspace)
+    skill_infos: dict[str, SkillPollInfo] = {}
+    if any(run.skill_ids is None or run.skill_ids for run in runs):
+        skill_infos = await skill_service.get_skill_manifest(db, worker.workspace_id)
 
-    if skill_ids is None:
-        # null = all workspace skills
-        skill_result = await db.execute(
-            select(Skill).where(Skill.workspace_id == worker.workspace_id)
-        )
-        skills = list(skill_result.scalars().all())
-    elif skill_ids:
-        # Explicit list of skill names
-        skill_result = await db.execute(
-            select(Skill).where(
-                Skill.name.in_(skill_ids),
-                Skill.workspace_id == worker.workspace_id,
-            )
+    responses: list[PollResponse] = []
+    for run in runs:
+        credentials = dict(
+            decrypted[name] for name in (run.credential_ids or []) if name in decrypted
         )
-        skills = list(skill_result.scalars().all())
-    else:
-        # Empty list = no skills
-        skills = []
-
-    for skill in skills:
-        # Fetch file manifest for each skill
-        file_result = await db.execute(
-            select(SkillFile).where(SkillFile.skill_id == skill.id)
-        )
-        skill_files = [
-            SkillFilePollInfo(
-                file_path=sf.file_path,
-                size_bytes=sf.size_bytes,
-                checksum_sha256=sf.checksum_sha256,
-                content_type=sf.content_type,
-            )
-            for sf in file_result.scalars().all()
-        ]
-        skill_poll_infos.append(SkillPollInfo(
-            id=skill.id,
-            name=skill.name,
-            instructions=skill.instructions,
-            allowed_tools=skill.allowed_tools,
-            files=skill_files,
+        skills = skill_service.resolve_run_skills(skill_infos, run.skill_ids)
+        responses.append(PollResponse(
+            run_id=run.id,
+            name=run.name,
+            task_prompt=run.task_prompt,
+            agent_type=run.agent_type,
+            agent_config=run.agent_config or {},
+            mcp_servers=run.mcp_servers or [],
+            env_vars=run.env_vars or {},
+            credentials=credentials,
+            skills=skills,
+            timeout_seconds=run.timeout_seconds,
         ))
+    return responses
+
 
-    return PollResponse(
-        run_id=run.id,
-        name=run.name,
-        task_prompt=run.task_prompt,
-        agent_type=run.agent_type,
-        agent_config=run.agent_config or {},
-        mcp_servers=run.mcp_servers or [],
-        env_vars=run.env_vars or {},
-        credentials=credentials,
-        skills=skill_poll_infos,
-        timeout_seconds=run.timeout_seconds,
+async def poll_for_job(db: AsyncSession, worker_id: str) -> PollResponse | None:
+    """Atomically assign a queued job to this worker, respecting label and workspace constraints."""
+    claimed = await claim_runs(db, worker_id, max_runs=1)
+    return claimed[0] if claimed else None
+
+
+async def wait_for_runs(
+    db: AsyncSession,
+    worker_id: str,
+    max_runs: int,
+    timeout: float,
+    is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+) -> list[PollResponse]:
+    """Long-poll variant of claim_runs.
+
+    Holds until at least one run is assigned to this worker or ``timeout``
+    seconds pass. Between attempts the poller sleeps on the workspace's
+    dispatch event, so a run queued by this process is picked up immediately
+    instead of on the next poll. The event is per process, so the poller also
+    re-checks the queue every ``poll_recheck_interval`` seconds to find runs
+    queued through other server processes or replicas.
+    """
+    worker_result = await db.execute(select(Worker.workspace_id).where(Worker.id == worker_id))
+    workspace_id = worker_result.scalar_one_or_none()
+    if not workspace_id:
+        return []
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        # Subscribe before querying so a run queued in between still wakes us
+        wakeup = dispatch_service.subscribe(workspace_id)
+        try:
+            claimed = await claim_runs(db, worker_id, max_runs)
+            if claimed:
+                return claimed
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return []
+            # End the read transaction so SQLite writers aren't blocked while we wait
+            await db.rollback()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(
+                    wakeup.wait(), timeout=min(remaining, settings.poll_recheck_interval)
+                )
+        finally:
+            dispatch_service.unsubscribe(workspace_id, wakeup)
+        # Don't claim runs for a worker that has already gone away
+        if is_disconnected and await is_disconnected():
+            return []
+
+
+async def wait_for_job(
+    db: AsyncSession,
+    worker_id: str,
+    timeout: float,
+    is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+) -> PollResponse | None:
+    """Long-poll variant of poll_for_job."""
+    claimed = await wait_for_runs(db, worker_id, 1, timeout, is_disconnected)
+    return claimed[0] if claimed else None
+
+
+async def release_slots(db: AsyncSession, worker_id: str) -> None:
+    """Recompute a worker's status and current run after some of its runs ended."""
+    worker_result = await db.execute(select(Worker).where(Worker.id == worker_id))
+    worker = worker_result.scalar_one_or_none()
+    if not worker or worker.status == "offline":
+        return
+    remaining = await db.execute(
+        select(JobRun.id)
+        .where(JobRun.worker_id == worker_id, JobRun.status.in_(ACTIVE_RUN_STATUSES))
+        .order_by(JobRun.started_at.desc())
     )
+    remaining_ids = list(remaining.scalars().all())
+    worker.status = "busy" if len(remaining_ids) >= worker.max_concurrency else "online"
+    worker.current_run_id = remaining_ids[0] if remaining_ids else None
 
 
 async def complete_run(
@@ -188,40 +374,32 @@ async def complete_run(
     if not run:
         return None
 
+    # The run already ended (cancelled, or timed out by the reaper) or was
+    # re-queued for another worker after this one stopped heartbeating
+    if run.status not in ACTIVE_RUN_STATUSES or (worker_id and run.worker_id != worker_id):
+        return run
+
     run.status = status
     run.result = result
     run.exit_code = exit_code
     run.completed_at = utcnow()
+    await db.flush()
 
-    # Free the worker
-    worker_result = await db.execute(select(Worker).where(Worker.id == worker_id))
-    worker = worker_result.scalar_one_or_none()
-    if worker:
-        worker.status = "online"
-        worker.current_run_id = None
+    # Free the worker's slot
+    await release_slots(db, worker_id)
 
     await db.commit()
     await db.refresh(run)
     return run
 
 
-async def list_workers(db: AsyncSession, workspace_id: str) -> list[Worker]:
-    result = await db.execute(
-        select(Worker)
-        .where(Worker.workspace_id == workspace_id)
-        .order_by(Worker.created_at.desc())
-    )
-    workers = list(result.scalars().all())
-
-    # Mark stale workers as offline based on heartbeat timeout
-    # Strip tzinfo to match SQLite's naive datetime storage
-    cutoff = utcnow().replace(tzinfo=None) - timedelta(seconds=settings.worker_heartbeat_timeout)
-    changed = False
-    for worker in workers:
-        if worker.status in ("online", "busy") and worker.last_heartbeat < cutoff:
-            worker.status = "offline"
-            changed = True
-    if changed:
-        await db.commit()
+# Listing order, and the key cursors resume from
+WORKER_PAGE_KEYS = (Worker.created_at, Worker.id)
+
 
-    return workers
+async def list_workers(
+    db: AsyncSession, workspace_id: str, after: tuple | None = None, limit: int | None = None
+) -> list[Worker]:
+    query = select(Worker).where(Worker.workspace_id == workspace_id)
+    result = await db.execute(paginate(query, WORKER_PAGE_KEYS, after, limit))
+    return list(result.scalars().all())
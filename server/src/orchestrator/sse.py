@@ -0,0 +1,39 @@
+"""Server-sent event helpers."""
+
+import asyncio
+import zlib
+
+from sse_starlette.sse import EventSourceResponse
+from starlette.types import Message, Receive, Scope, Send
+
+
+class GzipEventSourceResponse(EventSourceResponse):
+    """An EventSourceResponse gzip-encoded on the wire.
+
+    Every chunk is sync-flushed, so events and pings reach the client as soon as
+    they are sent instead of waiting in the compressor for more input.
+    """
+
+    def __init__(self, *args, compress_level: int = 6, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.compress_level = compress_level
+        self.headers["Content-Encoding"] = "gzip"
+        self.headers["Vary"] = "Accept-Encoding"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        compressor = zlib.compressobj(self.compress_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        # Events and pings are sent from separate tasks; compressed output must
+        # reach the socket in the order it was produced
+        lock = asyncio.Lock()
+
+        async def gzip_send(message: Message) -> None:
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            async with lock:
+                more_body = message.get("more_body", False)
+                body = compressor.compress(message.get("body", b""))
+                body += compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+                await send({**message, "body": body})
+
+        await super().__call__(scope, receive, gzip_send)
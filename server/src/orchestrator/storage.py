@@ -1,38 +1,372 @@
+import asyncio
+import functools
+import os
+import tempfile
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import BinaryIO
 
 from orchestrator.config import settings
 
+READ_CHUNK_SIZE = 64 * 1024
+
 
 class StorageBackend(ABC):
     @abstractmethod
     async def save(self, path: str, data: bytes) -> None: ...
 
+    @abstractmethod
+    async def save_stream(self, path: str, chunks: AsyncIterable[bytes]) -> None:
+        """Write chunks to path as they arrive, without holding the whole object in memory."""
+
     @abstractmethod
     async def read(self, path: str) -> bytes: ...
 
+    @abstractmethod
+    def read_stream(self, path: str, start: int = 0, end: int | None = None) -> AsyncIterator[bytes]:
+        """Yield the object's bytes from start to end (inclusive; None = to the end) in chunks."""
+
     @abstractmethod
     async def delete(self, path: str) -> None: ...
 
+    @abstractmethod
+    async def move(self, src: str, dst: str) -> None:
+        """Rename an object, replacing whatever is at dst."""
+
+    def local_path(self, path: str) -> Path | None:
+        """Filesystem path of the object, for backends that keep it on local disk.
+
+        Lets the API hand the file to FileResponse, which serves ranges itself and
+        uses zero-copy sendfile where the ASGI server supports it.
+        """
+        return None
+
+    async def download_url(
+        self, path: str, filename: str, content_type: str, content_encoding: str | None = None
+    ) -> str | None:
+        """A short-lived URL clients can fetch the object from directly, bypassing the API.
+
+        None when the backend can't hand out such URLs; the API streams the bytes instead.
+        """
+        return None
+
 
 class LocalStorageBackend(StorageBackend):
+    """Files under base_path. All disk I/O runs on a bounded thread pool so a slow
+    disk never stalls the event loop, and writes land atomically via temp file + rename.
+    """
+
     def __init__(self, base_path: str):
         self.base_path = Path(base_path)
 
     async def save(self, path: str, data: bytes) -> None:
+        await _run_io(_write_atomic, self.base_path / path, data)
+
+    async def save_stream(self, path: str, chunks: AsyncIterable[bytes]) -> None:
         full_path = self.base_path / path
-        full_path.parent.mkdir(parents=True, exist_ok=True)
-        full_path.write_bytes(data)
+        f = await _run_io(_open_temp, full_path)
+        try:
+            async for chunk in chunks:
+                await _run_io(f.write, chunk)
+            await _run_io(f.close)
+            await _run_io(os.replace, f.name, full_path)
+        except BaseException:
+            await _run_io(_discard_temp, f)
+            raise
 
     async def read(self, path: str) -> bytes:
+        return await _run_io((self.base_path / path).read_bytes)
+
+    async def read_stream(self, path: str, start: int = 0, end: int | None = None) -> AsyncIterator[bytes]:
         full_path = self.base_path / path
-        return full_path.read_bytes()
+        remaining = None if end is None else end - start + 1
+        f = await _run_io(full_path.open, "rb")
+        try:
+            await _run_io(f.seek, start)
+            while remaining is None or remaining > 0:
+                size = READ_CHUNK_SIZE if remaining is None else min(READ_CHUNK_SIZE, remaining)
+                chunk = await _run_io(f.read, size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await _run_io(f.close)
 
     async def delete(self, path: str) -> None:
-        full_path = self.base_path / path
-        if full_path.exists():
-            full_path.unlink()
+        await _run_io((self.base_path / path).unlink, missing_ok=True)
+
+    async def move(self, src: str, dst: str) -> None:
+        await _run_io(_rename, self.base_path / src, self.base_path / dst)
+
+    def local_path(self, path: str) -> Path | None:
+        return self.base_path / path
+
+
+_io_executor: ThreadPoolExecutor | None = None
+
+
+async def _run_io[T](fn: Callable[..., T], *args, **kwargs) -> T:
+    """Run blocking file I/O on the storage thread pool."""
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(
+            max_workers=settings.storage_io_threads, thread_name_prefix="storage-io"
+        )
+    return await asyncio.get_running_loop().run_in_executor(
+        _io_executor, functools.partial(fn, *args, **kwargs)
+    )
+
+
+def _open_temp(full_path: Path) -> BinaryIO:
+    """Open a temp file next to full_path, so the final rename stays on one filesystem."""
+    full_path.parent.mkdir(parents=True, exist_ok=True)
+    return tempfile.NamedTemporaryFile(
+        dir=full_path.parent, prefix=f".{full_path.name}.", suffix=".tmp", delete=False
+    )
+
+
+def _discard_temp(f: BinaryIO) -> None:
+    f.close()
+    Path(f.name).unlink(missing_ok=True)
+
+
+def _rename(src: Path, dst: Path) -> None:
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(src, dst)
+
+
+def _write_atomic(full_path: Path, data: bytes) -> None:
+    f = _open_temp(full_path)
+    try:
+        with f:
+            f.write(data)
+        os.replace(f.name, full_path)
+    except BaseException:
+        _discard_temp(f)
+        raise
+
+
+class S3StorageBackend(StorageBackend):
+    """Objects in an S3-compatible bucket (AWS S3, MinIO, ...), via aiobotocore.
+
+    One pooled client is shared by every request. Streams larger than a single part
+    are sent as multipart uploads with several parts in flight at once; downloads are
+    served by redirecting to a presigned URL so the bytes never pass through the API.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: str | None = None,
+        region: str | None = None,
+        access_key_id: str | None = None,
+        secret_access_key: str | None = None,
+        part_size: int = 8 * 1024 * 1024,
+        max_concurrency: int = 8,
+        max_pool_connections: int = 32,
+        presign_downloads: bool = True,
+        presign_expiry: int = 300,
+    ):
+        try:
+            from aiobotocore.config import AioConfig
+            from aiobotocore.session import get_session
+        except ImportError as e:
+            raise RuntimeError(
+                "The S3 storage backend needs aiobotocore: pip install 'flight-control-server[s3]'"
+            ) from e
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.part_size = part_size
+        self.max_concurrency = max_concurrency
+        self.presign_downloads = presign_downloads
+        self.presign_expiry = presign_expiry
+        self._client_context = get_session().create_client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            region_name=region or None,
+            aws_access_key_id=access_key_id or None,
+            aws_secret_access_key=secret_access_key or None,
+            config=AioConfig(max_pool_connections=max_pool_connections),
+        )
+        self._client = None
+        self._client_lock = asyncio.Lock()
+
+    def _key(self, path: str) -> str:
+        return f"{self.prefix}/{path}" if self.prefix else path
+
+    async def _get_client(self):
+        if self._client is None:
+            async with self._client_lock:
+                if self._client is None:
+                    self._client = await self._client_context.__aenter__()
+        return self._client
+
+    async def save(self, path: str, data: bytes) -> None:
+        if len(data) <= self.part_size:
+            client = await self._get_client()
+            await client.put_object(Bucket=self.bucket, Key=self._key(path), Body=data)
+            return
+
+        async def chunks() -> AsyncIterator[bytes]:
+            yield data
+
+        await self.save_stream(path, chunks())
+
+    async def save_stream(self, path: str, chunks: AsyncIterable[bytes]) -> None:
+        client = await self._get_client()
+        key = self._key(path)
+        buffer = bytearray()
+        upload_id: str | None = None
+        part_number = 0
+        parts: list[dict] = []
+        in_flight: set[asyncio.Task] = set()
+        slots = asyncio.Semaphore(self.max_concurrency)
+
+        async def upload_part(number: int, body: bytes) -> None:
+            try:
+                resp = await client.upload_part(
+                    Bucket=self.bucket, Key=key, UploadId=upload_id, PartNumber=number, Body=body
+                )
+                parts.append({"PartNumber": number, "ETag": resp["ETag"]})
+            finally:
+                slots.release()
+
+        async def send_part(body: bytes) -> None:
+            nonlocal upload_id, part_number
+            if upload_id is None:
+                resp = await client.create_multipart_upload(Bucket=self.bucket, Key=key)
+                upload_id = resp["UploadId"]
+            # Waiting for a free slot here is what bounds memory to max_concurrency parts
+            await slots.acquire()
+            for task in [t for t in in_flight if t.done()]:
+                in_flight.discard(task)
+                task.result()
+            part_number += 1
+            in_flight.add(asyncio.create_task(upload_part(part_number, body)))
+
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                while len(buffer) >= self.part_size:
+                    await send_part(bytes(buffer[: self.part_size]))
+                    del buffer[: self.part_size]
+
+            if upload_id is None:
+                # Everything fit in one part: a plain PUT is cheaper than a multipart upload
+                await client.put_object(Bucket=self.bucket, Key=key, Body=bytes(buffer))
+                return
+            if buffer:
+                await send_part(bytes(buffer))
+            await asyncio.gather(*in_flight)
+            await client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": sorted(parts, key=lambda p: p["PartNumber"])},
+            )
+        except BaseException:
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+            if upload_id is not None:
+                await client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
+            raise
+
+    async def read(self, path: str) -> bytes:
+        client = await self._get_client()
+        try:
+            resp = await client.get_object(Bucket=self.bucket, Key=self._key(path))
+        except client.exceptions.NoSuchKey as e:
+            raise FileNotFoundError(path) from e
+        async with resp["Body"] as body:
+            return await body.read()
+
+    async def read_stream(self, path: str, start: int = 0, end: int | None = None) -> AsyncIterator[bytes]:
+        client = await self._get_client()
+        byte_range = f"bytes={start}-{'' if end is None else end}"
+        try:
+            resp = await client.get_object(Bucket=self.bucket, Key=self._key(path), Range=byte_range)
+        except client.exceptions.NoSuchKey as e:
+            raise FileNotFoundError(path) from e
+        async with resp["Body"] as body:
+            async for chunk in body.iter_chunks(READ_CHUNK_SIZE):
+                yield chunk
+
+    async def delete(self, path: str) -> None:
+        client = await self._get_client()
+        await client.delete_object(Bucket=self.bucket, Key=self._key(path))
+
+    async def move(self, src: str, dst: str) -> None:
+        # S3 has no rename; a server-side copy keeps the bytes off this process
+        # (single-request CopyObject handles objects up to 5 GiB)
+        client = await self._get_client()
+        await client.copy_object(
+            Bucket=self.bucket,
+            Key=self._key(dst),
+            CopySource={"Bucket": self.bucket, "Key": self._key(src)},
+        )
+        await client.delete_object(Bucket=self.bucket, Key=self._key(src))
+
+    async def download_url(
+        self, path: str, filename: str, content_type: str, content_encoding: str | None = None
+    ) -> str | None:
+        if not self.presign_downloads:
+            return None
+        client = await self._get_client()
+        params = {
+            "Bucket": self.bucket,
+            "Key": self._key(path),
+            "ResponseContentDisposition": f'attachment; filename="{filename}"',
+            "ResponseContentType": content_type,
+        }
+        if content_encoding:
+            params["ResponseContentEncoding"] = content_encoding
+        return await client.generate_presigned_url(
+            "get_object", Params=params, ExpiresIn=self.presign_expiry
+        )
+
+    async def close(self) -> None:
+        """Release the pooled client."""
+        if self._client is not None:
+            await self._client_context.__aexit__(None, None, None)
+            self._client = None
+
+
+_s3_backend: S3StorageBackend | None = None
 
 
 def get_storage() -> StorageBackend:
+    global _s3_backend
+    if settings.storage_backend == "s3":
+        # Shared so every request reuses the same connection pool
+        if _s3_backend is None:
+            if not settings.s3_bucket:
+                raise RuntimeError("ORCH_S3_BUCKET must be set when ORCH_STORAGE_BACKEND=s3")
+            _s3_backend = S3StorageBackend(
+                bucket=settings.s3_bucket,
+                prefix=settings.s3_prefix,
+                endpoint_url=settings.s3_endpoint_url,
+                region=settings.s3_region,
+                access_key_id=settings.s3_access_key_id,
+                secret_access_key=settings.s3_secret_access_key,
+                part_size=settings.s3_part_size,
+                max_concurrency=settings.s3_max_concurrency,
+                max_pool_connections=settings.s3_max_pool_connections,
+                presign_downloads=settings.s3_presign_downloads,
+                presign_expiry=settings.s3_presign_expiry,
+            )
+        return _s3_backend
     return LocalStorageBackend(settings.artifact_storage_path)
+
+
+async def close_storage() -> None:
+    global _s3_backend
+    if _s3_backend is not None:
+        await _s3_backend.close()
+        _s3_backend = None
@@ -1,10 +1,20 @@
+import pytest
 import pytest_asyncio
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from orchestrator import auth
 from orchestrator.models.base import Base
 from orchestrator.models.user import User
 from orchestrator.models.workspace import Workspace
 from orchestrator.models.workspace_member import WorkspaceMember
+from orchestrator.services import skill_service
+
+
+@pytest.fixture(autouse=True)
+def _reset_caches():
+    """Each test gets a fresh database, so module-level caches must not leak between them."""
+    skill_service.invalidate_manifest()
+    auth.invalidate_auth_cache()
 
 
 @pytest_asyncio.fixture
@@ -1,9 +1,13 @@
+import gzip
 import hashlib
 
+import httpx
 import pytest
 import pytest_asyncio
+from sqlalchemy import select
 
 from orchestrator.models.artifact import Artifact
+from orchestrator.models.artifact_blob import ArtifactBlob
 from orchestrator.services import artifact_service
 
 
@@ -24,7 +28,32 @@ async def test_save_artifact(db, storage_dir):
     assert artifact.content_type == "text/plain"
     assert artifact.size_bytes == len(data)
     assert artifact.checksum_sha256 == hashlib.sha256(data).hexdigest()
-    assert artifact.storage_path == "run123/output.log"
+    checksum = hashlib.sha256(data).hexdigest()
+    assert artifact.storage_path == f"blobs/{checksum[:2]}/{checksum}"
+
+
+@pytest.mark.asyncio
+async def test_text_artifacts_are_stored_compressed(db, storage_dir):
+    data = b"".join(f"step {i}: ok\n".encode() for i in range(2000))
+    artifact = await artifact_service.save_artifact(
+        db, run_id="run1", filename="steps.log", data=data, content_type="text/plain"
+    )
+    assert artifact.content_encoding == "gzip"
+    assert artifact.size_bytes == len(data)
+    assert artifact.checksum_sha256 == hashlib.sha256(data).hexdigest()
+    stored = (storage_dir / artifact.storage_path).read_bytes()
+    assert artifact.stored_size_bytes == len(stored) < len(data)
+    assert gzip.decompress(stored) == data
+
+    assert await artifact_service.read_artifact_data(artifact) == data
+    ranged = b"".join([c async for c in artifact_service.stream_artifact_data(artifact, 10, 29)])
+    assert ranged == data[10:30]
+
+    binary = await artifact_service.save_artifact(
+        db, run_id="run1", filename="model.bin", data=b"\x00" * 4096,
+        content_type="application/octet-stream",
+    )
+    assert binary.content_encoding is None
 
 
 @pytest.mark.asyncio
@@ -72,3 +101,260 @@ async def test_empty_artifact(db, storage_dir):
     assert artifact.size_bytes == 0
     read_data = await artifact_service.read_artifact_data(artifact)
     assert read_data == b""
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+@pytest.mark.asyncio
+async def test_save_artifact_stream(db, storage_dir):
+    parts = [b"a" * 1000, b"b" * 1000, b"c" * 10]
+    artifact = await artifact_service.save_artifact_stream(
+        db, run_id="run1", filename="big.bin", chunks=_chunks(*parts), content_type="application/octet-stream"
+    )
+    data = b"".join(parts)
+    assert artifact.size_bytes == len(data)
+    assert artifact.checksum_sha256 == hashlib.sha256(data).hexdigest()
+    assert await artifact_service.read_artifact_data(artifact) == data
+
+
+@pytest.mark.asyncio
+async def test_save_artifact_stream_enforces_max_size(db, storage_dir, monkeypatch):
+    monkeypatch.setattr(artifact_service.settings, "artifact_max_bytes", 1500)
+    with pytest.raises(artifact_service.ArtifactTooLargeError):
+        await artifact_service.save_artifact_stream(
+            db, run_id="run1", filename="huge.bin", chunks=_chunks(b"x" * 1000, b"y" * 1000),
+            content_type="application/octet-stream",
+        )
+    assert not (storage_dir / "run1" / "huge.bin").exists()
+    assert await artifact_service.list_artifacts(db, "run1") == []
+
+
+def _stored_files(root):
+    return sorted(str(p.relative_to(root)) for p in root.rglob("*") if p.is_file())
+
+
+@pytest.mark.asyncio
+async def test_identical_uploads_share_one_blob(db, storage_dir):
+    data = b"hourly report\n" * 100
+    first = await artifact_service.save_artifact(
+        db, run_id="run1", filename="report.txt", data=data, content_type="text/plain"
+    )
+    second = await artifact_service.save_artifact(
+        db, run_id="run2", filename="report-copy.txt", data=data, content_type="text/plain"
+    )
+
+    assert first.id != second.id
+    assert first.storage_path == second.storage_path
+    assert _stored_files(storage_dir) == [first.storage_path]  # no staging leftovers
+    blob = await db.get(ArtifactBlob, first.checksum_sha256, populate_existing=True)
+    assert blob.ref_count == 2
+    assert await artifact_service.read_artifact_data(second) == data
+
+
+@pytest.mark.asyncio
+async def test_deleting_runs_garbage_collects_blobs(db, storage_dir):
+    shared = b"same bytes"
+    a = await artifact_service.save_artifact(
+        db, run_id="run1", filename="out.txt", data=shared, content_type="text/plain"
+    )
+    await artifact_service.save_artifact(
+        db, run_id="run1", filename="unique.txt", data=b"only in run1", content_type="text/plain"
+    )
+    await artifact_service.save_artifact(
+        db, run_id="run2", filename="out.txt", data=shared, content_type="text/plain"
+    )
+
+    assert await artifact_service.delete_run_artifacts(db, "run1") == 2
+    # The shared blob is still referenced by run2; run1's unique blob is gone
+    assert _stored_files(storage_dir) == [a.storage_path]
+    blob = await db.get(ArtifactBlob, a.checksum_sha256, populate_existing=True)
+    assert blob.ref_count == 1
+
+    assert await artifact_service.delete_run_artifacts(db, "run2") == 1
+    assert _stored_files(storage_dir) == []
+    assert (await db.execute(select(ArtifactBlob))).scalars().all() == []
+
+
+@pytest.mark.asyncio
+async def test_delete_legacy_artifact_without_blob(db, storage_dir):
+    (storage_dir / "old-run").mkdir()
+    (storage_dir / "old-run" / "log.txt").write_bytes(b"legacy")
+    db.add(Artifact(
+        run_id="old-run", filename="log.txt", content_type="text/plain", size_bytes=6,
+        checksum_sha256=hashlib.sha256(b"legacy").hexdigest(), storage_path="old-run/log.txt",
+    ))
+    await db.commit()
+
+    assert await artifact_service.delete_run_artifacts(db, "old-run") == 1
+    assert not (storage_dir / "old-run" / "log.txt").exists()
+
+
+@pytest.mark.asyncio
+async def test_delete_run_releases_artifacts(db, storage_dir):
+    from orchestrator.schemas.runs import RunCreate
+    from orchestrator.services import run_service
+
+    run = await run_service.create_adhoc_run(db, RunCreate(name="r", task_prompt="p"), "default")
+    await artifact_service.save_artifact(
+        db, run_id=run.id, filename="out.txt", data=b"bytes", content_type="text/plain"
+    )
+
+    with pytest.raises(ValueError):
+        await run_service.delete_run(db, run.id, "default")  # still queued
+
+    run.status = "completed"
+    await db.commit()
+    assert await run_service.delete_run(db, run.id, "default")
+    assert await run_service.get_run(db, run.id) is None
+    assert await artifact_service.list_artifacts(db, run.id) == []
+    assert _stored_files(storage_dir) == []
+    assert not await run_service.delete_run(db, run.id, "default")
+
+
+@pytest.mark.asyncio
+async def test_upload_losing_the_blob_row_leaves_the_blob_alone(db, storage_dir, monkeypatch):
+    data = b"".join(f"line {i}\n".encode() for i in range(500))
+    checksum = hashlib.sha256(data).hexdigest()
+    blob_path = f"blobs/{checksum[:2]}/{checksum}"
+    add_reference = artifact_service._add_blob_reference
+
+    async def racing(db, *args, **kwargs):
+        # Another upload of the same content, stored uncompressed, wins the row first
+        (storage_dir / blob_path).parent.mkdir(parents=True, exist_ok=True)
+        (storage_dir / blob_path).write_bytes(data)
+        db.add(ArtifactBlob(
+            checksum_sha256=checksum, size_bytes=len(data), storage_path=blob_path,
+            content_encoding=None, stored_size_bytes=len(data), ref_count=1,
+        ))
+        await db.flush()
+        return await add_reference(db, *args, **kwargs)
+
+    monkeypatch.setattr(artifact_service, "_add_blob_reference", racing)
+    artifact = await artifact_service.save_artifact(
+        db, run_id="run1", filename="out.log", data=data, content_type="text/plain"
+    )
+
+    assert artifact.content_encoding is None
+    assert (storage_dir / blob_path).read_bytes() == data
+    assert await artifact_service.read_artifact_data(artifact) == data
+    assert not list((storage_dir / "uploads").iterdir())
+
+
+@pytest.mark.asyncio
+async def test_failed_upload_removes_its_staging_object(db, storage_dir, monkeypatch):
+    async def failing(*args, **kwargs):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(artifact_service, "_add_blob_reference", failing)
+    with pytest.raises(RuntimeError):
+        await artifact_service.save_artifact(
+            db, run_id="run1", filename="out.bin", data=b"abc", content_type="application/octet-stream"
+        )
+
+    assert not list((storage_dir / "uploads").iterdir())
+    assert not (storage_dir / "blobs").exists()
+
+
+@pytest_asyncio.fixture
+async def api(db, storage_dir):
+    from orchestrator.auth import AuthContext, require_auth
+    from orchestrator.database import get_db
+    from orchestrator.main import app
+
+    async def _db():
+        yield db
+
+    app.dependency_overrides[get_db] = _db
+    app.dependency_overrides[require_auth] = lambda: AuthContext(user=None, api_key=None, workspace_id="default")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t/api/v1") as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+def _counting_body(chunks: int, size: int, sent: list[int]):
+    """A multipart body (boundary "b") whose file part is chunks * size bytes, counting chunks sent."""
+    async def body():
+        yield b'--b\r\nContent-Disposition: form-data; name="file"; filename="big.bin"\r\n\r\n'
+        for _ in range(chunks):
+            sent[0] += 1
+            yield b"x" * size
+        yield b"\r\n--b--\r\n"
+
+    return body()
+
+
+@pytest.mark.asyncio
+async def test_upload_endpoint_stores_file(api, db):
+    resp = await api.post("/workers/runs/run1/artifacts", files={"file": ("out.txt", b"hello", "text/plain")})
+
+    assert resp.status_code == 201
+    [artifact] = await artifact_service.list_artifacts(db, "run1")
+    assert await artifact_service.read_artifact_data(artifact) == b"hello"
+
+
+@pytest.mark.asyncio
+async def test_upload_rejected_on_content_length_before_reading(api, monkeypatch):
+    monkeypatch.setattr(artifact_service.settings, "artifact_max_bytes", 1000)
+    sent = [0]
+    resp = await api.post(
+        "/workers/runs/run1/artifacts",
+        content=_counting_body(100, 64 * 1024, sent),
+        headers={"Content-Type": "multipart/form-data; boundary=b", "Content-Length": str(100 * 64 * 1024)},
+    )
+
+    assert resp.status_code == 413
+    assert sent[0] <= 1
+
+
+@pytest.mark.asyncio
+async def test_chunked_upload_cut_off_at_the_limit(api, monkeypatch, storage_dir):
+    monkeypatch.setattr(artifact_service.settings, "artifact_max_bytes", 1000)
+    sent = [0]
+    resp = await api.post(
+        "/workers/runs/run1/artifacts",
+        content=_counting_body(100, 64 * 1024, sent),
+        headers={"Content-Type": "multipart/form-data; boundary=b"},
+    )
+
+    assert resp.status_code == 413
+    assert sent[0] < 5
+    assert not (storage_dir / "blobs").exists()
+
+
+@pytest.mark.asyncio
+async def test_compressed_download_has_weak_etag(api, db):
+    data = b"".join(f"step {i}: ok\n".encode() for i in range(2000))
+    artifact = await artifact_service.save_artifact(
+        db, run_id="run1", filename="steps.log", data=data, content_type="text/plain"
+    )
+    url = f"/runs/run1/artifacts/{artifact.id}"
+
+    encoded = await api.get(url, headers={"Accept-Encoding": "gzip"})
+    assert encoded.headers["content-encoding"] == "gzip"
+    assert encoded.headers["etag"] == f'W/"{artifact.checksum_sha256}-gzip"'
+    assert encoded.content == data
+    cached = await api.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": encoded.headers["etag"]})
+    assert cached.status_code == 304
+
+    decoded = await api.get(url, headers={"Accept-Encoding": "identity"})
+    assert decoded.headers["etag"] == f'"{artifact.checksum_sha256}"'
+    assert decoded.content == data
+
+
+@pytest.mark.asyncio
+async def test_suffix_range_on_empty_artifact_is_not_satisfiable(api, db):
+    # Stored compressed, so the decoded download goes through parse_range
+    artifact = await artifact_service.save_artifact(
+        db, run_id="run1", filename="empty.log", data=b"", content_type="text/plain"
+    )
+
+    resp = await api.get(
+        f"/runs/run1/artifacts/{artifact.id}", headers={"Range": "bytes=-10", "Accept-Encoding": "identity"}
+    )
+
+    assert resp.status_code == 416
+    assert resp.headers["content-range"] == "bytes */0"
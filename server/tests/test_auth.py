@@ -0,0 +1,113 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from orchestrator import auth
+from orchestrator.models.api_key import ApiKey
+from orchestrator.models.user import User
+from orchestrator.models.workspace_member import WorkspaceMember
+
+
+@pytest.fixture
+def resolves(monkeypatch):
+    """Count the lookups that reach the database."""
+    calls = []
+    resolve = auth._resolve
+
+    async def counting(token, workspace_id, db):
+        calls.append((token, workspace_id))
+        return await resolve(token, workspace_id, db)
+
+    monkeypatch.setattr(auth, "_resolve", counting)
+    return calls
+
+
+async def _add_key(db, raw_key: str, user_id: str = "admin", role: str = "worker") -> ApiKey:
+    api_key = ApiKey(name="test", key_hash=auth.hash_key(raw_key), role=role, user_id=user_id)
+    db.add(api_key)
+    await db.commit()
+    return api_key
+
+
+@pytest.mark.asyncio
+async def test_repeat_requests_are_served_from_cache(db, resolves):
+    await _add_key(db, "secret")
+
+    first = await auth._authenticate("secret", "default", db)
+    second = await auth._authenticate("secret", "default", db)
+    assert resolves == [("secret", "default")]
+    assert (second.user.id, second.api_key.role, second.workspace_id) == ("admin", "worker", "default")
+    assert first.api_key.id == second.api_key.id
+    assert second.user.created_at == first.user.created_at is not None
+
+    # Each workspace is checked separately
+    with pytest.raises(HTTPException) as exc:
+        await auth._authenticate("secret", "other", db)
+    assert exc.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_failures_are_not_cached(db, resolves):
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            await auth._authenticate("nope", "default", db)
+    assert len(resolves) == 2
+
+    await _add_key(db, "nope")
+    assert (await auth._authenticate("nope", "default", db)).user.id == "admin"
+
+
+@pytest.mark.asyncio
+async def test_entries_expire(db, resolves, monkeypatch):
+    await _add_key(db, "secret")
+    await auth._authenticate("secret", "default", db)
+
+    monkeypatch.setattr(auth.time, "monotonic", lambda: 10**9)
+    await auth._authenticate("secret", "default", db)
+    assert len(resolves) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("change", ["delete_key", "change_role", "remove_member", "delete_user"])
+async def test_changes_invalidate_cache(db, change):
+    api_key = await _add_key(db, "secret")
+    assert (await auth._authenticate("secret", "default", db)).api_key.role == "worker"
+
+    if change == "delete_key":
+        await db.delete(api_key)
+    elif change == "change_role":
+        api_key.role = "admin"
+    elif change == "remove_member":
+        member = (await db.execute(select(WorkspaceMember))).scalar_one()
+        await db.delete(member)
+    else:
+        await db.delete((await db.execute(select(User))).scalar_one())
+    await db.commit()
+
+    if change == "change_role":
+        assert (await auth._authenticate("secret", "default", db)).api_key.role == "admin"
+    else:
+        with pytest.raises(HTTPException):
+            await auth._authenticate("secret", "default", db)
+
+
+@pytest.mark.asyncio
+async def test_cache_can_be_disabled(db, resolves, monkeypatch):
+    monkeypatch.setattr(auth.settings, "auth_cache_ttl", 0)
+    await _add_key(db, "secret")
+    await auth._authenticate("secret", "default", db)
+    await auth._authenticate("secret", "default", db)
+    assert len(resolves) == 2
+    assert not auth._cache
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entries_are_evicted(db, monkeypatch):
+    monkeypatch.setattr(auth.settings, "auth_cache_size", 2)
+    for raw in ("a", "b", "c"):
+        await _add_key(db, raw)
+    await auth._authenticate("a", "default", db)
+    await auth._authenticate("b", "default", db)
+    await auth._authenticate("a", "default", db)
+    await auth._authenticate("c", "default", db)
+    assert [key_hash for key_hash, _ in auth._cache] == [auth.hash_key("a"), auth.hash_key("c")]
@@ -0,0 +1,135 @@
+import asyncio
+import json
+
+import pytest
+
+from orchestrator import broadcast
+from orchestrator.schemas.workers import LogLine
+
+
+def _lines(start: int, end: int) -> list[LogLine]:
+    return [LogLine(line=f"line {i}", sequence=i) for i in range(start, end + 1)]
+
+
+class _Recorder:
+    def __init__(self):
+        self.received: list[tuple[str, list[int]]] = []
+
+    def __call__(self, run_id: str, lines: list[LogLine]) -> None:
+        self.received.append((run_id, [line.sequence for line in lines]))
+
+
+class _RecordingBroadcaster(broadcast._BatchingBroadcaster):
+    def __init__(self, deliver, batch_interval):
+        super().__init__(deliver, batch_interval)
+        self.sent: list[dict[str, list[int]]] = []
+
+    async def start(self) -> None:
+        pass
+
+    async def _send(self, batch):
+        self.sent.append({run_id: [line.sequence for line in lines] for run_id, lines in batch.items()})
+
+    async def close(self) -> None:
+        await self._drain()
+
+
+@pytest.mark.asyncio
+async def test_memory_broadcaster_delivers_immediately():
+    received = _Recorder()
+    broadcaster = broadcast.MemoryBroadcaster(received)
+    broadcaster.publish("run1", _lines(1, 2))
+    assert received.received == [("run1", [1, 2])]
+
+
+@pytest.mark.asyncio
+async def test_publishes_are_coalesced_per_flush():
+    broadcaster = _RecordingBroadcaster(_Recorder(), batch_interval=0.02)
+    broadcaster.publish("run1", _lines(1, 2))
+    broadcaster.publish("run2", _lines(1, 1))
+    broadcaster.publish("run1", _lines(3, 3))
+    await broadcaster.close()
+
+    assert broadcaster.sent == [{"run1": [1, 2, 3], "run2": [1]}]
+
+
+@pytest.mark.asyncio
+async def test_lines_published_during_a_send_go_out_next():
+    broadcaster = _RecordingBroadcaster(_Recorder(), batch_interval=0.01)
+    broadcaster.publish("run1", _lines(1, 1))
+    await asyncio.sleep(0.015)
+    broadcaster.publish("run1", _lines(2, 2))
+    await broadcaster.close()
+
+    assert broadcaster.sent == [{"run1": [1]}, {"run1": [2]}]
+
+
+@pytest.mark.asyncio
+async def test_redis_broadcast_reaches_every_process():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    first, second = _Recorder(), _Recorder()
+    publisher = broadcast.RedisBroadcaster(
+        first, batch_interval=0.01, client=fakeredis.FakeAsyncRedis(server=server)
+    )
+    listener = broadcast.RedisBroadcaster(
+        second, batch_interval=0.01, client=fakeredis.FakeAsyncRedis(server=server)
+    )
+    await publisher.start()
+    await listener.start()
+    try:
+        publisher.publish("run1", _lines(1, 3))
+        for _ in range(100):
+            if first.received and second.received:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await publisher.close()
+        await listener.close()
+
+    assert first.received == [("run1", [1, 2, 3])]
+    assert second.received == [("run1", [1, 2, 3])]
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.notifications: list[dict] = []
+
+    async def execute(self, query, channel, payload):
+        assert len(payload) < 8000
+        self.notifications.append(json.loads(payload))
+
+
+@pytest.mark.asyncio
+async def test_postgres_notifications_carry_ranges_and_load_on_receipt(monkeypatch):
+    pytest.importorskip("asyncpg")
+    loads = []
+
+    async def load(run_id, first, last):
+        loads.append((run_id, first, last))
+        return _lines(first, last)
+
+    received = _Recorder()
+    broadcaster = broadcast.PostgresBroadcaster(
+        received,
+        dsn="postgresql://unused",
+        has_subscribers=lambda run_id: run_id == "watched",
+        load=load,
+    )
+    conn = _FakeConnection()
+    broadcaster._conn = conn
+
+    many_runs = {f"run-{i:04d}-{'x' * 40}": _lines(i, i + 5) for i in range(400)}
+    await broadcaster._send({"watched": _lines(7, 9), **many_runs})
+    assert len(conn.notifications) > 1
+    merged = {k: v for n in conn.notifications for k, v in n.items()}
+    assert merged["watched"] == [7, 9]
+    assert len(merged) == 401
+
+    for notification in conn.notifications:
+        broadcaster._on_notify(None, 0, "orch_logs", json.dumps(notification))
+    await asyncio.gather(*broadcaster._tasks)
+
+    # Only runs with local subscribers are loaded from job_logs
+    assert loads == [("watched", 7, 9)]
+    assert received.received == [("watched", [7, 8, 9])]
@@ -0,0 +1,102 @@
+import asyncio
+import gzip
+import os
+import zlib
+
+import pytest
+
+from orchestrator import compression
+
+
+async def _aiter(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+def _log(n: int) -> bytes:
+    return "".join(f"line {i}\n" for i in range(1, n + 1)).encode()
+
+
+@pytest.mark.asyncio
+async def test_gzip_stream_roundtrips_through_any_gzip_reader():
+    data = _log(5000)
+    chunks = [data[i:i + 1000] for i in range(0, len(data), 1000)]
+    encoded = await _collect(compression.gzip_stream(_aiter(chunks), member_size=4096))
+
+    assert gzip.decompress(encoded) == data
+    small_chunks = [encoded[i:i + 7] for i in range(0, len(encoded), 7)]
+    assert await _collect(compression.gunzip_stream(_aiter(small_chunks))) == data
+
+
+@pytest.mark.asyncio
+async def test_members_start_on_line_boundaries():
+    data = _log(5000)
+    encoded = await _collect(compression.gzip_stream(_aiter([data]), member_size=4096))
+
+    members: dict[int, bytes] = {}
+    async for offset, out in compression.gunzip_members(_aiter([encoded])):
+        members[offset] = members.get(offset, b"") + out
+    assert len(members) > 1
+    for offset, decoded in members.items():
+        assert decoded.endswith(b"\n")
+        # Each member decodes on its own from its offset
+        assert gzip.decompress(encoded[offset:]).startswith(decoded)
+
+
+@pytest.mark.asyncio
+async def test_empty_stream():
+    assert await _collect(compression.gzip_stream(_aiter([]))) == b""
+    assert await _collect(compression.gunzip_stream(_aiter([]))) == b""
+
+
+@pytest.mark.asyncio
+async def test_truncated_stream_raises():
+    encoded = gzip.compress(_log(100))
+    with pytest.raises(zlib.error):
+        await _collect(compression.gunzip_stream(_aiter([encoded[:-10]])))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("start, end", [(0, None), (0, 0), (3, 12), (9, 25), (25, None)])
+async def test_slice_stream(start, end):
+    data = bytes(range(30))
+    chunks = [data[i:i + 4] for i in range(0, 30, 4)]
+    expected = data[start:] if end is None else data[start:end + 1]
+    assert await _collect(compression.slice_stream(_aiter(chunks), start, end)) == expected
+
+
+@pytest.mark.parametrize(
+    "content_type, filename, expected",
+    [
+        ("text/plain; charset=utf-8", "out", True),
+        ("application/json", "result", True),
+        ("application/vnd.api+json", "result", True),
+        ("application/octet-stream", "run-output.log", True),
+        ("application/octet-stream", "model.bin", False),
+        ("image/png", "plot.png", False),
+    ],
+)
+def test_is_compressible(content_type, filename, expected):
+    assert compression.is_compressible(content_type, filename) == expected
+
+
+@pytest.mark.asyncio
+async def test_large_chunks_decode_off_the_event_loop(monkeypatch):
+    data = os.urandom(256 * 1024)  # incompressible, so the encoded chunks stay large
+    encoded = gzip.compress(data)
+    offloaded = []
+    to_thread = asyncio.to_thread
+
+    async def recording_to_thread(func, *args):
+        offloaded.append(len(args[0]))
+        return await to_thread(func, *args)
+
+    monkeypatch.setattr(compression.asyncio, "to_thread", recording_to_thread)
+
+    assert await _collect(compression.gunzip_stream(_aiter([encoded[:100], encoded[100:]]))) == data
+    # The small head decodes inline; the large remainder goes to a thread
+    assert offloaded == [len(encoded) - 100]
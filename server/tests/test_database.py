@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert, select, text
+
+from orchestrator.database import create_engine, create_sessionmaker
+from orchestrator.models.base import Base
+from orchestrator.models.workspace import Workspace
+
+
+@pytest_asyncio.fixture
+async def sqlite_file(tmp_path):
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_pragmas(sqlite_file):
+    async with sqlite_file.connect() as conn:
+        assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+        assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+        assert (await conn.execute(text("PRAGMA busy_timeout"))).scalar() == 30000
+
+
+@pytest.mark.asyncio
+async def test_sqlite_writers_queue_instead_of_failing(sqlite_file):
+    session = create_sessionmaker(sqlite_file)
+
+    async def write(i: int) -> None:
+        async with session() as db:
+            await db.execute(select(Workspace))
+            db.add(Workspace(id=f"ws{i}", name=f"ws{i}", slug=f"ws{i}"))
+            await db.flush()
+            # Hold the write transaction across a suspension point
+            await asyncio.sleep(0.001)
+            await db.execute(insert(Workspace).values(id=f"ws{i}-core", name=f"ws{i}-core", slug=f"ws{i}-core"))
+            await db.commit()
+
+    await asyncio.gather(*(write(i) for i in range(30)))
+
+    async with session() as db:
+        assert len((await db.execute(select(Workspace))).scalars().all()) == 60
+
+
+@pytest.mark.asyncio
+async def test_sqlite_write_lock_is_held_until_commit(sqlite_file):
+    session = create_sessionmaker(sqlite_file)
+    async with session() as first, session() as second, session() as reader:
+        first.add(Workspace(id="a", name="a", slug="a"))
+        await first.flush()
+
+        second.add(Workspace(id="b", name="b", slug="b"))
+        pending = asyncio.create_task(second.commit())
+        await asyncio.sleep(0.05)
+        assert not pending.done()
+        # Reads don't wait for the writer
+        assert (await reader.execute(select(Workspace.id))).all() == []
+
+        await first.commit()
+        await pending
+
+    async with session() as db:
+        assert set((await db.execute(select(Workspace.id))).scalars()) == {"a", "b"}
+
+
+@pytest.mark.asyncio
+async def test_rollback_releases_write_lock(sqlite_file):
+    session = create_sessionmaker(sqlite_file)
+    async with session() as first:
+        first.add(Workspace(id="a", name="a", slug="a"))
+        await first.flush()
+        await first.rollback()
+
+        async with session() as second:
+            second.add(Workspace(id="b", name="b", slug="b"))
+            await asyncio.wait_for(second.commit(), timeout=1)
+
+
+def test_postgres_engine_options(monkeypatch):
+    pytest.importorskip("asyncpg")
+    monkeypatch.setattr("orchestrator.database.settings.db_pool_size", 7)
+    monkeypatch.setattr("orchestrator.database.settings.db_statement_cache_size", 0)
+    engine = create_engine("postgresql+asyncpg://user:pw@db/orch")
+
+    assert engine.pool.size() == 7
+    assert engine.pool._max_overflow == 20
+    assert engine.pool._recycle == 1800
+    assert engine.pool._pre_ping
+    _, connect_kwargs = engine.dialect.create_connect_args(engine.url)
+    assert connect_kwargs["prepared_statement_cache_size"] == 0
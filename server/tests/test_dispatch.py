@@ -0,0 +1,357 @@
+import asyncio
+
+import pytest
+from sqlalchemy import update
+
+from orchestrator.config import settings
+from orchestrator.database import create_engine, create_sessionmaker
+from orchestrator.encryption import encrypt_value
+from orchestrator.models.base import Base
+from orchestrator.models.credential import Credential
+from orchestrator.models.job_definition import JobDefinition
+from orchestrator.models.job_run import JobRun
+from orchestrator.models.worker import Worker
+from orchestrator.models.workspace import Workspace
+from orchestrator.schemas.jobs import JobDefinitionCreate
+from orchestrator.schemas.runs import RunCreate
+from orchestrator.services import dispatch_service, job_service, run_service
+from orchestrator.services.worker_service import (
+    claim_runs,
+    complete_run,
+    poll_for_job,
+    wait_for_job,
+    wait_for_runs,
+)
+
+
+async def _create_worker(db, name="worker-1", workspace_id="default", max_concurrency=1):
+    worker = Worker(workspace_id=workspace_id, name=name, labels={}, max_concurrency=max_concurrency)
+    db.add(worker)
+    await db.commit()
+    await db.refresh(worker)
+    return worker
+
+
+class TestLongPoll:
+    @pytest.mark.asyncio
+    async def test_returns_queued_run_immediately(self, db):
+        worker = await _create_worker(db)
+        run = await run_service.create_adhoc_run(db, RunCreate(task_prompt="hi"), "default")
+
+        result = await wait_for_job(db, worker.id, timeout=5)
+
+        assert result is not None
+        assert result.run_id == run.id
+
+    @pytest.mark.asyncio
+    async def test_times_out_when_queue_empty(self, db):
+        worker = await _create_worker(db)
+
+        result = await wait_for_job(db, worker.id, timeout=0.05)
+
+        assert result is None
+        assert not dispatch_service._waiters
+
+    @pytest.mark.asyncio
+    async def test_woken_by_new_run(self, db):
+        worker = await _create_worker(db)
+        waiter = asyncio.create_task(wait_for_job(db, worker.id, timeout=10))
+        await asyncio.sleep(0.05)  # let the poller park on the dispatch event
+        assert not waiter.done()
+
+        run = await run_service.create_adhoc_run(db, RunCreate(task_prompt="hi"), "default")
+
+        result = await asyncio.wait_for(waiter, timeout=1)
+        assert result is not None
+        assert result.run_id == run.id
+
+    @pytest.mark.asyncio
+    async def test_not_woken_by_other_workspace(self, db):
+        worker = await _create_worker(db)
+        waiter = asyncio.create_task(wait_for_job(db, worker.id, timeout=0.3))
+        await asyncio.sleep(0.05)
+
+        await run_service.create_adhoc_run(db, RunCreate(task_prompt="hi"), "other-ws")
+
+        assert await waiter is None
+
+    @pytest.mark.asyncio
+    async def test_finds_run_queued_by_another_process(self, db, monkeypatch):
+        monkeypatch.setattr(settings, "poll_recheck_interval", 0.05)
+        worker = await _create_worker(db)
+        waiter = asyncio.create_task(wait_for_job(db, worker.id, timeout=10))
+        await asyncio.sleep(0.05)
+
+        # Queued without a wakeup, as a run created on another replica would be
+        run = JobRun(workspace_id="default", name="remote", task_prompt="hi")
+        db.add(run)
+        await db.commit()
+
+        result = await asyncio.wait_for(waiter, timeout=1)
+        assert result is not None
+        assert result.run_id == run.id
+
+    @pytest.mark.asyncio
+    async def test_disconnected_worker_does_not_claim(self, db):
+        worker = await _create_worker(db)
+
+        async def gone() -> bool:
+            return True
+
+        waiter = asyncio.create_task(wait_for_job(db, worker.id, timeout=10, is_disconnected=gone))
+        await asyncio.sleep(0.05)
+        await run_service.create_adhoc_run(db, RunCreate(task_prompt="hi"), "default")
+
+        assert await asyncio.wait_for(waiter, timeout=1) is None
+        runs = await run_service.list_runs(db, "default", status="queued")
+        assert len(runs) == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_worker_returns_none(self, db):
+        assert await wait_for_job(db, "nonexistent", timeout=5) is None
+
+
+class TestWorkerSlots:
+    @pytest.mark.asyncio
+    async def test_single_slot_worker_gets_one_run(self, db):
+        worker = await _create_worker(db)
+        for _ in range(2):
+            await run_service.create_adhoc_run(db, RunCreate(task_prompt="hi"), "default")
+
+        assert await poll_for_job(db, worker.id) is not None
+        assert await poll_for_job(db, worker.id) is None
+
+    @pytest.mark.asyncio
+    async def test_multi_slot_worker_fills_free_slots(self, db):
+        worker = await _create_worker(db, max_concurrency=2)
+        for _ in range(3):
+            await run_service.create_adhoc_run(db, RunCreate(task_prompt="hi"), "default")
+
+        first = await poll_for_job(db, worker.id)
+        await db.refresh(worker)
+        assert worker.status == "online"  # one slot still free
+
+        second = await poll_for_job(db, worker.id)
+        await db.refresh(worker)
+        assert worker.status == "busy"
+
+        assert first is not None and second is not None
+        assert await poll_for_job(db, worker.id) is None
+
+    @pytest.mark.asyncio
+    async def test_completing_a_run_frees_its_slot(self, db):
+        worker = await _create_worker(db, max_concurrency=2)
+        for _ in range(3):
+            await run_service.create_adhoc_run(db, RunCreate(task_prompt="hi"), "default")
+        first = await poll_for_job(db, worker.id)
+        second = await poll_for_job(db, worker.id)
+        assert first is not None and second is not None
+
+        await complete_run(db, worker.id, first.run_id, "completed", exit_code=0)
+        await db.refresh(worker)
+        assert worker.status == "online"
+        assert worker.current_run_id == second.run_id
+
+        assert await poll_for_job(db, worker.id) is not None
+
+
+class TestBatchClaim:
+    @pytest.mark.asyncio
+    async def test_claims_oldest_runs_up_to_limit(self, db):
+        worker = await _create_worker(db, max_concurrency=10)
+        runs = [
+            await run_service.create_adhoc_run(db, RunCreate(name=f"run-{i}", task_prompt="hi"), "default")
+            for i in range(5)
+        ]
+
+        claimed = await claim_runs(db, worker.id, max_runs=3)
+
+        assert [c.run_id for c in claimed] == [r.id for r in runs[:3]]
+        queued = await run_service.list_runs(db, "default", status="queued")
+        assert {r.id for r in queued} == {r.id for r in runs[3:]}
+
+    @pytest.mark.asyncio
+    async def test_claim_capped_by_free_slots(self, db):
+        worker = await _create_worker(db, max_concurrency=2)
+        for _ in range(5):
+            await run_service.create_adhoc_run(db, RunCreate(task_prompt="hi"), "default")
+
+        assert len(await claim_runs(db, worker.id, max_runs=10)) == 2
+        assert await claim_runs(db, worker.id, max_runs=10) == []
+        await db.refresh(worker)
+        assert worker.status == "busy"
+
+    @pytest.mark.asyncio
+    async def test_workers_claim_disjoint_runs(self, db):
+        worker1 = await _create_worker(db, "worker-1", max_concurrency=3)
+        worker2 = await _create_worker(db, "worker-2", max_concurrency=3)
+        for _ in range(4):
+            await run_service.create_adhoc_run(db, RunCreate(task_prompt="hi"), "default")
+
+        first = await claim_runs(db, worker1.id, max_runs=3)
+        second = await claim_runs(db, worker2.id, max_runs=3)
+
+        assert len(first) == 3
+        assert len(second) == 1
+        assert not {c.run_id for c in first} & {c.run_id for c in second}
+
+    @pytest.mark.asyncio
+    async def test_batch_resolves_credentials_per_run(self, db, monkeypatch):
+        from cryptography.fernet import Fernet
+
+        monkeypatch.setattr("orchestrator.encryption.settings.master_key", Fernet.generate_key().decode())
+        db.add(Credential(workspace_id="default", name="anthropic", env_var="ANTHROPIC_API_KEY",
+                          encrypted_value=encrypt_value("sk-a")))
+        db.add(Credential(workspace_id="default", name="openai", env_var="OPENAI_API_KEY",
+                          encrypted_value=encrypt_value("sk-o")))
+        await db.commit()
+        worker = await _create_worker(db, max_concurrency=2)
+        await run_service.create_adhoc_run(
+            db, RunCreate(task_prompt="a", credential_ids=["anthropic"]), "default"
+        )
+        await run_service.create_adhoc_run(
+            db, RunCreate(task_prompt="o", credential_ids=["openai"]), "default"
+        )
+
+        claimed = await claim_runs(db, worker.id, max_runs=2)
+
+        assert [c.credentials for c in claimed] == [
+            {"ANTHROPIC_API_KEY": "sk-a"},
+            {"OPENAI_API_KEY": "sk-o"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_wait_for_runs_returns_batch_on_wakeup(self, db):
+        worker = await _create_worker(db, max_concurrency=5)
+        waiter = asyncio.create_task(wait_for_runs(db, worker.id, 5, timeout=10))
+        await asyncio.sleep(0.05)
+
+        await run_service.create_adhoc_run(db, RunCreate(task_prompt="hi"), "default")
+
+        claimed = await asyncio.wait_for(waiter, timeout=1)
+        assert len(claimed) == 1
+
+
+async def _create_job(db, name, **kwargs):
+    return await job_service.create_job(db, JobDefinitionCreate(name=name, task_prompt="go", **kwargs), "default")
+
+
+async def _claim_job_names(db, worker_id, count):
+    claimed = await claim_runs(db, worker_id, max_runs=count)
+    return [c.name for c in claimed]
+
+
+class TestPriorityAndFairShare:
+    @pytest.mark.asyncio
+    async def test_higher_priority_dispatches_first(self, db):
+        worker = await _create_worker(db, max_concurrency=10)
+        await run_service.create_adhoc_run(db, RunCreate(name="low", task_prompt="hi"), "default")
+        await run_service.create_adhoc_run(db, RunCreate(name="high", task_prompt="hi", priority=5), "default")
+
+        assert await _claim_job_names(db, worker.id, 2) == ["high", "low"]
+
+    @pytest.mark.asyncio
+    async def test_fan_out_does_not_starve_other_jobs(self, db):
+        worker = await _create_worker(db, max_concurrency=10)
+        burst = await _create_job(db, "burst")
+        other = await _create_job(db, "other")
+        for _ in range(20):
+            await job_service.trigger_run(db, burst.id)
+        await job_service.trigger_run(db, other.id)
+
+        # The later job's single run is interleaved near the front, not behind all 20
+        assert "other" in await _claim_job_names(db, worker.id, 3)
+
+    @pytest.mark.asyncio
+    async def test_new_job_joins_head_of_a_long_waiting_backlog(self, db):
+        worker = await _create_worker(db, max_concurrency=10)
+        burst = await _create_job(db, "burst")
+        other = await _create_job(db, "other")
+        for _ in range(20):
+            await job_service.trigger_run(db, burst.id)
+        # The backlog has been waiting an hour: its keys are all behind the wall clock
+        await db.execute(
+            update(JobRun).where(JobRun.job_definition_id == burst.id)
+            .values(dispatch_key=JobRun.dispatch_key - 3600)
+        )
+        await db.commit()
+
+        await job_service.trigger_run(db, other.id)
+
+        assert "other" in await _claim_job_names(db, worker.id, 2)
+
+    @pytest.mark.asyncio
+    async def test_weight_scales_share(self, db):
+        worker = await _create_worker(db, max_concurrency=10)
+        heavy = await _create_job(db, "heavy", fair_share_weight=2)
+        light = await _create_job(db, "light")
+        for _ in range(10):
+            await job_service.trigger_run(db, heavy.id)
+            await job_service.trigger_run(db, light.id)
+
+        names = await _claim_job_names(db, worker.id, 6)
+        assert names.count("heavy") > names.count("light")
+
+    @pytest.mark.asyncio
+    async def test_per_job_concurrency_cap(self, db):
+        worker = await _create_worker(db, max_concurrency=10)
+        capped = await _create_job(db, "capped", max_concurrent_runs=2)
+        for _ in range(5):
+            await job_service.trigger_run(db, capped.id)
+        await run_service.create_adhoc_run(db, RunCreate(name="adhoc", task_prompt="hi"), "default")
+
+        names = await _claim_job_names(db, worker.id, 10)
+        assert sorted(names) == ["adhoc", "capped", "capped"]
+
+        # Still capped on the next poll, until one of its runs finishes
+        assert await claim_runs(db, worker.id, max_runs=10) == []
+        runs = await run_service.list_runs(db, "default", job_id=capped.id, status="assigned")
+        await complete_run(db, worker.id, runs[0].id, "completed", exit_code=0)
+        assert await _claim_job_names(db, worker.id, 10) == ["capped"]
+
+    @pytest.mark.asyncio
+    async def test_capped_runs_are_refilled_from_further_down_the_queue(self, db):
+        worker = await _create_worker(db, max_concurrency=3)
+        capped = await _create_job(db, "capped", max_concurrent_runs=1, priority=5)
+        for _ in range(5):
+            await job_service.trigger_run(db, capped.id)
+        for _ in range(2):
+            await run_service.create_adhoc_run(db, RunCreate(name="adhoc", task_prompt="hi"), "default")
+
+        # The head of the queue is all "capped"; the rest of the batch comes from behind it
+        assert await _claim_job_names(db, worker.id, 3) == ["capped", "adhoc", "adhoc"]
+
+    @pytest.mark.asyncio
+    async def test_cap_holds_across_concurrent_claimers(self, tmp_path):
+        engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'claims.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session = create_sessionmaker(engine)
+        try:
+            async with session() as db:
+                db.add(Workspace(id="default", name="Default", slug="default"))
+                await db.commit()
+                capped = await _create_job(db, "capped", max_concurrent_runs=1)
+                # One run per label pool, so the two workers pick different candidates
+                for pool in ("a", "b"):
+                    await db.execute(
+                        update(JobDefinition).where(JobDefinition.id == capped.id).values(labels={"pool": pool})
+                    )
+                    await db.commit()
+                    await job_service.trigger_run(db, capped.id)
+                workers = [
+                    Worker(workspace_id="default", name=f"w-{pool}", labels={"pool": pool}, max_concurrency=1)
+                    for pool in ("a", "b")
+                ]
+                db.add_all(workers)
+                await db.commit()
+                worker_ids = [w.id for w in workers]
+
+            async def claim(worker_id):
+                async with session() as db:
+                    return await claim_runs(db, worker_id, max_runs=1)
+
+            claimed = await asyncio.gather(*(claim(worker_id) for worker_id in worker_ids))
+            assert sum(len(c) for c in claimed) == 1
+        finally:
+            await engine.dispose()
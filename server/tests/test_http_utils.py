@@ -0,0 +1,64 @@
+import pytest
+
+from orchestrator.http_utils import (
+    RangeNotSatisfiableError,
+    accepts_encoding,
+    etag_matches,
+    parse_range,
+)
+
+
+def test_etag_matches():
+    etag = '"abc"'
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('"zzz", W/"abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"zzz"', etag)
+    assert not etag_matches(None, etag)
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('W/"abc"', 'W/"abc"')
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip, deflate, br", True),
+        ("GZIP;q=0.5", True),
+        ("gzip;q=0", False),
+        ("*", True),
+        ("*;q=0, gzip", True),
+        ("gzip;q=0, *", False),
+        ("identity", False),
+        (None, False),
+    ],
+)
+def test_accepts_encoding(header, expected):
+    assert accepts_encoding(header, "gzip") == expected
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("bytes=0-9", (0, 9)),
+        ("bytes=90-", (90, 99)),
+        ("bytes=-10", (90, 99)),
+        ("bytes=-500", (0, 99)),
+        ("bytes=50-500", (50, 99)),
+        ("bytes=0-1,5-6", None),  # multi-range: serve the whole object
+        ("items=0-9", None),
+        ("bytes=abc", None),
+        ("bytes=9-0", None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert parse_range(header, 100) == expected
+
+
+def test_parse_range_not_satisfiable():
+    with pytest.raises(RangeNotSatisfiableError):
+        parse_range("bytes=100-", 100)
+    with pytest.raises(RangeNotSatisfiableError):
+        parse_range("bytes=-0", 100)
+    with pytest.raises(RangeNotSatisfiableError):
+        parse_range("bytes=-10", 0)
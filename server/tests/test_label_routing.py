@@ -1,6 +1,8 @@
 import pytest
+from sqlalchemy import select
 
 from orchestrator.models.job_run import JobRun
+from orchestrator.models.job_run_label import JobRunLabel
 from orchestrator.models.worker import Worker
 from orchestrator.services.worker_service import labels_match, poll_for_job
 
@@ -168,3 +170,35 @@ class TestPollForJobRouting:
         result = await poll_for_job(db, worker.id)
         assert result is not None
         assert result.run_id == run.id
+
+    @pytest.mark.asyncio
+    async def test_multi_label_run_requires_all_labels(self, db):
+        """A worker that satisfies only some of a run's labels must not get it."""
+        worker = await _create_worker(db, "gpu-worker", labels={"gpu": "true", "region": "us-west"})
+        await _create_run(db, name="east-gpu", required_labels={"gpu": "true", "region": "us-east"})
+        west_run = await _create_run(db, name="west-gpu", required_labels={"gpu": "true", "region": "us-west"})
+
+        result = await poll_for_job(db, worker.id)
+        assert result is not None
+        assert result.run_id == west_run.id
+
+    @pytest.mark.asyncio
+    async def test_required_labels_are_indexed_on_insert(self, db):
+        run = await _create_run(db, required_labels={"gpu": "true", "region": "us-east"})
+
+        result = await db.execute(select(JobRunLabel).where(JobRunLabel.run_id == run.id))
+        rows = {(r.key, r.value) for r in result.scalars().all()}
+        assert rows == {("gpu", '"true"'), ("region", '"us-east"')}
+
+    @pytest.mark.asyncio
+    async def test_non_string_labels_match_by_type(self, db):
+        """Label values keep their JSON type: true is not "True", 1 is not "1"."""
+        await _create_run(db, name="typed", required_labels={"gpu": True, "slots": 1})
+        stringly = await _create_worker(db, "stringly", labels={"gpu": "True", "slots": "1"})
+        typed = await _create_worker(db, "typed", labels={"gpu": True, "slots": 1})
+
+        assert labels_match({"gpu": True, "slots": 1}, stringly.labels) is False
+        assert await poll_for_job(db, stringly.id) is None
+        result = await poll_for_job(db, typed.id)
+        assert result is not None
+        assert result.name == "typed"
@@ -0,0 +1,123 @@
+import pytest
+import pytest_asyncio
+
+from orchestrator import compression
+from orchestrator.services import artifact_service, log_index, log_service
+from orchestrator.storage import LocalStorageBackend
+
+
+@pytest_asyncio.fixture
+async def storage_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("orchestrator.storage.settings.artifact_storage_path", str(tmp_path))
+    monkeypatch.setattr(log_index.settings, "log_index_stride", 4)
+    log_index._cache.clear()
+    yield tmp_path
+    log_index._cache.clear()
+
+
+def _log(n: int) -> bytes:
+    return "".join(f"[stdout] line {i}\n" for i in range(1, n + 1)).encode()
+
+
+async def _lines(storage, path, after, encoding=None):
+    return [
+        (seq, raw)
+        async for seq, raw in log_index.iter_lines_after(storage, path, after, encoding)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_build_index_records_checkpoints(storage_dir):
+    storage = LocalStorageBackend(str(storage_dir))
+    await storage.save("log", b"a\nbb\nccc\nd\ne\nf\ng\nh\ni")
+
+    index = await log_index.build_index(storage, "log", 4)
+    assert index.offsets == [0, 11, 19]
+    assert index.lines == [0, 4, 8]
+    assert index.size == 20
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("after", [0, 1, 3, 4, 5, 8, 11, 12, 13, 50])
+async def test_iter_lines_after_matches_full_scan(storage_dir, after):
+    storage = LocalStorageBackend(str(storage_dir))
+    data = _log(12)
+    await storage.save("log", data)
+
+    expected = [
+        (seq, raw) for seq, raw in enumerate(data.split(b"\n")[:-1], start=1) if seq > after
+    ]
+    assert await _lines(storage, "log", after) == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("after", [0, 7, 40, 41, 99, 100])
+async def test_gzip_log_seeks_to_member_starts(storage_dir, after):
+    storage = LocalStorageBackend(str(storage_dir))
+    data = _log(100)
+
+    async def chunks():
+        yield data
+
+    encoded = b"".join([c async for c in compression.gzip_stream(chunks(), member_size=200)])
+    await storage.save("log", encoded)
+
+    index = await log_index.build_index(storage, "log", 4, "gzip")
+    assert len(index.offsets) > 2
+    assert index.size == len(encoded)
+    expected = [
+        (seq, raw) for seq, raw in enumerate(data.split(b"\n")[:-1], start=1) if seq > after
+    ]
+    assert await _lines(storage, "log", after, "gzip") == expected
+
+
+@pytest.mark.asyncio
+async def test_index_is_persisted_and_reused(storage_dir):
+    storage = LocalStorageBackend(str(storage_dir))
+    await storage.save("log", _log(10))
+
+    await _lines(storage, "log", 0)
+    assert (storage_dir / "log.idx").exists()
+
+    # A fresh process reads the stored index instead of rescanning the log
+    log_index._cache.clear()
+    (storage_dir / "log").write_bytes(_log(10).replace(b"line 9", b"LINE 9"))
+    assert await _lines(storage, "log", 8) == [(9, b"[stdout] LINE 9"), (10, b"[stdout] line 10")]
+
+
+@pytest.mark.asyncio
+async def test_trailing_partial_line_and_crlf(storage_dir):
+    storage = LocalStorageBackend(str(storage_dir))
+    await storage.save("log", b"one\r\ntwo\r\nthree")
+
+    assert await _lines(storage, "log", 1) == [(2, b"two"), (3, b"three")]
+
+
+@pytest.mark.asyncio
+async def test_get_logs_seeks_past_after(db, storage_dir):
+    await artifact_service.save_artifact(
+        db, run_id="run1", filename=artifact_service.RUN_LOG_FILENAME,
+        data=_log(9) + b"[stderr] oops\nplain text\n", content_type="text/plain",
+    )
+
+    entries = await log_service.get_logs(db, "run1", after_sequence=8)
+    assert [(e.sequence, e.stream, e.line) for e in entries] == [
+        (9, "stdout", "line 9"),
+        (10, "stderr", "oops"),
+        (11, "stdout", "plain text"),
+    ]
+    assert await log_service.get_logs(db, "run1", after_sequence=11) == []
+
+
+@pytest.mark.asyncio
+async def test_deleting_log_removes_index(db, storage_dir):
+    artifact = await artifact_service.save_artifact(
+        db, run_id="run1", filename=artifact_service.RUN_LOG_FILENAME,
+        data=_log(5), content_type="text/plain",
+    )
+    await log_service.get_logs(db, "run1")
+    assert (storage_dir / log_index.index_path(artifact.storage_path)).exists()
+
+    await artifact_service.delete_run_artifacts(db, "run1")
+    assert not (storage_dir / log_index.index_path(artifact.storage_path)).exists()
+    assert artifact.storage_path not in log_index._cache
@@ -0,0 +1,173 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+
+from orchestrator.models.job_log import JobLog
+from orchestrator.schemas.workers import LogLine
+from orchestrator.services import artifact_service, log_index, log_service
+
+
+@pytest_asyncio.fixture
+async def storage_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("orchestrator.storage.settings.artifact_storage_path", str(tmp_path))
+    log_index._cache.clear()
+    yield tmp_path
+    log_index._cache.clear()
+
+
+def _lines(start: int, end: int, stream: str = "stdout") -> list[LogLine]:
+    return [LogLine(stream=stream, line=f"line {i}", sequence=i) for i in range(start, end + 1)]
+
+
+async def _count(db) -> int:
+    return (await db.execute(select(func.count()).select_from(JobLog))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_append_logs_persists_live_tail(db, storage_dir):
+    assert await log_service.append_logs(db, "run1", _lines(1, 3)) == 3
+    await log_service.append_logs(db, "run1", _lines(4, 5, stream="stderr"))
+
+    entries = await log_service.get_logs(db, "run1", after_sequence=2)
+    assert [(e.sequence, e.stream, e.line) for e in entries] == [
+        (3, "stdout", "line 3"),
+        (4, "stderr", "line 4"),
+        (5, "stderr", "line 5"),
+    ]
+    assert await log_service.get_logs(db, "other") == []
+
+
+@pytest.mark.asyncio
+async def test_resent_lines_are_ignored(db, storage_dir):
+    await log_service.append_logs(db, "run1", _lines(1, 3))
+    # A worker retrying a batch it thinks failed
+    await log_service.append_logs(db, "run1", _lines(2, 4))
+
+    assert [e.sequence for e in await log_service.get_logs(db, "run1")] == [1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_appends_share_one_commit(db, storage_dir, monkeypatch):
+    monkeypatch.setattr(log_service.settings, "log_commit_interval", 0.05)
+    commits = 0
+    real_commit = db.commit
+
+    async def counting_commit():
+        nonlocal commits
+        commits += 1
+        await real_commit()
+
+    monkeypatch.setattr(db, "commit", counting_commit)
+
+    await asyncio.gather(*(
+        log_service.append_logs(db, f"run{i}", _lines(1, 10)) for i in range(5)
+    ))
+    assert commits == 1
+    assert await _count(db) == 50
+
+
+@pytest.mark.asyncio
+async def test_full_batch_commits_early(db, storage_dir, monkeypatch):
+    monkeypatch.setattr(log_service.settings, "log_commit_interval", 10)
+    monkeypatch.setattr(log_service.settings, "log_commit_max_lines", 15)
+
+    await asyncio.wait_for(asyncio.gather(
+        log_service.append_logs(db, "run1", _lines(1, 10)),
+        log_service.append_logs(db, "run2", _lines(1, 10)),
+    ), timeout=1)
+    assert await _count(db) == 20
+
+
+@pytest.mark.asyncio
+async def test_failed_commit_fails_every_append_in_batch(db, storage_dir, monkeypatch):
+    monkeypatch.setattr(log_service.settings, "log_commit_interval", 0.05)
+
+    async def broken_insert(db, rows):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(log_service, "_insert_lines", broken_insert)
+    results = await asyncio.gather(
+        log_service.append_logs(db, "run1", _lines(1, 2)),
+        log_service.append_logs(db, "run2", _lines(1, 2)),
+        return_exceptions=True,
+    )
+    assert isinstance(results[0], RuntimeError)
+    assert isinstance(results[1], log_service.LogWriteError)
+
+
+@pytest.mark.asyncio
+async def test_log_artifact_replaces_live_tail(db, storage_dir):
+    await log_service.append_logs(db, "run1", _lines(1, 3))
+    await artifact_service.save_artifact(
+        db, run_id="run1", filename=artifact_service.RUN_LOG_FILENAME,
+        data=b"[stdout] line 1\n[stdout] line 2\n[stdout] line 3\n", content_type="text/plain",
+    )
+    await log_service.discard_live_logs(db, "run1")
+
+    assert await _count(db) == 0
+    assert [e.line for e in await log_service.get_logs(db, "run1", after_sequence=1)] == [
+        "line 2",
+        "line 3",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_subscription_delivers_published_lines():
+    subscription = log_service.Subscription(maxlen=10)
+    subscription.publish(_lines(1, 2))
+    subscription.publish(_lines(3, 3))
+
+    assert [line.sequence for line in await subscription.get(timeout=1)] == [1, 2, 3]
+    with pytest.raises(TimeoutError):
+        await subscription.get(timeout=0.01)
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_gets_gap_instead_of_blocking(db, storage_dir, monkeypatch):
+    monkeypatch.setattr(log_service.settings, "log_subscriber_buffer", 5)
+    subscription = log_service.subscribe("run1")
+    try:
+        # Nobody is reading, yet ingestion still completes
+        for start in range(1, 20, 3):
+            await asyncio.wait_for(
+                log_service.append_logs(db, "run1", _lines(start, start + 2)), timeout=1
+            )
+
+        with pytest.raises(log_service.LogGap):
+            await subscription.get(timeout=1)
+        # Every line is still in storage for the resync
+        assert len(await log_service.get_logs(db, "run1")) == 21
+
+        await log_service.append_logs(db, "run1", _lines(22, 22))
+        assert [line.sequence for line in await subscription.get(timeout=1)] == [22]
+    finally:
+        log_service.unsubscribe("run1", subscription)
+    assert "run1" not in log_service._subscribers
+
+
+@pytest.mark.asyncio
+async def test_get_batch_coalesces_lines_arriving_within_latency():
+    subscription = log_service.Subscription(maxlen=100)
+
+    async def trickle():
+        for i in range(1, 6):
+            subscription.publish(_lines(i, i))
+            await asyncio.sleep(0.005)
+
+    task = asyncio.create_task(trickle())
+    lines = await subscription.get_batch(timeout=1, max_lines=100, max_latency=0.5)
+    await task
+    assert [line.sequence for line in lines] == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_get_batch_returns_once_max_lines_reached():
+    subscription = log_service.Subscription(maxlen=100)
+    subscription.publish(_lines(1, 8))
+
+    lines = await asyncio.wait_for(
+        subscription.get_batch(timeout=1, max_lines=5, max_latency=10), timeout=1
+    )
+    assert len(lines) == 8
@@ -0,0 +1,96 @@
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import inspect
+
+from orchestrator import pagination
+from orchestrator.models.job_run import JobRun
+from orchestrator.models.worker import Worker
+from orchestrator.services import run_service, worker_service
+
+
+async def _seed_runs(db, n: int) -> None:
+    # Pairs of runs share a timestamp, so ties are broken by id
+    for i in range(n):
+        db.add(JobRun(
+            id=f"run-{i:03d}", workspace_id="default", name=f"run {i}", task_prompt="x" * 1000,
+            status="queued" if i % 2 else "completed",
+            created_at=datetime(2026, 1, 1, 0, 0, i // 2, tzinfo=UTC),
+        ))
+    await db.commit()
+
+
+async def _walk(list_page, keys, limit: int) -> list[str]:
+    seen, after = [], None
+    while True:
+        rows = await list_page(after, limit)
+        seen.extend(row.id for row in rows)
+        if len(rows) < limit:
+            return seen
+        after = pagination.decode_cursor(
+            pagination.encode_cursor([getattr(rows[-1], key.key) for key in keys]), keys
+        )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [1, 3, 7, 25])
+async def test_paging_through_runs_matches_the_full_list(db, limit):
+    await _seed_runs(db, 21)
+    everything = [run.id for run in await run_service.list_runs(db, "default")]
+    assert everything == [f"run-{i:03d}" for i in reversed(range(21))]
+
+    async def page(after, limit):
+        return await run_service.list_runs(db, "default", after=after, limit=limit)
+
+    assert await _walk(page, run_service.RUN_PAGE_KEYS, limit) == everything
+
+
+@pytest.mark.asyncio
+async def test_paging_with_filters(db):
+    await _seed_runs(db, 21)
+
+    async def page(after, limit):
+        return await run_service.list_runs(db, "default", status="queued", after=after, limit=limit)
+
+    assert await _walk(page, run_service.RUN_PAGE_KEYS, 4) == [
+        f"run-{i:03d}" for i in reversed(range(21)) if i % 2
+    ]
+
+
+@pytest.mark.asyncio
+async def test_summary_view_skips_large_columns(db):
+    await _seed_runs(db, 2)
+
+    runs = await run_service.list_runs(db, "default", summary=True)
+    unloaded = inspect(runs[0]).unloaded
+    assert {"task_prompt", "agent_config", "result"} <= unloaded
+    assert "status" not in unloaded
+
+
+@pytest.mark.asyncio
+async def test_workers_page_newest_first(db):
+    for i in range(5):
+        db.add(Worker(
+            id=f"w{i}", workspace_id="default", name=f"w{i}",
+            created_at=datetime(2026, 1, 1, 0, 0, i, tzinfo=UTC),
+        ))
+    await db.commit()
+
+    first = await worker_service.list_workers(db, "default", limit=2)
+    assert [w.id for w in first] == ["w4", "w3"]
+    after = (first[-1].created_at, first[-1].id)
+    assert [w.id for w in await worker_service.list_workers(db, "default", after=after)] == ["w2", "w1", "w0"]
+
+
+def test_cursor_round_trip():
+    keys = run_service.RUN_PAGE_KEYS
+    created = datetime(2026, 1, 2, 3, 4, 5, 678901)
+    cursor = pagination.encode_cursor([created, "run-1"])
+    assert "=" not in cursor
+    assert pagination.decode_cursor(cursor, keys) == (created, "run-1")
+
+
+@pytest.mark.parametrize("cursor", ["", "not base64!", "bnVsbA", pagination.encode_cursor(["x"])])
+def test_invalid_cursor(cursor):
+    with pytest.raises(pagination.InvalidCursorError):
+        pagination.decode_cursor(cursor, run_service.RUN_PAGE_KEYS)
@@ -0,0 +1,138 @@
+"""The hot JobRun and Worker queries must keep using their indexes.
+
+Each test captures the SQL a service function actually sends and checks SQLite's
+plan for it: the expected index is used, and results come out in index order
+rather than through a temporary sort.
+"""
+
+from contextlib import contextmanager
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import event
+
+from orchestrator.models.job_run import JobRun
+from orchestrator.models.worker import Worker
+from orchestrator.services import reaper, run_service, worker_service
+
+
+@contextmanager
+def _capture(db, prefix="SELECT", table="FROM job_runs"):
+    statements: list[tuple[str, tuple]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(prefix) and table in statement:
+            statements.append((statement, parameters))
+
+    engine = db.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+async def _plan(db, statement: str, parameters) -> str:
+    conn = await db.connection()
+    rows = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", tuple(parameters))
+    return "\n".join(row[-1] for row in rows)
+
+
+async def _seed(db) -> Worker:
+    worker = Worker(workspace_id="default", name="w", labels={}, max_concurrency=4)
+    db.add(worker)
+    for i in range(20):
+        db.add(JobRun(
+            workspace_id="default", job_definition_id=f"job{i % 3}", name=f"run{i}",
+            task_prompt="", status=["queued", "running", "completed"][i % 3],
+        ))
+    await db.commit()
+    return worker
+
+
+@pytest.mark.asyncio
+async def test_claim_uses_queued_partial_index(db):
+    worker = await _seed(db)
+    with _capture(db) as statements:
+        await worker_service.claim_runs(db, worker.id, max_runs=2)
+
+    dispatch = [s for s in statements if "ORDER BY job_runs.priority DESC" in s[0]]
+    assert len(dispatch) == 1
+    # A bound parameter would keep Postgres from using the partial index in generic plans
+    assert "job_runs.status = 'queued'" in dispatch[0][0]
+    plan = await _plan(db, *dispatch[0])
+    assert "ix_job_runs_queued" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.asyncio
+async def test_active_run_count_uses_worker_status_index(db):
+    worker = await _seed(db)
+    with _capture(db) as statements:
+        await worker_service.count_active_runs(db, worker.id)
+
+    plan = await _plan(db, *statements[0])
+    assert "ix_job_runs_worker_status" in plan
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "filters, index",
+    [
+        ({}, "ix_job_runs_workspace_created"),
+        ({"status": "queued"}, "ix_job_runs_workspace_status_created"),
+        ({"job_id": "job1"}, "ix_job_runs_workspace_job_created"),
+        ({"job_id": "job1", "status": "queued"}, "ix_job_runs_workspace_job_created"),
+        # A later page starts with a seek into the index
+        (
+            {"after": (datetime(2026, 1, 1), "run"), "limit": 10, "summary": True},
+            "ix_job_runs_workspace_created (workspace_id=? AND (created_at,id)<(?,?))",
+        ),
+    ],
+)
+async def test_list_runs_is_served_in_index_order(db, filters, index):
+    await _seed(db)
+    with _capture(db) as statements:
+        await run_service.list_runs(db, "default", **filters)
+
+    plan = await _plan(db, *statements[0])
+    assert index in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.asyncio
+async def test_reaper_expires_workers_by_heartbeat_index(db):
+    await _seed(db)
+    with _capture(db, prefix="UPDATE", table="workers") as statements:
+        await reaper.expire_workers(db, datetime.now(UTC))
+
+    assert len(statements) == 1
+    plan = await _plan(db, *statements[0])
+    assert "ix_workers_status_heartbeat (status=? AND last_heartbeat<?)" in plan
+
+
+@pytest.mark.asyncio
+async def test_reaper_scans_only_in_flight_runs(db):
+    await _seed(db)
+    with _capture(db, prefix="", table="job_runs") as statements:
+        await reaper.recover_orphaned_runs(db, datetime.now(UTC))
+        await reaper.expire_timed_out_runs(db, datetime.now(UTC))
+
+    assert len(statements) == 3
+    for statement, parameters in statements:
+        assert "IN ('assigned', 'running')" in statement
+        plan = await _plan(db, statement, parameters)
+        assert "USING INDEX ix_job_runs_active" in plan, plan
+
+
+@pytest.mark.asyncio
+async def test_virtual_clock_is_read_from_the_queue_head(db):
+    await _seed(db)
+    with _capture(db) as statements:
+        await run_service.next_dispatch_key(db, "default", "job0")
+
+    head = [s for s in statements if "ORDER BY job_runs.dispatch_key" in s[0]]
+    assert len(head) == 1
+    plan = await _plan(db, *head[0])
+    assert "ix_job_runs_queued (workspace_id=? AND priority=?)" in plan
+    assert "TEMP B-TREE" not in plan
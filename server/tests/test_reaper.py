@@ -0,0 +1,150 @@
+from datetime import timedelta
+
+import pytest
+
+from orchestrator.config import settings
+from orchestrator.models.base import utcnow
+from orchestrator.models.job_run import JobRun
+from orchestrator.models.worker import Worker
+from orchestrator.schemas.runs import RunCreate
+from orchestrator.services import dispatch_service, reaper, run_service, worker_service
+
+
+async def _worker(db, name="w", heartbeat_age=0.0, max_concurrency=1) -> Worker:
+    worker = Worker(
+        workspace_id="default", name=name, labels={}, max_concurrency=max_concurrency,
+        last_heartbeat=utcnow() - timedelta(seconds=heartbeat_age),
+    )
+    db.add(worker)
+    await db.commit()
+    return worker
+
+
+async def _claimed_run(db, worker: Worker, timeout_seconds: int = 1800) -> JobRun:
+    run = await run_service.create_adhoc_run(
+        db, RunCreate(task_prompt="hi", timeout_seconds=timeout_seconds), "default"
+    )
+    claimed = await worker_service.claim_runs(db, worker.id)
+    assert [c.run_id for c in claimed] == [run.id]
+    return run
+
+
+def _stale() -> float:
+    return settings.worker_heartbeat_timeout + 1
+
+
+@pytest.mark.asyncio
+async def test_stale_workers_go_offline(db):
+    fresh = await _worker(db, "fresh")
+    stale = await _worker(db, "stale", heartbeat_age=_stale())
+
+    result = await reaper.reap(db)
+
+    assert result.workers_expired == 1
+    await db.refresh(fresh)
+    await db.refresh(stale)
+    assert (fresh.status, stale.status) == ("online", "offline")
+
+
+@pytest.mark.asyncio
+async def test_listing_workers_has_no_side_effects(db):
+    stale = await _worker(db, "stale", heartbeat_age=_stale())
+
+    [listed] = await worker_service.list_workers(db, "default")
+
+    assert listed.status == "online"
+    assert not db.dirty
+    await db.refresh(stale)
+    assert stale.status == "online"
+
+
+@pytest.mark.asyncio
+async def test_runs_of_a_dead_worker_are_requeued(db):
+    dead = await _worker(db, "dead")
+    run = await _claimed_run(db, dead)
+    dead.last_heartbeat = utcnow() - timedelta(seconds=_stale())
+    await db.commit()
+    wakeup = dispatch_service.subscribe("default")
+
+    try:
+        result = await reaper.reap(db)
+    finally:
+        dispatch_service.unsubscribe("default", wakeup)
+
+    assert (result.runs_requeued, result.runs_failed) == (1, 0)
+    assert wakeup.is_set()
+    await db.refresh(run)
+    assert (run.status, run.worker_id, run.started_at, run.retry_count) == ("queued", None, None, 1)
+
+    # Another worker picks it up, and the dead one can no longer complete it
+    alive = await _worker(db, "alive")
+    assert [c.run_id for c in await worker_service.claim_runs(db, alive.id)] == [run.id]
+    await worker_service.complete_run(db, dead.id, run.id, "failed", exit_code=1)
+    await db.refresh(run)
+    assert (run.status, run.worker_id) == ("assigned", alive.id)
+
+
+@pytest.mark.asyncio
+async def test_runs_out_of_retries_fail(db, monkeypatch):
+    monkeypatch.setattr(settings, "run_max_retries", 1)
+    dead = await _worker(db, "dead")
+    run = await _claimed_run(db, dead)
+    run.retry_count = 1
+    dead.last_heartbeat = utcnow() - timedelta(seconds=_stale())
+    await db.commit()
+
+    result = await reaper.reap(db)
+
+    assert (result.runs_requeued, result.runs_failed) == (0, 1)
+    await db.refresh(run)
+    assert run.status == "failed"
+    assert run.completed_at is not None
+    assert "retried 1 time" in run.result
+
+
+@pytest.mark.asyncio
+async def test_overdue_runs_time_out_and_free_their_slot(db):
+    worker = await _worker(db)
+    on_time = await _claimed_run(db, worker, timeout_seconds=600)
+    worker.max_concurrency = 2
+    await db.commit()
+    overdue = await _claimed_run(db, worker, timeout_seconds=60)
+    await db.refresh(worker)
+    assert worker.status == "busy"
+
+    # Keep the worker's heartbeat fresh so only the timeout applies
+    started = utcnow()
+    later = started + timedelta(seconds=60 + settings.run_timeout_grace + 5)
+    worker.last_heartbeat = later
+    await db.commit()
+
+    # Within the grace period nothing happens
+    result = await reaper.reap(db, now=started + timedelta(seconds=60 + settings.run_timeout_grace - 1))
+    assert result.runs_timed_out == 0
+
+    result = await reaper.reap(db, now=later)
+
+    assert result.runs_timed_out == 1
+    await db.refresh(overdue)
+    await db.refresh(on_time)
+    await db.refresh(worker)
+    assert (overdue.status, on_time.status) == ("timeout", "assigned")
+    assert (worker.status, worker.current_run_id) == ("online", on_time.id)
+
+    # A late report from the worker doesn't overwrite the timeout
+    await worker_service.complete_run(db, worker.id, overdue.id, "completed", exit_code=0)
+    await db.refresh(overdue)
+    assert overdue.status == "timeout"
+
+
+@pytest.mark.asyncio
+async def test_metrics_do_not_mark_workers_offline(db):
+    from orchestrator.api.system import metrics
+    from orchestrator.auth import AuthContext
+
+    await _worker(db, "stale", heartbeat_age=_stale())
+    auth = AuthContext(user=None, api_key=None, workspace_id="default")
+
+    body = await metrics(auth=auth, db=db)
+
+    assert body["workers"] == {"online": 1}
@@ -1,5 +1,10 @@
+import hashlib
+import io
+import tarfile
+
 import pytest
 import pytest_asyncio
+from sqlalchemy import event
 
 from orchestrator.services import skill_service
 from orchestrator.services.skill_parser import ParsedSkill
@@ -144,3 +149,103 @@ async def test_workspace_isolation(db, skill_storage):
     assert len(ws2_skills) == 1
     assert ws1_skills[0].description == "WS1"
     assert ws2_skills[0].description == "WS2"
+
+
+@pytest.mark.asyncio
+async def test_skill_manifest_single_query_and_cached(db, skill_storage):
+    for i in range(5):
+        parsed = ParsedSkill(name=f"skill-{i}", description="Test", instructions="Body.")
+        await skill_service.create_skill(db, parsed, "default", {"notes.txt": b"n"})
+
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        manifest = await skill_service.get_skill_manifest(db, "default")
+        assert len(statements) == 2  # version check + joined load
+        assert sorted(manifest) == [f"skill-{i}" for i in range(5)]
+        assert {f.file_path for f in manifest["skill-0"].files} == {"SKILL.md", "notes.txt"}
+
+        # Served from cache on the next call, after only the version check
+        assert await skill_service.get_skill_manifest(db, "default") is manifest
+        assert len(statements) == 3
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.mark.asyncio
+async def test_skill_manifest_invalidated_on_change(db, skill_storage):
+    parsed = ParsedSkill(name="cached", description="Test", instructions="Old.")
+    skill = await skill_service.create_skill(db, parsed, "default")
+    manifest = await skill_service.get_skill_manifest(db, "default")
+    assert manifest["cached"].instructions == "Old."
+
+    from orchestrator.schemas.skills import SkillUpdate
+    await skill_service.update_skill(db, skill.id, SkillUpdate(instructions="New."), "default")
+    manifest = await skill_service.get_skill_manifest(db, "default")
+    assert manifest["cached"].instructions == "New."
+
+    await skill_service.create_skill(
+        db, ParsedSkill(name="another", description="Test", instructions="Body."), "default"
+    )
+    assert "another" in await skill_service.get_skill_manifest(db, "default")
+
+    await skill_service.delete_skill(db, skill.id, "default")
+    assert "cached" not in await skill_service.get_skill_manifest(db, "default")
+
+
+@pytest.mark.asyncio
+async def test_skill_manifest_sees_changes_from_another_process(db, skill_storage):
+    parsed = ParsedSkill(name="remote", description="Test", instructions="Old.")
+    skill = await skill_service.create_skill(db, parsed, "default")
+    assert (await skill_service.get_skill_manifest(db, "default"))["remote"].instructions == "Old."
+
+    # Committed without invalidating this process's cache, as another replica would
+    skill.instructions = "New."
+    await db.commit()
+
+    assert (await skill_service.get_skill_manifest(db, "default"))["remote"].instructions == "New."
+
+
+@pytest.mark.asyncio
+async def test_skill_bundle_contains_run_skills(db, skill_storage):
+    await skill_service.create_skill(
+        db,
+        ParsedSkill(name="deploy", description="Test", instructions="Body."),
+        "default",
+        {"scripts/deploy.sh": b"#!/bin/sh\necho deploy"},
+    )
+    await skill_service.create_skill(
+        db, ParsedSkill(name="unused", description="Test", instructions="Body."), "default"
+    )
+    manifest = await skill_service.get_skill_manifest(db, "default")
+    skills = skill_service.resolve_run_skills(manifest, ["deploy"])
+
+    bundle = b"".join(skill_service.iter_skill_bundle("default", skills))
+
+    with tarfile.open(fileobj=io.BytesIO(bundle), mode="r:gz") as tar:
+        members = {m.name: tar.extractfile(m).read() for m in tar.getmembers()}
+    assert sorted(members) == ["deploy/SKILL.md", "deploy/scripts/deploy.sh"]
+    assert members["deploy/scripts/deploy.sh"] == b"#!/bin/sh\necho deploy"
+    for f in manifest["deploy"].files:
+        assert hashlib.sha256(members[f"deploy/{f.file_path}"]).hexdigest() == f.checksum_sha256
+
+
+@pytest.mark.asyncio
+async def test_skill_bundle_etag_tracks_checksums(db, skill_storage):
+    parsed = ParsedSkill(name="versioned", description="Test", instructions="Body.")
+    skill = await skill_service.create_skill(db, parsed, "default", {"notes.txt": b"v1"})
+    manifest = await skill_service.get_skill_manifest(db, "default")
+    etag = skill_service.skill_bundle_etag(skill_service.resolve_run_skills(manifest, None))
+    assert etag.startswith('W/"')
+    assert etag == skill_service.skill_bundle_etag(skill_service.resolve_run_skills(manifest, None))
+
+    await skill_service.delete_skill(db, skill.id, "default")
+    await skill_service.create_skill(db, parsed, "default", {"notes.txt": b"v2"})
+    manifest = await skill_service.get_skill_manifest(db, "default")
+    assert etag != skill_service.skill_bundle_etag(skill_service.resolve_run_skills(manifest, None))
+    assert skill_service.resolve_run_skills(manifest, []) == []
@@ -0,0 +1,56 @@
+import asyncio
+import zlib
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+from orchestrator.sse import GzipEventSourceResponse
+
+
+@pytest.mark.asyncio
+async def test_gzip_event_stream_decodes_to_events():
+    async def events():
+        for i in range(3):
+            yield {"event": "logs", "id": str(i), "data": f"[{i}]"}
+
+    async def endpoint(request):
+        return GzipEventSourceResponse(events(), ping=0)
+
+    app = Starlette(routes=[Route("/stream", endpoint)])
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://t") as client:
+        resp = await client.get("/stream")
+        assert resp.headers["content-encoding"] == "gzip"
+        raw = resp.content
+
+    assert raw.count(b"event: logs") == 3
+    assert b"id: 2" in raw and b"data: [2]" in raw
+
+
+@pytest.mark.asyncio
+async def test_each_chunk_is_flushed():
+    chunks = []
+    finished = asyncio.Event()
+
+    async def events():
+        yield {"event": "logs", "data": "[1]"}
+        yield {"event": "logs", "data": "[2]"}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            chunks.append(message["body"])
+            if not message.get("more_body"):
+                finished.set()
+
+    async def receive():
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    response = GzipEventSourceResponse(events(), ping=0)
+    scope = {"type": "http", "asgi": {"spec_version": "2.4"}, "method": "GET", "headers": []}
+    await asyncio.wait_for(response(scope, receive, send), timeout=5)
+
+    # The first event decompresses on its own, without the rest of the stream
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    assert b"data: [1]" in decoder.decompress(chunks[0])
@@ -44,3 +44,48 @@ async def test_overwrite(storage):
     await storage.save("file.txt", b"second")
     result = await storage.read("file.txt")
     assert result == b"second"
+
+
+@pytest.mark.asyncio
+async def test_save_stream(storage):
+    async def chunks():
+        for i in range(3):
+            yield f"chunk{i}".encode()
+
+    await storage.save_stream("streamed/file.txt", chunks())
+    assert await storage.read("streamed/file.txt") == b"chunk0chunk1chunk2"
+
+
+@pytest.mark.asyncio
+async def test_read_stream_range(storage):
+    data = bytes(range(256)) * 1024
+    await storage.save("blob.bin", data)
+
+    assert b"".join([c async for c in storage.read_stream("blob.bin")]) == data
+    assert b"".join([c async for c in storage.read_stream("blob.bin", 1000, 70_000)]) == data[1000:70_001]
+    assert b"".join([c async for c in storage.read_stream("blob.bin", len(data) - 5)]) == data[-5:]
+
+
+@pytest.mark.asyncio
+async def test_failed_stream_leaves_previous_version(storage, tmp_path):
+    await storage.save("file.txt", b"original")
+
+    async def failing():
+        yield b"partial"
+        raise RuntimeError("upload aborted")
+
+    with pytest.raises(RuntimeError):
+        await storage.save_stream("file.txt", failing())
+
+    assert await storage.read("file.txt") == b"original"
+    assert [p.name for p in tmp_path.iterdir()] == ["file.txt"]
+
+
+@pytest.mark.asyncio
+async def test_move(storage):
+    await storage.save("staging/upload", b"content")
+    await storage.save("blobs/ab/abc", b"old")
+    await storage.move("staging/upload", "blobs/ab/abc")
+    assert await storage.read("blobs/ab/abc") == b"content"
+    with pytest.raises(FileNotFoundError):
+        await storage.read("staging/upload")
@@ -0,0 +1,118 @@
+import socket
+
+import httpx
+import pytest
+import pytest_asyncio
+
+pytest.importorskip("aiobotocore")
+moto_server = pytest.importorskip("moto.server")
+
+from orchestrator.storage import S3StorageBackend
+
+PART_SIZE = 5 * 1024 * 1024  # S3's minimum part size
+
+
+@pytest.fixture(scope="module")
+def s3_endpoint():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = moto_server.ThreadedMotoServer(ip_address="127.0.0.1", port=port)
+    server.start()
+    yield f"http://127.0.0.1:{port}"
+    server.stop()
+
+
+@pytest_asyncio.fixture
+async def storage(s3_endpoint, request):
+    backend = S3StorageBackend(
+        bucket=f"artifacts-{request.node.name.replace('_', '-')}"[:63],
+        prefix="test",
+        endpoint_url=s3_endpoint,
+        region="us-east-1",
+        access_key_id="testing",
+        secret_access_key="testing",
+        part_size=PART_SIZE,
+        max_concurrency=2,
+    )
+    client = await backend._get_client()
+    await client.create_bucket(Bucket=backend.bucket)
+    yield backend
+    await backend.close()
+
+
+async def _chunks(data: bytes, size: int = 1024 * 1024):
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+@pytest.mark.asyncio
+async def test_save_and_read(storage):
+    await storage.save("run1/small.txt", b"hello")
+    assert await storage.read("run1/small.txt") == b"hello"
+
+    client = await storage._get_client()
+    obj = await client.head_object(Bucket=storage.bucket, Key="test/run1/small.txt")
+    assert obj["ContentLength"] == 5
+
+
+@pytest.mark.asyncio
+async def test_save_stream_multipart(storage):
+    data = bytes(range(256)) * (13 * 4096)  # ~13 MiB: three parts
+    await storage.save_stream("run1/big.bin", _chunks(data))
+
+    assert await storage.read("run1/big.bin") == data
+    client = await storage._get_client()
+    obj = await client.head_object(Bucket=storage.bucket, Key="test/run1/big.bin")
+    assert obj["ETag"].strip('"').endswith("-3")  # multipart ETags carry the part count
+
+
+@pytest.mark.asyncio
+async def test_failed_stream_aborts_upload(storage):
+    async def failing():
+        yield b"x" * (PART_SIZE + 1)
+        raise RuntimeError("upload aborted")
+
+    with pytest.raises(RuntimeError):
+        await storage.save_stream("run1/aborted.bin", failing())
+
+    client = await storage._get_client()
+    uploads = await client.list_multipart_uploads(Bucket=storage.bucket)
+    assert not uploads.get("Uploads")
+    with pytest.raises(FileNotFoundError):
+        await storage.read("run1/aborted.bin")
+
+
+@pytest.mark.asyncio
+async def test_read_stream_range_and_delete(storage):
+    data = bytes(range(256)) * 100
+    await storage.save("run1/ranged.bin", data)
+
+    assert b"".join([c async for c in storage.read_stream("run1/ranged.bin", 100, 199)]) == data[100:200]
+    assert b"".join([c async for c in storage.read_stream("run1/ranged.bin", 25_000)]) == data[25_000:]
+
+    await storage.delete("run1/ranged.bin")
+    with pytest.raises(FileNotFoundError):
+        await storage.read("run1/ranged.bin")
+
+
+@pytest.mark.asyncio
+async def test_presigned_download_url(storage):
+    await storage.save("run1/report.txt", b"report body")
+    url = await storage.download_url("run1/report.txt", "report.txt", "text/plain")
+
+    async with httpx.AsyncClient() as http:
+        resp = await http.get(url)
+    assert resp.status_code == 200
+    assert resp.content == b"report body"
+    assert resp.headers["content-disposition"] == 'attachment; filename="report.txt"'
+    assert storage.local_path("run1/report.txt") is None
+
+
+@pytest.mark.asyncio
+async def test_move(storage):
+    await storage.save("uploads/tmp", b"promoted")
+    await storage.move("uploads/tmp", "blobs/pr/promoted")
+    assert await storage.read("blobs/pr/promoted") == b"promoted"
+    with pytest.raises(FileNotFoundError):
+        await storage.read("uploads/tmp")
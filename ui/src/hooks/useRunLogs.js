@@ -1,6 +1,14 @@
 import { useEffect, useState } from 'react'
 import { api, getWorkspaceId } from '../lib/api'
 
+// The stream replays history on connect, so the fetch and the stream can both
+// deliver the same lines; keep only what comes after the last known sequence.
+function mergeLogs(prev, incoming) {
+  const lastSeq = prev.length > 0 ? prev[prev.length - 1].sequence : 0
+  const fresh = incoming.filter((l) => l.sequence > lastSeq)
+  return fresh.length > 0 ? [...prev, ...fresh] : prev
+}
+
 /**
  * Shared hook for fetching + streaming run logs.
  * Returns { logs, isStreaming } where each log is { stream, line, sequence }.
@@ -9,11 +17,11 @@ export default function useRunLogs(runId, isActive) {
   const [logs, setLogs] = useState([])
   const [useSSE, setUseSSE] = useState(isActive)
 
-  // Fetch logs from artifact on mount and when run completes
+  // Fetch logs on mount and when run completes
   useEffect(() => {
     if (!runId) return
     api.getRunLogs(runId).then((fetched) => {
-      setLogs((prev) => fetched.length > 0 ? fetched : prev)
+      setLogs((prev) => mergeLogs(prev, fetched))
     }).catch(() => {})
   }, [runId, isActive])
 
@@ -25,9 +33,10 @@ export default function useRunLogs(runId, isActive) {
     const params = new URLSearchParams({ token, workspace_id: getWorkspaceId() })
     const es = new EventSource(`/api/v1/runs/${runId}/logs/stream?${params}`)
 
-    es.addEventListener('log', (event) => {
-      const data = JSON.parse(event.data)
-      setLogs((prev) => [...prev, data])
+    // Each event carries a batch of lines
+    es.addEventListener('logs', (event) => {
+      const batch = JSON.parse(event.data)
+      setLogs((prev) => mergeLogs(prev, batch))
     })
 
     es.onerror = () => {
@@ -46,7 +55,7 @@ export default function useRunLogs(runId, isActive) {
       const maxSeq = logs.length > 0 ? Math.max(...logs.map((l) => l.sequence)) : 0
       const newLogs = await api.getRunLogs(runId, maxSeq)
       if (newLogs.length > 0) {
-        setLogs((prev) => [...prev, ...newLogs])
+        setLogs((prev) => mergeLogs(prev, newLogs))
       }
     }, 2000)
 
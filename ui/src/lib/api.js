@@ -28,7 +28,10 @@ async function request(path, options = {}) {
 
 export const api = {
   // Jobs
-  listJobs: () => request('/jobs'),
+  listJobs: (params = {}) => {
+    const qs = new URLSearchParams(params).toString()
+    return request(`/jobs${qs ? '?' + qs : ''}`)
+  },
   getJob: (id) => request(`/jobs/${id}`),
   createJob: (data) => request('/jobs', { method: 'POST', body: JSON.stringify(data) }),
   updateJob: (id, data) => request(`/jobs/${id}`, { method: 'PUT', body: JSON.stringify(data) }),
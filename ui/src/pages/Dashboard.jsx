@@ -18,10 +18,10 @@ export default function Dashboard() {
   const [error, setError] = useState(null)
 
   useEffect(() => {
-    Promise.all([api.getMetrics(), api.listRuns()])
+    Promise.all([api.getMetrics(), api.listRuns({ view: 'summary', limit: 10 })])
       .then(([m, r]) => {
         setMetrics(m)
-        setRuns(r.slice(0, 10))
+        setRuns(r)
       })
       .catch((e) => setError(e.message))
   }, [])
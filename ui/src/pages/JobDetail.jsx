@@ -19,7 +19,7 @@ export default function JobDetail() {
   const [error, setError] = useState(null)
 
   useEffect(() => {
-    Promise.all([api.getJob(id), api.listRuns({ job_id: id })])
+    Promise.all([api.getJob(id), api.listRuns({ job_id: id, view: 'summary' })])
       .then(([j, r]) => { setJob(j); setRuns(r) })
       .catch((e) => setError(e.message))
   }, [id])
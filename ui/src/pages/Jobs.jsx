@@ -19,7 +19,7 @@ export default function Jobs() {
   const navigate = useNavigate()
 
   useEffect(() => {
-    api.listJobs().then(setJobs).catch((e) => setError(e.message))
+    api.listJobs({ view: 'summary' }).then(setJobs).catch((e) => setError(e.message))
     api.listCredentials().then(setCredentials).catch(() => {})
     api.listSkills().then(setSkills).catch(() => {})
   }, [])
@@ -19,7 +19,7 @@ export default function Schedules() {
 
   useEffect(() => {
     fetchSchedules()
-    api.listJobs().then(setJobs).catch(() => {})
+    api.listJobs({ view: 'summary' }).then(setJobs).catch(() => {})
   }, [])
 
   const handleCreate = async (e) => {
@@ -0,0 +1,94 @@
+"""Requests/second of ServerClient against a local server: per-request vs pooled client.
+
+Starts a minimal ASGI app under uvicorn on localhost and drives heartbeats at it,
+first the old way (a fresh ``httpx.AsyncClient`` per request, as ``ServerClient``
+did before it held a pool) and then through the pooled ``ServerClient``.
+
+    pip install uvicorn
+    python benchmarks/client_pool.py [--requests 2000] [--concurrency 8]
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import threading
+import time
+
+import httpx
+import uvicorn
+
+from orchestrator_worker.client import ServerClient
+from orchestrator_worker.config import settings
+
+
+async def app(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    while (await receive()).get("more_body"):
+        pass
+    body = json.dumps({}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json")],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+async def _per_request_heartbeat(client: ServerClient, worker_id: str) -> None:
+    async with httpx.AsyncClient(base_url=client.base_url, headers=client.headers, timeout=30.0) as http:
+        resp = await http.post("/workers/heartbeat", json={"worker_id": worker_id, "status": "online"})
+        resp.raise_for_status()
+
+
+async def _drive(call, requests: int, concurrency: int) -> float:
+    remaining = iter(range(requests))
+
+    async def lane():
+        for _ in remaining:
+            await call()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(lane() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main(requests: int, concurrency: int) -> None:
+    async with ServerClient() as client:
+        await client.heartbeat("warmup")
+        before = await _drive(lambda: _per_request_heartbeat(client, "bench"), requests, concurrency)
+        after = await _drive(lambda: client.heartbeat("bench"), requests, concurrency)
+
+    print(f"{requests} heartbeats, {concurrency} concurrent")
+    print(f"  per-request client: {before:8.0f} req/s")
+    print(f"  pooled client:      {after:8.0f} req/s  ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    port = _free_port()
+    server = _start_server(port)
+    settings.server_url = f"http://127.0.0.1:{port}"
+    try:
+        asyncio.run(main(args.requests, args.concurrency))
+    finally:
+        server.should_exit = True
@@ -4,54 +4,83 @@ from orchestrator_worker.config import settings
 
 
 class ServerClient:
-    def __init__(self):
+    """HTTP client for the control plane.
+
+    Holds one pooled ``httpx.AsyncClient`` for the life of the worker so polls,
+    heartbeats, log batches and uploads reuse keep-alive connections instead of
+    opening a new one per request. Call ``aclose()`` (or use ``async with``) on
+    shutdown.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None):
         self.base_url = f"{settings.server_url}/api/v1"
         self.headers = {
             "Authorization": f"Bearer {settings.api_key}",
             "X-Workspace-ID": settings.workspace_id,
         }
-
-    def _client(self) -> httpx.AsyncClient:
-        return httpx.AsyncClient(
+        self._http = httpx.AsyncClient(
             base_url=self.base_url,
             headers=self.headers,
             timeout=30.0,
+            http2=settings.http2,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_connections,
+            ),
+            transport=transport,
         )
 
-    async def register(self, name: str, labels: dict) -> dict:
-        async with self._client() as client:
-            resp = await client.post(
-                "/workers/register",
-                json={"name": name, "labels": labels},
-            )
-            resp.raise_for_status()
-            return resp.json()
+    async def __aenter__(self) -> "ServerClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def register(self, name: str, labels: dict, max_concurrency: int = 1) -> dict:
+        resp = await self._http.post(
+            "/workers/register",
+            json={"name": name, "labels": labels, "max_concurrency": max_concurrency},
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def heartbeat(self, worker_id: str, status: str = "online") -> None:
-        async with self._client() as client:
-            resp = await client.post(
-                "/workers/heartbeat",
-                json={"worker_id": worker_id, "status": status},
-            )
-            resp.raise_for_status()
-
-    async def poll(self, worker_id: str) -> dict | None:
-        async with self._client() as client:
-            resp = await client.post(
-                "/workers/poll",
-                params={"worker_id": worker_id},
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            return data if data else None
+        resp = await self._http.post(
+            "/workers/heartbeat",
+            json={"worker_id": worker_id, "status": status},
+        )
+        resp.raise_for_status()
+
+    async def poll(self, worker_id: str, wait: int = 0) -> dict | None:
+        resp = await self._http.post(
+            "/workers/poll",
+            params={"worker_id": worker_id, "wait": wait},
+            # Leave headroom past the server-side hold for the response itself
+            timeout=wait + 30.0,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        return data if data else None
+
+    async def claim(self, worker_id: str, max_runs: int, wait: int = 0) -> list[dict]:
+        """Claim up to max_runs queued runs in a single request."""
+        resp = await self._http.post(
+            "/workers/claim",
+            params={"worker_id": worker_id, "max_runs": max_runs, "wait": wait},
+            timeout=wait + 30.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def post_logs(self, run_id: str, lines: list[dict]) -> None:
-        async with self._client() as client:
-            resp = await client.post(
-                f"/workers/runs/{run_id}/logs",
-                json={"lines": lines},
-            )
-            resp.raise_for_status()
+        resp = await self._http.post(
+            f"/workers/runs/{run_id}/logs",
+            json={"lines": lines},
+        )
+        resp.raise_for_status()
 
     async def upload_artifact(
         self,
@@ -60,21 +89,25 @@ class ServerClient:
         data: bytes,
         content_type: str = "text/plain",
     ) -> dict:
-        async with self._client() as client:
-            resp = await client.post(
-                f"/workers/runs/{run_id}/artifacts",
-                files={"file": (filename, data, content_type)},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._http.post(
+            f"/workers/runs/{run_id}/artifacts",
+            files={"file": (filename, data, content_type)},
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def download_skill_file(self, skill_id: str, file_path: str) -> bytes:
-        async with self._client() as client:
-            resp = await client.get(
-                f"/workers/skills/{skill_id}/files/{file_path}",
-            )
-            resp.raise_for_status()
-            return resp.content
+        resp = await self._http.get(
+            f"/workers/skills/{skill_id}/files/{file_path}",
+        )
+        resp.raise_for_status()
+        return resp.content
+
+    async def download_skill_bundle(self, run_id: str) -> bytes:
+        """Fetch every skill file for a run as one tar.gz."""
+        resp = await self._http.get(f"/workers/runs/{run_id}/skills/bundle")
+        resp.raise_for_status()
+        return resp.content
 
     async def complete_run(
         self,
@@ -84,14 +117,13 @@ class ServerClient:
         result: str | None = None,
         exit_code: int | None = None,
     ) -> None:
-        async with self._client() as client:
-            resp = await client.post(
-                f"/workers/runs/{run_id}/complete",
-                params={"worker_id": worker_id},
-                json={
-                    "status": status,
-                    "result": result,
-                    "exit_code": exit_code,
-                },
-            )
-            resp.raise_for_status()
+        resp = await self._http.post(
+            f"/workers/runs/{run_id}/complete",
+            params={"worker_id": worker_id},
+            json={
+                "status": status,
+                "result": result,
+                "exit_code": exit_code,
+            },
+        )
+        resp.raise_for_status()
@@ -7,9 +7,16 @@ class WorkerSettings(BaseSettings):
     worker_name: str = ""
     labels: str = ""  # comma-separated key=value pairs
     workspace_id: str = "default"
+    max_concurrency: int = 1  # runs executed at once by this process
     poll_interval: int = 5  # seconds
+    long_poll_timeout: int = 30  # seconds to hold each poll open; 0 = plain interval polling
     heartbeat_interval: int = 30  # seconds
     log_batch_interval: int = 2  # seconds
+    http2: bool = True  # negotiated over TLS; plain http:// stays on HTTP/1.1 keep-alive
+    http_max_connections: int = 20  # pooled connections to the server
+    skill_cache_dir: str = "~/.cache/flight-control/skills"  # "" disables the skill file cache
+    skill_cache_max_bytes: int = 512 * 1024 * 1024
+    skill_download_concurrency: int = 8  # parallel skill file downloads per run
 
     model_config = {"env_prefix": "ORCH_"}
 
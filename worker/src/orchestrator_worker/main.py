@@ -3,6 +3,7 @@ import logging
 import platform
 import signal
 import sys
+from collections.abc import Callable
 
 from orchestrator_worker.client import ServerClient
 from orchestrator_worker.config import settings
@@ -14,6 +15,125 @@ logging.basicConfig(
 )
 logger = logging.getLogger("orchestrator_worker")
 
+# First delay after a claim that came back empty early; doubles up to poll_interval
+EMPTY_POLL_BACKOFF = 0.5
+
+
+def empty_poll_delay(empty_polls: int) -> float:
+    """Seconds to wait after the given number of consecutive early, empty claims."""
+    if not settings.long_poll_timeout:
+        return settings.poll_interval
+    return min(settings.poll_interval, EMPTY_POLL_BACKOFF * 2 ** (empty_polls - 1))
+
+
+async def claim_until_shutdown(
+    client: ServerClient, worker_id: str, max_runs: int, shutdown: asyncio.Event
+) -> list[dict]:
+    """Claim runs, abandoning the request as soon as shutdown is set.
+
+    Runs the server assigned to an abandoned claim are never started here; the
+    server re-queues them once this worker stops heartbeating.
+    """
+    claim = asyncio.create_task(client.claim(worker_id, max_runs, wait=settings.long_poll_timeout))
+    stop = asyncio.create_task(shutdown.wait())
+    try:
+        await asyncio.wait({claim, stop}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in (claim, stop):
+            if not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+    if claim.cancelled():
+        return []
+    return claim.result()
+
+
+async def heartbeat_loop(
+    client: ServerClient, worker_id: str, status: Callable[[], str], stop: asyncio.Event
+) -> None:
+    """Heartbeat every heartbeat_interval until stop is set."""
+    while not stop.is_set():
+        try:
+            await client.heartbeat(worker_id, status())
+        except Exception as e:
+            logger.error(f"Heartbeat failed: {e}")
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=settings.heartbeat_interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def serve(client: ServerClient, worker_id: str, shutdown: asyncio.Event) -> None:
+    """Claim and execute runs until shutdown, then drain the ones in flight."""
+    # Runs in flight, one task per occupied slot
+    running: set[asyncio.Task] = set()
+
+    def status() -> str:
+        # A draining worker takes no new runs, so it reports itself busy
+        if shutdown.is_set() or len(running) >= settings.max_concurrency:
+            return "busy"
+        return "online"
+
+    # Heartbeats run on their own loop so a long poll or a long job can't starve them,
+    # and keep going through the drain: a worker that goes quiet while its runs are
+    # still executing gets them re-queued by the server's reaper
+    drained = asyncio.Event()
+    heartbeat_task = asyncio.create_task(heartbeat_loop(client, worker_id, status, drained))
+    shutdown_task = asyncio.create_task(shutdown.wait())
+
+    loop = asyncio.get_running_loop()
+    empty_polls = 0
+
+    # Main loop
+    while not shutdown.is_set():
+        try:
+            if len(running) >= settings.max_concurrency:
+                # Every slot is busy: wait for a run to finish before asking for more
+                await asyncio.wait(running | {shutdown_task}, return_when=asyncio.FIRST_COMPLETED)
+                continue
+
+            # Claim enough runs to fill every free slot in one round trip (long-polls when
+            # enabled, so the server answers as soon as a run is queued)
+            free_slots = settings.max_concurrency - len(running)
+            started = loop.time()
+            jobs = await claim_until_shutdown(client, worker_id, free_slots, shutdown)
+            for job in jobs:
+                task = asyncio.create_task(execute_run(client, worker_id, job))
+                running.add(task)
+                task.add_done_callback(running.discard)
+
+            # An empty answer that didn't hold the long-poll open (an older server,
+            # or one cutting polls short) must not turn into a busy loop
+            held = settings.long_poll_timeout and loop.time() - started >= settings.long_poll_timeout / 2
+            if jobs or held or shutdown.is_set():
+                empty_polls = 0
+            else:
+                empty_polls += 1
+                try:
+                    await asyncio.wait_for(shutdown.wait(), timeout=empty_poll_delay(empty_polls))
+                except asyncio.TimeoutError:
+                    pass
+
+        except Exception as e:
+            logger.error(f"Error in main loop: {e}")
+            await asyncio.sleep(settings.poll_interval)
+
+    # Let in-flight runs finish and report before exiting
+    if running:
+        logger.info(f"Waiting for {len(running)} in-flight run(s) to finish")
+        await asyncio.gather(*running, return_exceptions=True)
+
+    drained.set()
+    await heartbeat_task
+    shutdown_task.cancel()
+    try:
+        await shutdown_task
+    except asyncio.CancelledError:
+        pass
+
 
 async def main():
     client = ServerClient()
@@ -28,13 +148,17 @@ async def main():
                 labels[k.strip()] = v.strip()
 
     # Register
-    logger.info(f"Registering worker '{worker_name}' with server {settings.server_url} (workspace: {settings.workspace_id})")
+    logger.info(
+        f"Registering worker '{worker_name}' with server {settings.server_url} "
+        f"(workspace: {settings.workspace_id}, slots: {settings.max_concurrency})"
+    )
     try:
-        result = await client.register(worker_name, labels)
+        result = await client.register(worker_name, labels, settings.max_concurrency)
         worker_id = result["id"]
         logger.info(f"Registered as worker {worker_id}")
     except Exception as e:
         logger.error(f"Failed to register: {e}")
+        await client.aclose()
         sys.exit(1)
 
     # Shutdown handling
@@ -47,33 +171,9 @@ async def main():
     for sig in (signal.SIGINT, signal.SIGTERM):
         asyncio.get_event_loop().add_signal_handler(sig, handle_signal)
 
-    # Main loop
-    heartbeat_counter = 0
-    while not shutdown.is_set():
-        try:
-            # Heartbeat every N poll cycles
-            heartbeat_counter += 1
-            if heartbeat_counter >= settings.heartbeat_interval // settings.poll_interval:
-                await client.heartbeat(worker_id)
-                heartbeat_counter = 0
-
-            # Poll for jobs
-            job = await client.poll(worker_id)
-            if job:
-                await execute_run(client, worker_id, job)
-                # Heartbeat after completing a job
-                await client.heartbeat(worker_id)
-            else:
-                # Wait before next poll
-                try:
-                    await asyncio.wait_for(shutdown.wait(), timeout=settings.poll_interval)
-                except asyncio.TimeoutError:
-                    pass
-
-        except Exception as e:
-            logger.error(f"Error in main loop: {e}")
-            await asyncio.sleep(settings.poll_interval)
+    await serve(client, worker_id, shutdown)
 
+    await client.aclose()
     logger.info("Worker shutting down")
 
 
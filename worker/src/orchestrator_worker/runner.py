@@ -42,7 +42,7 @@ async def execute_run(client: ServerClient, worker_id: str, job: dict) -> None:
             # Download skill files
             skills = job.get("skills", [])
             if skills:
-                await download_and_write_skills(client, skills, work_dir)
+                await download_and_write_skills(client, skills, work_dir, run_id=run_id)
 
             runner = get_runner(job.get("agent_type", "goose"))
 
@@ -0,0 +1,147 @@
+"""Content-addressed local cache of skill files, keyed by sha256."""
+
+import hashlib
+import logging
+import os
+import stat
+import tempfile
+import threading
+from pathlib import Path
+
+from orchestrator_worker.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Runs get their own copy of each file, but keep blobs read-only anyway so a stray
+# write to the cache directory fails loudly
+_READ_ONLY = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class SkillCache:
+    """Skill files stored once per checksum under ``root``, evicted LRU past ``max_bytes``.
+
+    Recency is tracked with the file mtime, which ``get`` bumps on every hit. The
+    total size is counted once, on the first ``put``, and kept up to date from then
+    on, so callers only need to ``evict`` when ``over_limit`` says so.
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int):
+        self.root = Path(root).expanduser()
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._size: int | None = None
+        self._size_lock = threading.Lock()
+
+    def _path(self, checksum: str) -> Path:
+        return self.root / checksum[:2] / checksum
+
+    def get(self, checksum: str) -> Path | None:
+        """Return the cached file for a checksum, marking it recently used."""
+        path = self._path(checksum)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, checksum: str, data: bytes) -> Path:
+        """Store verified content under its checksum."""
+        path = self._path(checksum)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so concurrent runs never see a partial blob
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.chmod(tmp, _READ_ONLY)
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        with self._size_lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += len(data) - replaced
+        return path
+
+    @property
+    def over_limit(self) -> bool:
+        """Whether puts since the last eviction have grown the cache past max_bytes."""
+        return self._size is not None and self._size > self.max_bytes
+
+    def copy_into(self, checksum: str, dest: Path) -> bool:
+        """Copy the cached file to ``dest``; returns False if it is no longer cached.
+
+        Runs never share the cached inode: the worker runs as root, so file modes
+        alone wouldn't stop an agent editing its skills from poisoning the cache for
+        every later run. The content is re-hashed on the way through, and a blob that
+        no longer matches its checksum is dropped so the caller fetches it again.
+        """
+        src = self.get(checksum)
+        if src is None:
+            return False
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.unlink(missing_ok=True)
+        digest = hashlib.sha256()
+        try:
+            with open(src, "rb") as fin, open(dest, "wb") as fout:
+                while chunk := fin.read(_COPY_CHUNK_SIZE):
+                    digest.update(chunk)
+                    fout.write(chunk)
+        except FileNotFoundError:
+            # Evicted between get() and open()
+            dest.unlink(missing_ok=True)
+            return False
+        if digest.hexdigest() != checksum:
+            logger.warning(f"Skill cache entry {checksum} is corrupt; discarding it")
+            src.unlink(missing_ok=True)
+            dest.unlink(missing_ok=True)
+            return False
+        return True
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        """(mtime, size, path) of every cached blob."""
+        entries = []
+        for path in self.root.glob("*/*"):
+            if path.name.startswith(".tmp-"):
+                continue
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def evict(self) -> None:
+        """Delete least recently used blobs until the cache fits in max_bytes."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+            logger.info(f"Evicted skill cache down to {total} bytes")
+        with self._size_lock:
+            self._size = total
+
+
+_cache: SkillCache | None = None
+
+
+def get_skill_cache() -> SkillCache | None:
+    """Process-wide cache built from settings, or None when caching is disabled."""
+    global _cache
+    if not settings.skill_cache_dir:
+        return None
+    if _cache is None or _cache.root != Path(settings.skill_cache_dir).expanduser():
+        _cache = SkillCache(settings.skill_cache_dir, settings.skill_cache_max_bytes)
+    return _cache
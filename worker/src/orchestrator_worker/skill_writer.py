@@ -1,68 +1,179 @@
 """Download and write skill files to the worker's working directory."""
 
+import asyncio
 import hashlib
+import io
 import logging
-import os
 import stat
+import tarfile
 from pathlib import Path
 
 from orchestrator_worker.client import ServerClient
+from orchestrator_worker.config import settings
+from orchestrator_worker.skill_cache import SkillCache, get_skill_cache
 
 logger = logging.getLogger(__name__)
 
 
+def _make_executable(dest: Path, file_path: str) -> None:
+    # dest is always the run's own file, never a cached blob
+    if file_path.startswith("scripts/"):
+        dest.chmod(dest.stat().st_mode | stat.S_IEXEC | stat.S_IXGRP | stat.S_IXOTH)
+
+
+def _copy_cached(cache: SkillCache, files: list[tuple[str, Path, str]]) -> list[bool]:
+    """Copy each (checksum, dest, file_path) out of the cache; True where it was cached."""
+    hits = []
+    for checksum, dest, file_path in files:
+        hit = cache.copy_into(checksum, dest)
+        if hit:
+            _make_executable(dest, file_path)
+        hits.append(hit)
+    return hits
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _read_bundle(data: bytes, members: dict[str, str]) -> dict[str, bytes]:
+    """Pull the wanted members (archive name -> checksum) out of a skill bundle in one pass.
+
+    Only members whose content matches the expected checksum are returned.
+    """
+    found: dict[str, bytes] = {}
+    with tarfile.open(fileobj=io.BytesIO(data), mode="r|gz") as tar:
+        for member in tar:
+            checksum = members.get(member.name)
+            if checksum is None or checksum in found or not member.isfile():
+                continue
+            f = tar.extractfile(member)
+            if f is None:
+                continue
+            content = f.read()
+            if hashlib.sha256(content).hexdigest() == checksum:
+                found[checksum] = content
+    return found
+
+
 async def download_and_write_skills(
     client: ServerClient,
     skills: list[dict],
     work_dir: str,
+    cache: SkillCache | None = None,
+    run_id: str | None = None,
 ) -> None:
     """Download skill files from the server and write them to disk.
 
+    Files already in the local skill cache are copied in without a request. When more
+    than one file is missing and ``run_id`` is given, the run's skill bundle is fetched
+    in a single request; anything still missing (or if the bundle fails) is fetched per
+    file, concurrently and once per distinct checksum. Fetched files join the cache.
+
     Args:
         client: Server HTTP client.
         skills: List of skill dicts from poll response (id, name, instructions, files).
         work_dir: Base working directory for the run.
+        cache: Skill file cache; defaults to the worker's configured cache.
+        run_id: Run whose skill bundle may be downloaded.
     """
     if not skills:
         return
+    if cache is None:
+        cache = get_skill_cache()
 
     # Write skills to .goose/skills/ so Goose discovers them natively
     skills_dir = Path(work_dir) / ".goose" / "skills"
     skills_dir.mkdir(parents=True, exist_ok=True)
 
+    # (skill_id, skill_name, file_path, checksum, dest) for every file of every skill
+    files: list[tuple[str, str, str, str, Path]] = []
     for skill in skills:
-        skill_id = skill["id"]
-        skill_name = skill["name"]
-        skill_dir = skills_dir / skill_name
+        skill_dir = skills_dir / skill["name"]
         skill_dir.mkdir(parents=True, exist_ok=True)
-
-        files = skill.get("files", [])
-        for file_info in files:
+        for file_info in skill.get("files", []):
             file_path = file_info["file_path"]
-            expected_checksum = file_info["checksum_sha256"]
+            files.append((
+                skill["id"], skill["name"], file_path, file_info["checksum_sha256"], skill_dir / file_path,
+            ))
+
+    # Hashing, copying and eviction all block, and the event loop is shared with
+    # the worker's other runs: every filesystem pass below goes through a thread
+    hits = [False] * len(files)
+    if cache is not None and files:
+        hits = await asyncio.to_thread(
+            _copy_cached, cache, [(checksum, dest, file_path) for _, _, file_path, checksum, dest in files]
+        )
+
+    # checksum -> where to fetch it from, and every destination that needs it
+    sources: dict[str, tuple[str, str, str]] = {}
+    targets: dict[str, list[tuple[Path, str]]] = {}
+    cached = 0
+    for (skill_id, skill_name, file_path, checksum, dest), hit in zip(files, hits, strict=True):
+        if hit:
+            cached += 1
+            continue
+        sources.setdefault(checksum, (skill_id, skill_name, file_path))
+        targets.setdefault(checksum, []).append((dest, file_path))
+
+    def store(checksum: str, data: bytes) -> None:
+        _, skill_name, file_path = sources[checksum]
+        if cache is not None:
+            try:
+                cache.put(checksum, data)
+            except OSError:
+                logger.warning(f"Could not cache skill file {skill_name}/{file_path}", exc_info=True)
 
+        for dest, dest_path in targets[checksum]:
+            if cache is None or not cache.copy_into(checksum, dest):
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                dest.write_bytes(data)
+            _make_executable(dest, dest_path)
+
+    bundled: dict[str, bytes] = {}
+    if run_id and len(sources) > 1:
+        members = {
+            f"{skill_name}/{file_path}": checksum
+            for checksum, (_, skill_name, file_path) in sources.items()
+        }
+        try:
+            data = await client.download_skill_bundle(run_id)
+            bundled = await asyncio.to_thread(_read_bundle, data, members)
+        except Exception:
+            logger.warning(
+                f"Skill bundle for run {run_id} unavailable, fetching files individually",
+                exc_info=True,
+            )
+        for checksum, content in bundled.items():
+            await asyncio.to_thread(store, checksum, content)
+
+    semaphore = asyncio.Semaphore(settings.skill_download_concurrency)
+
+    async def fetch(checksum: str) -> None:
+        skill_id, skill_name, file_path = sources[checksum]
+        async with semaphore:
             try:
                 data = await client.download_skill_file(skill_id, file_path)
             except Exception:
                 logger.exception(f"Failed to download skill file {skill_name}/{file_path}")
-                continue
-
-            # Verify checksum
-            actual_checksum = hashlib.sha256(data).hexdigest()
-            if actual_checksum != expected_checksum:
-                logger.warning(
-                    f"Checksum mismatch for {skill_name}/{file_path}: "
-                    f"expected {expected_checksum}, got {actual_checksum}"
-                )
-                continue
+                return
 
-            # Write file
-            dest = skill_dir / file_path
-            dest.parent.mkdir(parents=True, exist_ok=True)
-            dest.write_bytes(data)
+        # Verify checksum
+        actual_checksum = await asyncio.to_thread(_sha256, data)
+        if actual_checksum != checksum:
+            logger.warning(
+                f"Checksum mismatch for {skill_name}/{file_path}: "
+                f"expected {checksum}, got {actual_checksum}"
+            )
+            return
+        await asyncio.to_thread(store, checksum, data)
 
-            # Make scripts executable
-            if file_path.startswith("scripts/"):
-                dest.chmod(dest.stat().st_mode | stat.S_IEXEC | stat.S_IXGRP | stat.S_IXOTH)
+    remaining = [checksum for checksum in sources if checksum not in bundled]
+    await asyncio.gather(*(fetch(checksum) for checksum in remaining))
+    if cache is not None and cache.over_limit:
+        await asyncio.to_thread(cache.evict)
 
-        logger.info(f"Downloaded skill '{skill_name}' ({len(files)} files)")
+    logger.info(
+        f"Prepared {len(skills)} skill(s): {cached} file(s) from cache, "
+        f"{len(bundled)} from bundle, {len(remaining)} downloaded"
+    )
@@ -2,7 +2,9 @@ from unittest.mock import AsyncMock
 
 import pytest
 
+from orchestrator_worker import skill_cache
 from orchestrator_worker.client import ServerClient
+from orchestrator_worker.config import settings
 
 
 @pytest.fixture
@@ -12,3 +14,10 @@ def mock_client():
     client.upload_artifact = AsyncMock(return_value={"id": "art-1"})
     client.complete_run = AsyncMock()
     return client
+
+
+@pytest.fixture(autouse=True)
+def _isolated_skill_cache(tmp_path, monkeypatch):
+    """Keep the skill file cache out of the real home directory."""
+    monkeypatch.setattr(settings, "skill_cache_dir", str(tmp_path / "skill-cache"))
+    monkeypatch.setattr(skill_cache, "_cache", None)
@@ -0,0 +1,44 @@
+import httpx
+import pytest
+
+from orchestrator_worker.client import ServerClient
+
+
+def _recording_transport(seen: list[httpx.Request]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if request.url.path.endswith("/claim"):
+            return httpx.Response(200, json=[])
+        return httpx.Response(200, json={})
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_requests_share_one_pooled_client():
+    seen: list[httpx.Request] = []
+    client = ServerClient(transport=_recording_transport(seen))
+    http = client._http
+
+    await client.heartbeat("w-1")
+    assert await client.claim("w-1", max_runs=2) == []
+    await client.post_logs("run-1", [{"stream": "stdout", "line": "hi"}])
+
+    assert client._http is http
+    assert not http.is_closed
+    assert [r.url.path for r in seen] == [
+        "/api/v1/workers/heartbeat",
+        "/api/v1/workers/claim",
+        "/api/v1/workers/runs/run-1/logs",
+    ]
+    assert all(r.headers["Authorization"].startswith("Bearer ") for r in seen)
+
+    await client.aclose()
+    assert http.is_closed
+
+
+@pytest.mark.asyncio
+async def test_context_manager_closes_client():
+    async with ServerClient(transport=_recording_transport([])) as client:
+        await client.heartbeat("w-1")
+    assert client._http.is_closed
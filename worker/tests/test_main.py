@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from orchestrator_worker import main
+from orchestrator_worker.config import settings
+
+
+@pytest.mark.asyncio
+async def test_shutdown_abandons_in_flight_claim(mock_client):
+    claim_cancelled = asyncio.Event()
+
+    async def long_poll(*args, **kwargs):
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            claim_cancelled.set()
+            raise
+        return [{"run_id": "late"}]
+
+    mock_client.claim.side_effect = long_poll
+    shutdown = asyncio.Event()
+    claiming = asyncio.create_task(main.claim_until_shutdown(mock_client, "w-1", 1, shutdown))
+    await asyncio.sleep(0.01)
+
+    shutdown.set()
+
+    assert await asyncio.wait_for(claiming, timeout=1) == []
+    assert claim_cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_claim_returns_runs(mock_client):
+    mock_client.claim.return_value = [{"run_id": "r1"}]
+
+    assert await main.claim_until_shutdown(mock_client, "w-1", 2, asyncio.Event()) == [{"run_id": "r1"}]
+    mock_client.claim.assert_awaited_once_with("w-1", 2, wait=settings.long_poll_timeout)
+
+
+def test_empty_polls_back_off(monkeypatch):
+    monkeypatch.setattr(settings, "long_poll_timeout", 30)
+    monkeypatch.setattr(settings, "poll_interval", 5)
+    assert [main.empty_poll_delay(n) for n in range(1, 6)] == [0.5, 1, 2, 4, 5]
+
+    monkeypatch.setattr(settings, "long_poll_timeout", 0)
+    assert main.empty_poll_delay(1) == 5
+
+
+@pytest.mark.asyncio
+async def test_heartbeats_continue_while_draining(mock_client, monkeypatch):
+    monkeypatch.setattr(settings, "heartbeat_interval", 0.01)
+    monkeypatch.setattr(settings, "max_concurrency", 1)
+    events: list[str] = []
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def heartbeat(worker_id, status):
+        events.append(status)
+
+    async def execute_run(client, worker_id, job):
+        started.set()
+        await release.wait()
+        events.append("reported")
+
+    mock_client.heartbeat.side_effect = heartbeat
+    mock_client.claim.return_value = [{"run_id": "r1"}]
+    monkeypatch.setattr(main, "execute_run", execute_run)
+    shutdown = asyncio.Event()
+    serving = asyncio.create_task(main.serve(mock_client, "w-1", shutdown))
+    await asyncio.wait_for(started.wait(), timeout=1)
+
+    shutdown.set()
+    signalled = len(events)
+    await asyncio.sleep(0.05)
+    release.set()
+    await asyncio.wait_for(serving, timeout=1)
+
+    # Still heartbeating, as busy, between the signal and the run reporting
+    draining = events[signalled:events.index("reported")]
+    assert len(draining) >= 2 and set(draining) == {"busy"}
+    mock_client.claim.assert_awaited_once()
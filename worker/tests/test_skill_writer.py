@@ -1,11 +1,16 @@
+import asyncio
 import hashlib
+import io
 import os
 import stat
+import tarfile
 from pathlib import Path
 from unittest.mock import AsyncMock
 
 import pytest
 
+from orchestrator_worker.config import settings
+from orchestrator_worker.skill_cache import SkillCache
 from orchestrator_worker.skill_writer import download_and_write_skills
 
 
@@ -133,3 +138,191 @@ async def test_download_error_continues(tmp_path, mock_client):
     # Bad file not written, good file written
     assert not (tmp_path / ".goose" / "skills" / "partial-skill" / "bad.txt").exists()
     assert (tmp_path / ".goose" / "skills" / "partial-skill" / "good.txt").exists()
+
+
+def _skill(name: str, files: dict[str, bytes]) -> dict:
+    return {
+        "id": f"id-{name}",
+        "name": name,
+        "instructions": "Test",
+        "files": [
+            {
+                "file_path": fp,
+                "size_bytes": len(data),
+                "checksum_sha256": hashlib.sha256(data).hexdigest(),
+                "content_type": "text/plain",
+            }
+            for fp, data in files.items()
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_warm_cache_skips_downloads(tmp_path, mock_client):
+    files = {"SKILL.md": b"instructions", "scripts/run.sh": b"#!/bin/sh\necho hi"}
+    mock_client.download_skill_file = AsyncMock(side_effect=lambda sid, fp: files[fp])
+    cache = SkillCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    skills = [_skill("cached", files)]
+
+    await download_and_write_skills(mock_client, skills, str(tmp_path / "run1"), cache)
+    assert mock_client.download_skill_file.await_count == 2
+
+    mock_client.download_skill_file.reset_mock()
+    await download_and_write_skills(mock_client, skills, str(tmp_path / "run2"), cache)
+    mock_client.download_skill_file.assert_not_called()
+
+    run_sh = tmp_path / "run2" / ".goose" / "skills" / "cached" / "scripts" / "run.sh"
+    assert run_sh.read_bytes() == files["scripts/run.sh"]
+    assert run_sh.stat().st_mode & stat.S_IEXEC
+    # A private copy: the cached blob keeps its own inode and read-only mode
+    digest = hashlib.sha256(files["scripts/run.sh"]).hexdigest()
+    assert not os.path.samefile(run_sh, cache.get(digest))
+    assert not cache.get(digest).stat().st_mode & (stat.S_IWUSR | stat.S_IEXEC)
+
+
+@pytest.mark.asyncio
+async def test_run_edits_do_not_reach_the_cache(tmp_path, mock_client):
+    files = {"SKILL.md": b"instructions"}
+    mock_client.download_skill_file = AsyncMock(side_effect=lambda sid, fp: files[fp])
+    cache = SkillCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    skills = [_skill("edited", files)]
+
+    await download_and_write_skills(mock_client, skills, str(tmp_path / "run1"), cache)
+    (tmp_path / "run1" / ".goose" / "skills" / "edited" / "SKILL.md").write_bytes(b"tampered")
+
+    await download_and_write_skills(mock_client, skills, str(tmp_path / "run2"), cache)
+    assert (tmp_path / "run2" / ".goose" / "skills" / "edited" / "SKILL.md").read_bytes() == b"instructions"
+
+
+@pytest.mark.asyncio
+async def test_corrupt_cache_entry_is_refetched(tmp_path, mock_client):
+    files = {"SKILL.md": b"instructions"}
+    mock_client.download_skill_file = AsyncMock(side_effect=lambda sid, fp: files[fp])
+    cache = SkillCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    digest = hashlib.sha256(files["SKILL.md"]).hexdigest()
+    cache.put(digest, b"poisoned")
+
+    await download_and_write_skills(mock_client, [_skill("fixed", files)], str(tmp_path / "run"), cache)
+
+    assert (tmp_path / "run" / ".goose" / "skills" / "fixed" / "SKILL.md").read_bytes() == b"instructions"
+    mock_client.download_skill_file.assert_awaited_once()
+    assert cache.get(digest).read_bytes() == b"instructions"
+
+
+@pytest.mark.asyncio
+async def test_identical_files_fetched_once(tmp_path, mock_client):
+    mock_client.download_skill_file = AsyncMock(return_value=b"shared")
+    skills = [_skill("one", {"LICENSE": b"shared"}), _skill("two", {"LICENSE": b"shared"})]
+
+    await download_and_write_skills(mock_client, skills, str(tmp_path))
+
+    assert mock_client.download_skill_file.await_count == 1
+    assert (tmp_path / ".goose" / "skills" / "one" / "LICENSE").read_bytes() == b"shared"
+    assert (tmp_path / ".goose" / "skills" / "two" / "LICENSE").read_bytes() == b"shared"
+
+
+@pytest.mark.asyncio
+async def test_downloads_bounded_concurrency(tmp_path, mock_client, monkeypatch):
+    monkeypatch.setattr(settings, "skill_download_concurrency", 3)
+    files = {f"ref-{i}.md": f"file {i}".encode() for i in range(10)}
+    in_flight = 0
+    peak = 0
+
+    async def download(sid, fp):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return files[fp]
+
+    mock_client.download_skill_file = AsyncMock(side_effect=download)
+    await download_and_write_skills(mock_client, [_skill("many", files)], str(tmp_path))
+
+    assert peak == 3
+    assert len(list((tmp_path / ".goose" / "skills" / "many").iterdir())) == 10
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = SkillCache(tmp_path / "cache", max_bytes=250)
+    for i, name in enumerate(["aa01", "aa02", "aa03"]):
+        cache.put(name, b"x" * 100)
+        os.utime(cache.get(name), (1000 + i, 1000 + i))
+    # Touch the oldest entry so the middle one becomes least recently used
+    cache.get("aa01")
+
+    cache.evict()
+
+    assert cache.get("aa01") is not None
+    assert cache.get("aa02") is None
+    assert cache.get("aa03") is not None
+
+
+@pytest.mark.asyncio
+async def test_eviction_only_after_going_over_the_limit(tmp_path, mock_client, monkeypatch):
+    files = {"a.md": b"x" * 100, "b.md": b"y" * 100}
+    mock_client.download_skill_file = AsyncMock(side_effect=lambda sid, fp: files[fp])
+    cache = SkillCache(tmp_path / "cache", max_bytes=150)
+    evictions = 0
+    evict = cache.evict
+
+    def counting_evict():
+        nonlocal evictions
+        evictions += 1
+        evict()
+
+    monkeypatch.setattr(cache, "evict", counting_evict)
+
+    await download_and_write_skills(mock_client, [_skill("small", {"a.md": files["a.md"]})], str(tmp_path / "r1"), cache)
+    assert evictions == 0
+    await download_and_write_skills(mock_client, [_skill("big", files)], str(tmp_path / "r2"), cache)
+    assert evictions == 1
+    assert not cache.over_limit
+
+    # Warm hits store nothing, so they never trigger an eviction scan
+    mock_client.download_skill_file.reset_mock()
+    await download_and_write_skills(mock_client, [_skill("kept", {"b.md": files["b.md"]})], str(tmp_path / "r3"), cache)
+    mock_client.download_skill_file.assert_not_called()
+    assert evictions == 1
+
+
+def _bundle(members: dict[str, bytes]) -> bytes:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_cold_start_uses_bundle(tmp_path, mock_client):
+    files = {"SKILL.md": b"instructions", "scripts/run.sh": b"#!/bin/sh\necho hi"}
+    mock_client.download_skill_bundle = AsyncMock(return_value=_bundle({
+        "bundled/SKILL.md": files["SKILL.md"],
+        "bundled/scripts/run.sh": files["scripts/run.sh"],
+        "../escape.txt": b"ignored",
+    }))
+    mock_client.download_skill_file = AsyncMock()
+
+    await download_and_write_skills(mock_client, [_skill("bundled", files)], str(tmp_path / "run"), run_id="run-1")
+
+    mock_client.download_skill_bundle.assert_awaited_once_with("run-1")
+    mock_client.download_skill_file.assert_not_called()
+    skill_dir = tmp_path / "run" / ".goose" / "skills" / "bundled"
+    assert (skill_dir / "SKILL.md").read_bytes() == files["SKILL.md"]
+    assert (skill_dir / "scripts" / "run.sh").stat().st_mode & stat.S_IEXEC
+    assert not (tmp_path / "run" / ".goose" / "escape.txt").exists()
+
+
+@pytest.mark.asyncio
+async def test_bundle_failure_falls_back_to_files(tmp_path, mock_client):
+    files = {"a.md": b"a", "b.md": b"b"}
+    mock_client.download_skill_bundle = AsyncMock(side_effect=Exception("404"))
+    mock_client.download_skill_file = AsyncMock(side_effect=lambda sid, fp: files[fp])
+
+    await download_and_write_skills(mock_client, [_skill("fallback", files)], str(tmp_path), run_id="run-1")
+
+    assert mock_client.download_skill_file.await_count == 2
+    assert (tmp_path / ".goose" / "skills" / "fallback" / "b.md").read_bytes() == b"b"